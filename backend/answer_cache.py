@@ -0,0 +1,100 @@
+import json
+import os
+import re
+import threading
+import time
+
+from ttl_cache import TTLCache
+
+STOPWORDS = {
+    "a", "an", "the", "and", "or", "but", "if", "to", "of", "in", "on", "at", "for", "with",
+    "by", "from", "about", "as", "into", "is", "are", "was", "were", "be", "been", "am",
+    "do", "does", "did", "can", "could", "should", "would", "will", "shall", "may", "might",
+    "i", "me", "my", "we", "our", "you", "your", "it", "its", "this", "that", "these", "those",
+    "what", "which", "who", "whom", "how", "please", "tell", "some", "any", "there", "so",
+}
+
+
+def normalize_question(text):
+    """Case-fold, strip punctuation/whitespace and drop stopwords.
+
+    "How to prepare for an interview?" and "how to prepare for interview"
+    both become "prepare interview".
+    """
+    words = re.sub(r"[^\w\s]", " ", text.casefold()).split()
+    keywords = [word for word in words if word not in STOPWORDS]
+    # A question made only of stopwords still needs a usable key
+    return " ".join(keywords or words)
+
+
+class AnswerCache:
+    """LRU/TTL cache of chatbot answers keyed by normalized question.
+
+    When `path` is set, entries are persisted to a JSON file so common answers
+    survive restarts. Writes are throttled to at most one every `save_interval`.
+    """
+
+    def __init__(self, max_entries=None, ttl=None, path=None, save_interval=30):
+        self.ttl = ttl or int(os.getenv("CHATBOT_CACHE_TTL", "86400"))
+        self.path = path if path is not None else os.getenv("CHATBOT_CACHE_PATH")
+        self.save_interval = save_interval
+        self._cache = TTLCache(
+            max_entries=max_entries or int(os.getenv("CHATBOT_CACHE_MAX_ENTRIES", "1000")),
+            max_bytes=int(os.getenv("CHATBOT_CACHE_MAX_BYTES", str(16 * 1024 * 1024))),
+            default_ttl=self.ttl,
+        )
+        self._save_lock = threading.Lock()
+        self._last_save = 0.0
+        if self.path:
+            self.load()
+
+    def get(self, question):
+        return self._cache.get(normalize_question(question))
+
+    def set(self, question, answer):
+        key = normalize_question(question)
+        if not key:
+            return
+        self._cache.set(key, answer)
+        if self.path and time.monotonic() - self._last_save >= self.save_interval:
+            self.save()
+
+    def load(self):
+        try:
+            with open(self.path, "r", encoding="utf-8") as f:
+                entries = json.load(f)
+        except FileNotFoundError:
+            return
+        except (OSError, ValueError) as e:
+            print(f"Ignoring unreadable chatbot cache {self.path}: {e}")
+            return
+        now = time.time()
+        for entry in entries:
+            remaining = entry["expires_at"] - now
+            if remaining > 0:
+                self._cache.set(entry["key"], entry["answer"], ttl=remaining)
+        print(f"Loaded {len(self._cache)} cached chatbot answers from {self.path}")
+
+    def save(self):
+        if not self.path:
+            return
+        with self._save_lock:
+            now = time.time()
+            entries = [
+                {"key": key, "answer": answer, "expires_at": now + remaining}
+                for key, answer, remaining in self._cache.snapshot()
+            ]
+            tmp_path = f"{self.path}.tmp"
+            try:
+                with open(tmp_path, "w", encoding="utf-8") as f:
+                    json.dump(entries, f)
+                os.replace(tmp_path, self.path)
+            except OSError as e:
+                print(f"Could not persist chatbot cache to {self.path}: {e}")
+            self._last_save = time.monotonic()
+
+    def stats(self):
+        stats = self._cache.stats()
+        stats["ttl"] = self.ttl
+        stats["persistent"] = bool(self.path)
+        return stats
@@ -0,0 +1,726 @@
+"""
+Async (ASGI) serving mode for the Job Portal API.
+
+The upstream-bound routes (/search, /chatbot, /chatbot/stream) are served
+natively with httpx, and the hot MongoDB routes (/login, /applications,
+/apply) and the probes natively with Motor, so a single process can hold
+thousands of in-flight provider/Gemini/database waits without a thread each.
+Work that is still synchronous (bcrypt, resume storage, rate limits with the
+Redis backend, the local job index, the chatbot cache file) runs in worker
+threads, never on the event loop. Every other route is delegated to the
+existing Flask app on a pool of ASGI_WSGI_WORKERS threads, so all routes and
+JSON contracts stay the same.
+
+    pip install -r requirements-async.txt
+    uvicorn asgi:app --host 127.0.0.1 --port 8000
+"""
+import asyncio
+import os
+import time
+from contextlib import asynccontextmanager
+from datetime import datetime
+
+import httpx
+from a2wsgi import WSGIMiddleware
+from flask_jwt_extended import create_access_token, decode_token
+from jwt import ExpiredSignatureError
+from motor.motor_asyncio import AsyncIOMotorClient
+from pymongo.errors import DuplicateKeyError
+from starlette.applications import Starlette
+from starlette.datastructures import UploadFile
+from starlette.middleware import Middleware
+from starlette.middleware.cors import CORSMiddleware
+from starlette.middleware.gzip import GZipMiddleware
+from starlette.responses import JSONResponse, Response, StreamingResponse
+from starlette.routing import Mount, Route
+
+import compression
+import gemini
+import main
+import metrics
+from answer_cache import normalize_question
+from circuit_breaker import CircuitOpen, UpstreamUnavailable, is_failure_status
+from identity import identity_claims
+from job_index import LOCAL_MODE
+from pagination import KEYSET_SORT, build_filter, page_query, page_result
+from password_hasher import HasherBusy
+from job_schema import DEFAULT_RESPONSE_FORMAT, RESPONSE_FORMATS, parse_job_fields
+from rate_limit import RateLimited
+from search_cache import normalize_search_key
+from search_filters import SearchFilters
+from search_providers import SEARCH_MODES, has_jobs, merge_jobs, normalized_payload
+from single_flight import AsyncSingleFlight, SingleFlightTimeout
+
+
+class AsyncResources:
+    """Process-wide async clients, created on startup and closed on shutdown."""
+
+    def __init__(self):
+        self.http = None
+        self.mongo = None
+
+    def open(self):
+        self.http = httpx.AsyncClient(
+            limits=httpx.Limits(
+                max_connections=int(os.getenv("ASYNC_HTTP_MAX_CONNECTIONS", "1000")),
+                max_keepalive_connections=int(os.getenv("ASYNC_HTTP_MAX_KEEPALIVE", "100")),
+            ),
+        )
+        # Motor connects lazily as well; no I/O happens here
+        self.mongo = AsyncIOMotorClient(
+            os.getenv("MONGODB_URI"),
+            serverSelectionTimeoutMS=int(os.getenv("MONGO_SERVER_SELECTION_TIMEOUT_MS", "5000")),
+            event_listeners=[metrics.MongoCommandTimer()],
+        )
+
+    async def close(self):
+        await self.http.aclose()
+        self.mongo.close()
+
+    @property
+    def db(self):
+        return self.mongo[main.mongo.name]
+
+    async def ready(self):
+        """Let the Flask side connect once, off the event loop: it creates the indexes
+        (the unique one on applications included) and the resume store."""
+        if not main.mongo.connected:
+            await asyncio.to_thread(main.mongo.connect)
+
+
+resources = AsyncResources()
+
+# Threads running the delegated Flask routes; each holds one request (and DB call) at a time
+WSGI_WORKERS = int(os.getenv("ASGI_WSGI_WORKERS", "32"))
+
+# Identical concurrent upstream calls share one request (mirrors the Flask app)
+search_flight = AsyncSingleFlight("search")
+chat_flight = AsyncSingleFlight("chatbot")
+
+
+# ============ RATE LIMITING ============
+
+def client_key(request):
+    """Same key as main.client_key: JWT identity when the token is valid, else the client IP."""
+    auth = request.headers.get("authorization", "")
+    if auth.startswith("Bearer "):
+        try:
+            with main.app.app_context():
+                return f"user:{decode_token(auth[len('Bearer '):])['sub']}"
+        except Exception:
+            pass
+    return f"ip:{request.client.host if request.client else None}"
+
+
+async def throttled(request, name):
+    """Return a 429 response when the client's `name` bucket is empty, else None."""
+    # A thread, since the Redis backend makes this a network round trip
+    decision = await asyncio.to_thread(main.rate_limiter.check, name, client_key(request))
+    if decision.allowed:
+        return None
+    return JSONResponse(
+        {"error": "Too many requests, please slow down", "retry_after": decision.retry_after},
+        status_code=429,
+        headers=decision.headers(),
+    )
+
+
+# ============ SEARCH ============
+
+async def fetch_provider(provider, query, location, page):
+    payload = main.search_cache.get(query, location, page, provider.name)
+    if payload is not None:
+        return payload
+    return await search_flight.do(
+        normalize_search_key(query, location, page, provider.name),
+        lambda: fetch_upstream(provider, query, location, page),
+        timeout=provider.deadline,
+    )
+
+
+async def fetch_upstream(provider, query, location, page):
+    breaker = main.breakers.get(provider.name, provider.deadline)
+    breaker.before_call()
+    if provider.name in main.rate_limiter.limits:
+        try:
+            await asyncio.to_thread(main.rate_limiter.acquire, provider.name)
+        except RateLimited:
+            breaker.cancel()
+            raise
+    url, kwargs = provider.request_args(query, location, page)
+    response = await breaker.attempt_async(
+        lambda timeout: resources.http.get(url, timeout=timeout, **kwargs),
+        is_failure=lambda response: is_failure_status(response.status_code),
+    )
+    if is_failure_status(response.status_code):
+        raise UpstreamUnavailable(provider.name, response.status_code)
+    if response.status_code != 200:
+        return None
+    payload = response.json()
+    main.search_cache.set(query, location, page, provider.name, payload)
+    # Feeds the local job index (normalizing and tokenizing every job)
+    await asyncio.to_thread(main.search_engine.notify, provider, payload)
+    return payload
+
+
+async def fetch_with_deadline(provider, query, location, page, status):
+    try:
+        payload = await asyncio.wait_for(fetch_provider(provider, query, location, page), provider.deadline)
+    except asyncio.TimeoutError:
+        status[provider.name] = {"status": "timeout"}
+        return None
+    except (RateLimited, CircuitOpen) as e:
+        status[provider.name] = {"status": e.status, "retry_after": e.retry_after}
+        return None
+    except Exception as e:
+        print(f"Search provider {provider.name} failed: {e}")
+        status[provider.name] = {"status": "error", "error": str(e)}
+        return None
+    if not has_jobs(provider, payload):
+        status[provider.name] = {"status": "no_results"}
+        return None
+    status[provider.name] = {"status": "ok"}
+    return payload
+
+
+async def search_jobs(request):
+    limited = await throttled(request, "search")
+    if limited is not None:
+        return limited
+
+    query = request.query_params.get("query")
+    location = request.query_params.get("location")
+    try:
+        page = int(request.query_params.get("page", 1))
+    except ValueError:
+        page = 1
+
+    if not query:
+        return JSONResponse({"error": "Query is required"}, status_code=400)
+
+    mode = request.query_params.get("mode") or main.search_engine.mode
+    if mode not in SEARCH_MODES + (LOCAL_MODE,):
+        return JSONResponse({"error": f"mode must be one of: {', '.join(SEARCH_MODES + (LOCAL_MODE,))}"}, status_code=400)
+
+    response_format = request.query_params.get("format", DEFAULT_RESPONSE_FORMAT)
+    if response_format not in RESPONSE_FORMATS:
+        return JSONResponse({"error": f"format must be one of: {', '.join(RESPONSE_FORMATS)}"}, status_code=400)
+    try:
+        fields = parse_job_fields(request.query_params.get("fields"))
+        filters = SearchFilters.from_args(request.query_params)
+    except ValueError as e:
+        return JSONResponse({"error": str(e)}, status_code=400)
+    if filters is not None and response_format == "raw":
+        return JSONResponse({"error": "Filtering and sorting need format=compact"}, status_code=400)
+
+    def respond(raw, normalized, provider_name=None, sources=()):
+        key = normalize_search_key(query, location, page, provider_name) if provider_name else None
+        return JSONResponse(main.search_payload(raw, normalized, response_format, fields, filters, key, sources))
+
+    if mode == LOCAL_MODE or main.SEARCH_LOCAL_FIRST:
+        # In-memory index; bootstrapping from job_listings happens once, off the event loop
+        payload = await asyncio.to_thread(main.search_local, query, location, page)
+        if mode == LOCAL_MODE or payload["total"] >= main.JOB_INDEX_MIN_HITS:
+            return respond(payload, payload)
+
+    main.cache_warmer.record(query, location)
+    providers = main.search_engine.active_providers()
+    status = {}
+    try:
+        if mode == "sequential":
+            for provider in providers:
+                payload = await fetch_with_deadline(provider, query, location, page, status)
+                if payload is not None:
+                    return respond(
+                        payload, lambda: normalized_payload(provider, payload, status), provider.name, (payload,)
+                    )
+
+        elif mode == "first":
+            tasks = {
+                asyncio.ensure_future(fetch_with_deadline(provider, query, location, page, status)): provider
+                for provider in providers
+            }
+            pending = set(tasks)
+            while pending:
+                done, pending = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+                for task in done:
+                    if task.result() is not None:
+                        for other in pending:
+                            other.cancel()
+                            status[tasks[other].name] = {"status": "abandoned"}
+                        provider, payload = tasks[task], task.result()
+                        return respond(
+                            payload, lambda: normalized_payload(provider, payload, status), provider.name, (payload,)
+                        )
+
+        else:
+            payloads = await asyncio.gather(*[
+                fetch_with_deadline(provider, query, location, page, status) for provider in providers
+            ])
+            jobs_by_provider = {}
+            for provider, payload in zip(providers, payloads):
+                if payload is not None:
+                    jobs_by_provider[provider.name] = [provider.normalize(job) for job in provider.jobs(payload)]
+                    status[provider.name]["count"] = len(jobs_by_provider[provider.name])
+            if jobs_by_provider:
+                merged = merge_jobs(providers, jobs_by_provider, status)
+                return respond(merged, merged, "merge", tuple(payload for payload in payloads if payload is not None))
+
+        return JSONResponse({"error": "No jobs found from APIs", "providers": status}, status_code=404)
+
+    except Exception as e:
+        return JSONResponse({"error": str(e)}, status_code=500)
+
+
+# ============ CHATBOT ============
+
+async def _chat_message(request):
+    try:
+        data = await request.json()
+    except ValueError:
+        data = {}
+    return ((data or {}).get("message") or "").strip()
+
+
+async def chatbot(request):
+    limited = await throttled(request, "chatbot")
+    if limited is not None:
+        return limited
+
+    user_message = await _chat_message(request)
+    if not user_message:
+        return JSONResponse({"error": "Message is required"}, status_code=400)
+
+    if not main.GEMINI_API_KEY:
+        return JSONResponse({"error": "Gemini API key not configured"}, status_code=500)
+
+    cached_answer = main.answer_cache.get(user_message)
+    if cached_answer is not None:
+        return JSONResponse({
+            "status": "success",
+            "message": cached_answer,
+            "cached": True,
+            "timestamp": datetime.utcnow().isoformat()
+        })
+
+    try:
+        try:
+            response = await chat_flight.do(
+                normalize_question(user_message), lambda: call_gemini(user_message), timeout=30
+            )
+        except (RateLimited, CircuitOpen) as e:
+            return JSONResponse({
+                "status": "error",
+                "message": gemini.BUSY_FALLBACK_MESSAGE,
+                "timestamp": datetime.utcnow().isoformat()
+            }, headers={"Retry-After": str(e.retry_after)})
+
+        if response.status_code == 200:
+            generated_text = gemini.extract_text(response.json())
+            if not generated_text:
+                return JSONResponse({"error": "No response generated from AI"}, status_code=500)
+            # May write the cache file (CHATBOT_CACHE_FILE)
+            await asyncio.to_thread(main.answer_cache.set, user_message, generated_text.strip())
+            return JSONResponse({
+                "status": "success",
+                "message": generated_text.strip(),
+                "timestamp": datetime.utcnow().isoformat()
+            })
+        if response.status_code == 503:
+            return JSONResponse({
+                "status": "error",
+                "message": gemini.BUSY_FALLBACK_MESSAGE,
+                "timestamp": datetime.utcnow().isoformat()
+            })
+        error_data = response.json() if response.content else {"error": "Unknown error"}
+        return JSONResponse({
+            "error": f"AI service temporarily unavailable (Error {response.status_code}). Please try again in a few moments.",
+            "details": error_data
+        }, status_code=500)
+
+    except (httpx.TimeoutException, SingleFlightTimeout):
+        return JSONResponse({"error": "AI service timeout. Please try again."}, status_code=504)
+    except httpx.HTTPError as e:
+        return JSONResponse({"error": f"Network error: {str(e)}"}, status_code=503)
+    except Exception as e:
+        return JSONResponse({"error": f"Internal server error: {str(e)}"}, status_code=500)
+
+
+async def call_gemini(user_message):
+    breaker = main.breakers.get("gemini")
+    breaker.before_call()
+    try:
+        await asyncio.to_thread(main.rate_limiter.acquire, "gemini")
+    except RateLimited:
+        breaker.cancel()
+        raise
+    return await breaker.attempt_async(
+        lambda timeout: resources.http.post(
+            gemini.generate_url(main.GEMINI_API_KEY),
+            json=gemini.build_payload(user_message),
+            headers=gemini.HEADERS,
+            timeout=timeout
+        ),
+        is_failure=lambda response: is_failure_status(response.status_code)
+    )
+
+
+async def chatbot_stream(request):
+    limited = await throttled(request, "chatbot")
+    if limited is not None:
+        return limited
+
+    if request.method == "POST":
+        user_message = await _chat_message(request)
+    else:
+        user_message = (request.query_params.get("message") or "").strip()
+
+    if not user_message:
+        return JSONResponse({"error": "Message is required"}, status_code=400)
+
+    if not main.GEMINI_API_KEY:
+        return JSONResponse({"error": "Gemini API key not configured"}, status_code=500)
+
+    async def events():
+        cached_answer = main.answer_cache.get(user_message)
+        if cached_answer is not None:
+            yield gemini.sse_event("token", {"text": cached_answer})
+            yield gemini.sse_event("done", {"status": "success", "cached": True, "timestamp": datetime.utcnow().isoformat()})
+            return
+
+        breaker = main.breakers.get(gemini.STREAM_BREAKER)
+        try:
+            breaker.before_call()
+        except CircuitOpen:
+            yield gemini.sse_event("fallback", {"status": "error", "message": gemini.BUSY_FALLBACK_MESSAGE})
+            yield gemini.sse_event("done", {"status": "error", "timestamp": datetime.utcnow().isoformat()})
+            return
+        if not (await asyncio.to_thread(main.rate_limiter.check, "gemini")).allowed:
+            breaker.cancel()
+            yield gemini.sse_event("fallback", {"status": "error", "message": gemini.BUSY_FALLBACK_MESSAGE})
+            yield gemini.sse_event("done", {"status": "error", "timestamp": datetime.utcnow().isoformat()})
+            return
+
+        try:
+            started = time.monotonic()
+            async with resources.http.stream(
+                "POST",
+                gemini.stream_url(main.GEMINI_API_KEY),
+                json=gemini.build_payload(user_message),
+                headers=gemini.HEADERS,
+                timeout=httpx.Timeout(gemini.STREAM_READ_TIMEOUT, connect=breaker.timeout())
+            ) as response:
+                # The stream breaker times the response headers; headers and each chunk then
+                # get the fixed GEMINI_STREAM_READ_TIMEOUT
+                if is_failure_status(response.status_code):
+                    breaker.record_failure()
+                else:
+                    breaker.record_success(time.monotonic() - started)
+                breaker.observe(time.monotonic() - started, response.status_code)
+                if response.status_code == 503:
+                    yield gemini.sse_event("fallback", {"status": "error", "message": gemini.BUSY_FALLBACK_MESSAGE})
+                    yield gemini.sse_event("done", {"status": "error", "timestamp": datetime.utcnow().isoformat()})
+                    return
+                if response.status_code != 200:
+                    yield gemini.sse_event("error", {"error": f"AI service temporarily unavailable (Error {response.status_code}). Please try again in a few moments."})
+                    return
+
+                parts = []
+                async for line in response.aiter_lines():
+                    text = gemini.data_line_text(line)
+                    if text:
+                        parts.append(text)
+                        yield gemini.sse_event("token", {"text": text})
+
+            generated_text = "".join(parts).strip()
+            if not generated_text:
+                yield gemini.sse_event("error", {"error": "No response generated from AI"})
+                return
+            await asyncio.to_thread(main.answer_cache.set, user_message, generated_text)
+            yield gemini.sse_event("done", {"status": "success", "timestamp": datetime.utcnow().isoformat()})
+
+        except httpx.TimeoutException as e:
+            breaker.record_failure()
+            breaker.observe(time.monotonic() - started, type(e).__name__)
+            yield gemini.sse_event("error", {"error": "AI service timeout. Please try again."})
+        except httpx.HTTPError as e:
+            breaker.record_failure()
+            breaker.observe(time.monotonic() - started, type(e).__name__)
+            yield gemini.sse_event("error", {"error": f"Network error: {str(e)}"})
+        except Exception as e:
+            yield gemini.sse_event("error", {"error": f"Internal server error: {str(e)}"})
+
+    return StreamingResponse(
+        events(),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"}
+    )
+
+
+# ============ AUTH & APPLICATIONS (Motor) ============
+
+def flask_json(payload, status_code=200, headers=None):
+    """JSON encoded by the Flask app's provider, so dates and ids look exactly as on the Flask routes."""
+    return Response(main.app.json.dumps(payload), status_code=status_code, headers=headers,
+                    media_type="application/json")
+
+
+def authenticate(request):
+    """Return (claims, None) for a valid access token, else (None, error response) like flask_jwt_extended."""
+    auth = request.headers.get("authorization", "")
+    if not auth.startswith("Bearer "):
+        return None, JSONResponse({"msg": "Missing Authorization Header"}, status_code=401)
+    try:
+        with main.app.app_context():
+            claims = decode_token(auth[len("Bearer "):])
+    except ExpiredSignatureError:
+        return None, JSONResponse({"msg": "Token has expired"}, status_code=401)
+    except Exception as e:
+        return None, JSONResponse({"msg": str(e)}, status_code=422)
+    if claims.get("type") != "access":
+        return None, JSONResponse({"msg": "Only non-refresh tokens are allowed"}, status_code=422)
+    return claims, None
+
+
+async def _json_body(request):
+    try:
+        data = await request.json()
+    except ValueError:
+        return {}
+    return data if isinstance(data, dict) else {}
+
+
+async def login(request):
+    try:
+        data = await _json_body(request)
+        email = (data.get("email") or "").strip().lower()
+        password = data.get("password") or ""
+        if not email or not password:
+            return JSONResponse({"error": "Email and password are required"}, status_code=400)
+
+        await resources.ready()
+        user = await resources.db.users.find_one({"email": email})
+        if not user:
+            return JSONResponse({"error": "Invalid email or password"}, status_code=401)
+
+        # bcrypt runs on the hasher pool; the thread only waits for it
+        if not await asyncio.to_thread(main.password_hasher.verify, password, user["password"]):
+            return JSONResponse({"error": "Invalid email or password"}, status_code=401)
+
+        updates = {"last_login": datetime.utcnow(), "updated_at": datetime.utcnow()}
+        if main.password_hasher.needs_rehash(user["password"]):
+            updates["password"] = await asyncio.to_thread(main.password_hasher.hash, password)
+        await resources.db.users.update_one({"_id": user["_id"]}, {"$set": updates})
+        user.update(updates)
+        main.identity_cache.remember(user)
+
+        with main.app.app_context():
+            access_token = create_access_token(identity=str(user["_id"]), additional_claims=identity_claims(user))
+
+        return JSONResponse({
+            "status": "success",
+            "message": "Login successful",
+            "access_token": access_token,
+            "user": {
+                "id": str(user["_id"]),
+                "name": user["name"],
+                "email": user["email"]
+            }
+        })
+
+    except HasherBusy:
+        return JSONResponse({"error": "Server is busy, please try again in a moment"}, status_code=503,
+                            headers={"Retry-After": "1"})
+    except Exception as e:
+        return JSONResponse({"error": str(e)}, status_code=500)
+
+
+async def list_applications(request):
+    claims, denied = authenticate(request)
+    if denied is not None:
+        return denied
+    try:
+        query = build_filter(request.query_params, {"user_id": claims["sub"]})
+        query, projection, limit = page_query(query, request.query_params)
+    except ValueError as e:
+        return JSONResponse({"error": str(e)}, status_code=400)
+    try:
+        await resources.ready()
+        cursor = resources.db.job_applications.find(query, projection).sort(KEYSET_SORT).limit(limit + 1)
+        docs, next_cursor = page_result(await cursor.to_list(length=limit + 1), limit)
+        applications = [main.serialize_application(doc) for doc in docs]
+        return flask_json({
+            "status": "success",
+            "count": len(applications),
+            "data": applications,
+            "next_cursor": next_cursor
+        })
+    except Exception as e:
+        return JSONResponse({"error": str(e)}, status_code=500)
+
+
+async def apply_for_job(request):
+    claims, denied = authenticate(request)
+    if denied is not None:
+        return denied
+    user_id = claims["sub"]
+    try:
+        async with request.form() as form:
+            job_id = form.get("job_id")
+            job_title = form.get("job_title")
+            company = form.get("company")
+            cover_letter = form.get("cover_letter")
+
+            if not all([job_id, job_title, company, cover_letter]):
+                return JSONResponse({"error": "Job ID, job title, company, and cover letter are required"}, status_code=400)
+
+            resume_file = form.get("resume")
+            if not isinstance(resume_file, UploadFile) or not resume_file.filename:
+                return JSONResponse({"error": "Resume file is required"}, status_code=400)
+
+            # Token claims or identity cache; a thread in case it has to load the user
+            user = await asyncio.to_thread(main.identity_cache.get, user_id, claims)
+            if not user:
+                return JSONResponse({"error": "User not found"}, status_code=404)
+
+            # Resume storage (GridFS or local files) is synchronous
+            await resources.ready()
+            resume_ref = await asyncio.to_thread(
+                main.mongo.resume_store.save,
+                resume_file.file,
+                resume_file.filename,
+                content_type=(resume_file.content_type or "").split(";")[0].strip() or None,
+                metadata={"user_id": user_id, "job_id": job_id},
+            )
+
+        application = {
+            "user_id": user_id,
+            "applicant": user["name"],
+            "email": user["email"],
+            "resume": resume_file.filename,
+            "resume_ref": resume_ref,
+            "coverLetter": cover_letter,
+            "job_id": job_id,
+            "job_title": job_title,
+            "company": company,
+            "appliedDate": datetime.utcnow(),
+            "status": "applied"
+        }
+
+        # The unique (user_id, job_id) index rejects duplicate applications atomically
+        try:
+            result = await resources.db.job_applications.insert_one(application)
+        except DuplicateKeyError:
+            await asyncio.to_thread(main.mongo.resume_store.delete, resume_ref)
+            return JSONResponse({"error": "You have already applied for this job"}, status_code=409)
+        except Exception:
+            await asyncio.to_thread(main.mongo.resume_store.delete, resume_ref)
+            raise
+
+        return JSONResponse({
+            "status": "success",
+            "message": "Application submitted successfully",
+            "id": str(result.inserted_id)
+        }, status_code=201)
+
+    except Exception as e:
+        return JSONResponse({"error": str(e)}, status_code=500)
+
+
+# ============ PROBES ============
+
+async def liveness(request):
+    return JSONResponse({"status": "alive"})
+
+
+async def readiness(request):
+    try:
+        await resources.mongo.admin.command("ping")
+        return JSONResponse({"status": "ready", "database": "connected"})
+    except Exception as e:
+        return JSONResponse({"status": "not ready", "database": "unavailable", "error": str(e)}, status_code=503)
+
+
+async def health_check(request):
+    try:
+        # Shared with the Flask app; only the very first call does any I/O
+        snapshot = await asyncio.to_thread(main.health_monitor.snapshot)
+        if snapshot["database"] != "connected":
+            return JSONResponse({
+                "status": "unhealthy",
+                "error": snapshot.get("error"),
+                "snapshot_age_seconds": snapshot["age_seconds"]
+            }, status_code=500)
+
+        return JSONResponse({
+            "status": "healthy",
+            "database": "connected",
+            "database_ping_ms": snapshot["database_ping_ms"],
+            "users_count": snapshot["counts"]["users"],
+            "applications_count": snapshot["counts"]["job_applications"],
+            "listings_count": snapshot["counts"]["job_listings"],
+            "upstreams": snapshot["upstreams"],
+            "snapshot_refreshed_at": snapshot["refreshed_at"],
+            "snapshot_age_seconds": snapshot["age_seconds"],
+            "search_cache": main.search_cache.stats(),
+            "search_result_sets": main.result_sets.stats(),
+            "password_hasher": main.password_hasher.stats(),
+            "identity_cache": main.identity_cache.stats(),
+            "chatbot_cache": main.answer_cache.stats(),
+            "job_index": main.job_ingestor.stats(),
+            "cache_warmer": main.cache_warmer.stats(),
+            "rate_limits": main.rate_limiter.stats(),
+            "single_flight": {"search": search_flight.stats(), "chatbot": chat_flight.stats()},
+            "circuit_breakers": main.breakers.stats(),
+            "timestamp": datetime.utcnow().isoformat()
+        })
+    except Exception as e:
+        return JSONResponse({
+            "status": "unhealthy",
+            "error": str(e)
+        }, status_code=500)
+
+
+def instrumented(route, endpoint):
+    """Same request metrics as the Flask hooks, for the routes served natively here."""
+    async def handler(request):
+        started = time.perf_counter()
+        metrics.http_in_flight.inc(route)
+        try:
+            response = await endpoint(request)
+        finally:
+            metrics.http_in_flight.dec(route)
+        metrics.http_latency.observe(route, request.method, value=time.perf_counter() - started)
+        metrics.http_requests.inc(route, request.method, str(response.status_code))
+        return response
+    return handler
+
+
+@asynccontextmanager
+async def lifespan(app):
+    resources.open()
+    yield
+    await resources.close()
+
+
+app = Starlette(
+    routes=[
+        Route("/search", instrumented("/search", search_jobs), methods=["GET"]),
+        Route("/chatbot", instrumented("/chatbot", chatbot), methods=["POST"]),
+        Route("/chatbot/stream", instrumented("/chatbot/stream", chatbot_stream), methods=["GET", "POST"]),
+        Route("/login", instrumented("/login", login), methods=["POST"]),
+        Route("/applications", instrumented("/applications", list_applications), methods=["GET"]),
+        Route("/apply", instrumented("/apply", apply_for_job), methods=["POST"]),
+        Route("/livez", liveness, methods=["GET"]),
+        Route("/readyz", readiness, methods=["GET"]),
+        Route("/health", instrumented("/health", health_check), methods=["GET"]),
+        # Everything else (register, profile, bulk, admin, seed-data) runs on the Flask app in a thread pool
+        Mount("/", WSGIMiddleware(main.app, workers=WSGI_WORKERS)),
+    ],
+    middleware=[
+        Middleware(CORSMiddleware, allow_origins=["*"], allow_methods=["*"], allow_headers=["*"]),
+        # Native routes get gzip; responses the Flask app already compressed (br or gzip) pass through
+        *([Middleware(GZipMiddleware, minimum_size=compression.COMPRESS_MIN_SIZE)] if compression.ENABLED else []),
+    ],
+    lifespan=lifespan,
+)
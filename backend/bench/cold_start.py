@@ -0,0 +1,74 @@
+#!/usr/bin/env python3
+"""
+Cold-start benchmark: time from `import main` to the first response.
+
+Each run starts a fresh interpreter (like a Vercel cold start), imports the
+app and serves one request through the Flask test client.
+
+    python bench/cold_start.py --runs 10 --path /livez --max-ms 1500
+
+Exits non-zero if the median exceeds --max-ms, so it can guard against
+regressions (e.g. someone adding import-time database calls again).
+"""
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+
+BACKEND_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+CHILD = """
+import json, sys, time
+started = time.perf_counter()
+sys.path.insert(0, {backend_dir!r})
+import main
+imported = time.perf_counter()
+response = main.app.test_client().get({path!r})
+finished = time.perf_counter()
+print(json.dumps({{
+    "import_ms": (imported - started) * 1000,
+    "first_response_ms": (finished - started) * 1000,
+    "status": response.status_code,
+}}))
+"""
+
+
+def run_once(path):
+    env = dict(os.environ)
+    # /livez must not need a database; point at one that is never contacted
+    env.setdefault("MONGODB_URI", "mongodb://127.0.0.1:1")
+    env.setdefault("MONGO_SERVER_SELECTION_TIMEOUT_MS", "200")
+    result = subprocess.run(
+        [sys.executable, "-c", CHILD.format(backend_dir=BACKEND_DIR, path=path)],
+        capture_output=True, text=True, env=env, cwd=BACKEND_DIR,
+    )
+    if result.returncode != 0:
+        raise RuntimeError(f"Cold start failed:\n{result.stderr}")
+    return json.loads(result.stdout.strip().splitlines()[-1])
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--runs", type=int, default=5)
+    parser.add_argument("--path", default="/livez")
+    parser.add_argument("--max-ms", type=float, default=None, help="fail if the median first response is slower")
+    args = parser.parse_args()
+
+    samples = [run_once(args.path) for _ in range(args.runs)]
+    imports = [s["import_ms"] for s in samples]
+    firsts = [s["first_response_ms"] for s in samples]
+    statuses = sorted({s["status"] for s in samples})
+
+    print(f"Cold start over {args.runs} runs ({args.path}, status {statuses}):")
+    print(f"  import:         median {statistics.median(imports):7.1f} ms   max {max(imports):7.1f} ms")
+    print(f"  first response: median {statistics.median(firsts):7.1f} ms   max {max(firsts):7.1f} ms")
+
+    if args.max_ms is not None and statistics.median(firsts) > args.max_ms:
+        print(f"❌ Median cold start {statistics.median(firsts):.1f} ms exceeds {args.max_ms} ms")
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
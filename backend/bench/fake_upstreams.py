@@ -0,0 +1,216 @@
+#!/usr/bin/env python3
+"""
+Local stand-ins for the JSearch, Remotive and Gemini HTTP APIs.
+
+Each answers with payloads shaped like the real API after a configurable
+delay, and fails a configurable fraction of calls with HTTP 503:
+
+    python bench/fake_upstreams.py --port 9100 --latency-ms 150 --jitter-ms 50 --error-rate 0.02
+
+Then point the app at it:
+
+    JSEARCH_URL=http://127.0.0.1:9100/jsearch/search
+    REMOTIVE_URL=http://127.0.0.1:9100/remotive/api/remote-jobs
+    GEMINI_BASE_URL=http://127.0.0.1:9100/gemini
+    RAPIDAPI_KEY=fake GEMINI_API_KEY=fake
+
+bench/run_suite.py starts it for you.
+"""
+import argparse
+import json
+import random
+import threading
+import time
+import zlib
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, urlparse
+
+UPSTREAMS = ("jsearch", "remotive", "gemini")
+
+COMPANIES = ("Acme", "Globex", "Initech", "Umbrella", "Hooli", "Stark Industries", "Wayne Enterprises")
+CITIES = (("Berlin", "BE", "DE"), ("Austin", "TX", "US"), ("London", None, "GB"), ("Bengaluru", "KA", "IN"))
+
+
+class UpstreamBehaviour:
+    """Latency (ms, with uniform jitter) and error rate for one fake upstream."""
+
+    def __init__(self, latency_ms=100, jitter_ms=0, error_rate=0.0, jobs=10):
+        self.latency_ms = latency_ms
+        self.jitter_ms = jitter_ms
+        self.error_rate = error_rate
+        self.jobs = jobs
+        self.calls = 0
+        self.errors = 0
+
+    def delay(self):
+        time.sleep(max(0.0, self.latency_ms + random.uniform(-self.jitter_ms, self.jitter_ms)) / 1000)
+
+    def should_fail(self):
+        return random.random() < self.error_rate
+
+
+def jsearch_payload(query, page, count):
+    jobs = []
+    for n in range(count):
+        city, state, country = CITIES[n % len(CITIES)]
+        jobs.append({
+            "job_id": f"js-{zlib.crc32(query.encode())}-{page}-{n}",
+            "job_title": f"{query.title()} Engineer {n}",
+            "employer_name": COMPANIES[n % len(COMPANIES)],
+            "job_city": city,
+            "job_state": state,
+            "job_country": country,
+            "job_apply_link": f"https://example.com/jobs/{n}",
+            "job_description": f"We are hiring a {query} engineer. " * 20,
+            "job_employment_type": "FULLTIME",
+            "job_is_remote": n % 3 == 0,
+            "job_posted_at_datetime_utc": "2024-01-01T00:00:00.000Z",
+            "job_min_salary": 50000 + n * 1000,
+            "job_max_salary": 90000 + n * 1000,
+            "job_salary_currency": "USD",
+            "job_salary_period": "YEAR",
+        })
+    return {"status": "OK", "data": jobs}
+
+
+def remotive_payload(query, count):
+    return {"jobs": [{
+        "id": zlib.crc32(f"{query}-{n}".encode()),
+        "title": f"Remote {query.title()} Developer {n}",
+        "company_name": COMPANIES[n % len(COMPANIES)],
+        "candidate_required_location": "Worldwide",
+        "url": f"https://example.com/remote/{n}",
+        "description": f"<p>Remote {query} role.</p>" * 20,
+        "job_type": "full_time",
+        "publication_date": "2024-01-01T00:00:00",
+        "salary": "$80k - $120k",
+        "category": "Software Development",
+    } for n in range(count)]}
+
+
+def gemini_payload(text):
+    return {"candidates": [{"content": {"parts": [{"text": text}]}}]}
+
+
+GEMINI_ANSWER = ("Focus on Python, cloud and data skills, tailor your resume to each role, "
+                 "and practise explaining your projects out loud before interviews.")
+
+
+class FakeUpstreamHandler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+    behaviours = {}
+
+    def log_message(self, format, *args):
+        pass
+
+    def _upstream(self):
+        path = self.path.lstrip("/")
+        for name in UPSTREAMS:
+            if path.startswith(name):
+                return name
+        return None
+
+    def _send_json(self, status, payload):
+        body = json.dumps(payload).encode("utf-8")
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def _handle(self):
+        name = self._upstream()
+        if name is None:
+            return self._send_json(404, {"error": "unknown upstream"})
+        behaviour = self.behaviours[name]
+        behaviour.calls += 1
+        length = int(self.headers.get("Content-Length") or 0)
+        if length:
+            self.rfile.read(length)
+        behaviour.delay()
+        if behaviour.should_fail():
+            behaviour.errors += 1
+            return self._send_json(503, {"error": "fake upstream failure"})
+
+        url = urlparse(self.path)
+        params = parse_qs(url.query)
+        if name == "jsearch":
+            query = params.get("query", ["python"])[0]
+            return self._send_json(200, jsearch_payload(query, params.get("page", ["1"])[0], behaviour.jobs))
+        if name == "remotive":
+            return self._send_json(200, remotive_payload(params.get("search", ["python"])[0], behaviour.jobs))
+        if url.path.endswith(":streamGenerateContent"):
+            return self._stream_gemini(behaviour)
+        return self._send_json(200, gemini_payload(GEMINI_ANSWER))
+
+    def _stream_gemini(self, behaviour):
+        self.send_response(200)
+        self.send_header("Content-Type", "text/event-stream")
+        self.send_header("Connection", "close")
+        self.end_headers()
+        for word in GEMINI_ANSWER.split(" "):
+            self.wfile.write(f"data: {json.dumps(gemini_payload(word + ' '))}\r\n\r\n".encode("utf-8"))
+            self.wfile.flush()
+            time.sleep(behaviour.jitter_ms / 1000 / 10)
+        self.close_connection = True
+
+    do_GET = _handle
+    do_POST = _handle
+
+
+def start_fake_upstreams(port=0, behaviours=None):
+    """Serve the fakes on a background thread; returns (server, base_url)."""
+    handler = type("Handler", (FakeUpstreamHandler,), {
+        "behaviours": behaviours or {name: UpstreamBehaviour() for name in UPSTREAMS},
+    })
+    server = ThreadingHTTPServer(("127.0.0.1", port), handler)
+    server.daemon_threads = True
+    threading.Thread(target=server.serve_forever, name="fake-upstreams", daemon=True).start()
+    return server, f"http://127.0.0.1:{server.server_address[1]}"
+
+
+def upstream_env(base_url):
+    """Environment that points the app at the fakes."""
+    return {
+        "JSEARCH_URL": f"{base_url}/jsearch/search",
+        "REMOTIVE_URL": f"{base_url}/remotive/api/remote-jobs",
+        "GEMINI_BASE_URL": f"{base_url}/gemini",
+        "RAPIDAPI_KEY": "fake",
+        "GEMINI_API_KEY": "fake",
+    }
+
+
+def add_behaviour_args(parser):
+    parser.add_argument("--latency-ms", type=float, default=100, help="fake upstream response time")
+    parser.add_argument("--jitter-ms", type=float, default=20)
+    parser.add_argument("--error-rate", type=float, default=0.0, help="fraction of upstream calls answered with 503")
+    parser.add_argument("--jobs", type=int, default=10, help="jobs per fake search response")
+    parser.add_argument("--gemini-latency-ms", type=float, default=None, help="defaults to --latency-ms")
+
+
+def behaviours_from_args(args):
+    behaviours = {}
+    for name in UPSTREAMS:
+        latency = args.gemini_latency_ms if name == "gemini" and args.gemini_latency_ms is not None else args.latency_ms
+        behaviours[name] = UpstreamBehaviour(latency, args.jitter_ms, args.error_rate, args.jobs)
+    return behaviours
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--port", type=int, default=9100)
+    add_behaviour_args(parser)
+    args = parser.parse_args()
+
+    server, base_url = start_fake_upstreams(args.port, behaviours_from_args(args))
+    print(f"Fake upstreams listening on {base_url}")
+    for key, value in upstream_env(base_url).items():
+        print(f"  {key}={value}")
+    try:
+        threading.Event().wait()
+    except KeyboardInterrupt:
+        server.shutdown()
+
+
+if __name__ == "__main__":
+    main()
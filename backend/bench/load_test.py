@@ -0,0 +1,108 @@
+#!/usr/bin/env python3
+"""
+Closed-loop HTTP load generator for comparing serving modes.
+
+Start the two servers you want to compare, e.g.
+
+    python main.py                                    # threaded Flask on :8000
+    uvicorn asgi:app --port 8001                      # async ASGI on :8001
+
+and run the same scenario against both:
+
+    python bench/load_test.py --path "/search?query=python" \\
+        --concurrency 200 --duration 20 \\
+        --target threaded=http://127.0.0.1:8000 --target asgi=http://127.0.0.1:8001
+
+Reports requests/second and p50/p95/p99 latency per target.
+"""
+import argparse
+import asyncio
+import time
+
+import httpx
+
+
+def percentile(sorted_values, pct):
+    if not sorted_values:
+        return 0.0
+    index = min(len(sorted_values) - 1, int(round(pct / 100 * (len(sorted_values) - 1))))
+    return sorted_values[index]
+
+
+def summarize(name, latencies, errors, statuses, elapsed):
+    latencies.sort()
+    total = len(latencies) + errors
+    return {
+        "target": name,
+        "requests": total,
+        "errors": errors,
+        "statuses": dict(sorted(statuses.items())),
+        "rps": total / elapsed if elapsed else 0.0,
+        "p50_ms": percentile(latencies, 50) * 1000,
+        "p95_ms": percentile(latencies, 95) * 1000,
+        "p99_ms": percentile(latencies, 99) * 1000,
+    }
+
+
+async def run_load(name, base_url, requests_spec, concurrency, duration, timeout=60):
+    """Run `concurrency` workers that each send requests back-to-back for `duration` seconds.
+
+    `requests_spec` is a list of (method, path, json_body) cycled through by every worker.
+    """
+    latencies = []
+    statuses = {}
+    errors = 0
+    deadline = time.perf_counter() + duration
+    limits = httpx.Limits(max_connections=concurrency, max_keepalive_connections=concurrency)
+
+    async with httpx.AsyncClient(base_url=base_url, limits=limits, timeout=timeout) as client:
+        async def worker(offset):
+            nonlocal errors
+            i = offset
+            while time.perf_counter() < deadline:
+                method, path, body = requests_spec[i % len(requests_spec)]
+                i += 1
+                started = time.perf_counter()
+                try:
+                    response = await client.request(method, path, json=body)
+                    await response.aread()
+                except httpx.HTTPError:
+                    errors += 1
+                    continue
+                latencies.append(time.perf_counter() - started)
+                statuses[response.status_code] = statuses.get(response.status_code, 0) + 1
+
+        started = time.perf_counter()
+        await asyncio.gather(*(worker(n) for n in range(concurrency)))
+        elapsed = time.perf_counter() - started
+
+    return summarize(name, latencies, errors, statuses, elapsed)
+
+
+def print_report(results):
+    print(f"{'target':<12} {'requests':>9} {'errors':>7} {'rps':>9} {'p50 ms':>9} {'p95 ms':>9} {'p99 ms':>9}  statuses")
+    for r in results:
+        print(f"{r['target']:<12} {r['requests']:>9} {r['errors']:>7} {r['rps']:>9.1f} "
+              f"{r['p50_ms']:>9.1f} {r['p95_ms']:>9.1f} {r['p99_ms']:>9.1f}  {r['statuses']}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--target", action="append", required=True, help="name=base_url (repeatable)")
+    parser.add_argument("--path", default="/search?query=python%20developer")
+    parser.add_argument("--method", default="GET")
+    parser.add_argument("--concurrency", type=int, default=50)
+    parser.add_argument("--duration", type=float, default=10)
+    args = parser.parse_args()
+
+    spec = [(args.method, args.path, None)]
+    results = []
+    for target in args.target:
+        name, _, url = target.partition("=")
+        print(f"Running {args.concurrency} workers for {args.duration}s against {name} ({url}) ...")
+        results.append(asyncio.run(run_load(name, url, spec, args.concurrency, args.duration)))
+    print_report(results)
+
+
+if __name__ == "__main__":
+    main()
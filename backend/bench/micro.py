@@ -0,0 +1,93 @@
+#!/usr/bin/env python3
+"""
+Micro-benchmarks for the in-process hot paths (no network, no database).
+
+    python bench/micro.py                 # all benchmarks
+    python bench/micro.py --filter cache  # only names containing "cache"
+
+Reports the best per-call time over --repeat rounds, so results are stable
+enough to compare before/after a change on the same machine.
+"""
+import argparse
+import os
+import sys
+import timeit
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from fake_upstreams import jsearch_payload, remotive_payload  # noqa: E402
+
+
+def build_benchmarks():
+    from answer_cache import normalize_question
+    from job_index import JobIndex
+    from job_schema import shape_search_payload
+    from metrics import Histogram
+    from pagination import decode_cursor, encode_cursor
+    from rate_limit import RateLimiter, MemoryBackend
+    from search_cache import SearchCache, normalize_search_key
+    from search_filters import ResultColumns, SearchFilters
+    from search_providers import JSearchProvider, RemotiveProvider, merge_jobs
+    from bson import ObjectId
+    from datetime import datetime
+
+    jsearch, remotive = JSearchProvider("key"), RemotiveProvider()
+    jsearch_raw = jsearch_payload("python developer", 1, 10)
+    remotive_raw = remotive_payload("python developer", 10)
+    normalized = {
+        "jsearch": [jsearch.normalize(job) for job in jsearch.jobs(jsearch_raw)],
+        "remotive": [remotive.normalize(job) for job in remotive.jobs(remotive_raw)],
+    }
+    status = {"jsearch": {"status": "ok"}, "remotive": {"status": "ok"}}
+
+    cache = SearchCache(max_entries=1000)
+    cache.set("python developer", "berlin", 1, "jsearch", jsearch_raw)
+
+    index = JobIndex(max_docs=20000)
+    for n in range(200):
+        for job in normalized["jsearch"] + normalized["remotive"]:
+            index.add(dict(job, id=f"{job['id']}-{n}"))
+
+    limiter = RateLimiter(limits={"search": "1000000/1"}, backend=MemoryBackend(), enabled=True)
+    histogram = Histogram("bench_seconds", "benchmark", ("route", "method"))
+    columns = ResultColumns(merge_jobs([jsearch, remotive], normalized, dict(status)))
+    filters = SearchFilters.from_args({"employment_type": "fulltime", "salary_min": "60000", "sort": "salary"})
+    cursor = encode_cursor({"appliedDate": datetime.utcnow(), "_id": ObjectId()})
+
+    return {
+        "search_cache_key": lambda: normalize_search_key("  Python   Developer ", "Berlin", 1, "jsearch"),
+        "search_cache_hit": lambda: cache.get("python developer", "Berlin", 1, "jsearch"),
+        "search_cache_miss": lambda: cache.get("golang", None, 1, "jsearch"),
+        "normalize_jsearch_page": lambda: [jsearch.normalize(job) for job in jsearch.jobs(jsearch_raw)],
+        "merge_two_providers": lambda: merge_jobs([jsearch, remotive], normalized, dict(status)),
+        "compact_merged_page": lambda: shape_search_payload(merge_jobs([jsearch, remotive], normalized, dict(status))),
+        "filter_sort_cached_set": lambda: columns.apply(filters),
+        "job_index_search_4k_docs": lambda: index.search("python developer", "berlin", limit=10),
+        "chatbot_question_key": lambda: normalize_question("What skills do I need to become a data scientist?"),
+        "rate_limit_check": lambda: limiter.check("search", "user:42"),
+        "metrics_histogram_observe": lambda: histogram.observe("/search", "GET", value=0.042),
+        "pagination_cursor_roundtrip": lambda: decode_cursor(cursor),
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--filter", default="", help="only run benchmarks whose name contains this")
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--min-time", type=float, default=0.2, help="seconds per round")
+    args = parser.parse_args()
+
+    print(f"{'benchmark':<30} {'per call':>12} {'calls/s':>12}")
+    for name, fn in build_benchmarks().items():
+        if args.filter not in name:
+            continue
+        timer = timeit.Timer(fn)
+        number, _ = timer.autorange()
+        number = max(1, int(number * args.min_time / 0.2))
+        best = min(timer.repeat(repeat=args.repeat, number=number)) / number
+        unit, scale = ("us", 1e6) if best < 1e-3 else ("ms", 1e3)
+        print(f"{name:<30} {best * scale:>9.2f} {unit} {1 / best:>12,.0f}")
+
+
+if __name__ == "__main__":
+    main()
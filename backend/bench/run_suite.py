@@ -0,0 +1,215 @@
+#!/usr/bin/env python3
+"""
+Reproducible load scenarios for the register / login / search / apply / list mix.
+
+Starts the fake JSearch/Remotive/Gemini upstreams (bench/fake_upstreams.py)
+and the Flask app in this process, on an in-process MongoDB stand-in
+(mongomock) or a local mongod, then runs `--users` virtual users for
+`--duration` seconds. Each user registers once and then picks operations at
+random according to `--mix`.
+
+    pip install -r requirements-bench.txt
+    python bench/run_suite.py --users 20 --duration 30
+    python bench/run_suite.py --mongodb-uri mongodb://127.0.0.1:27017 --latency-ms 300 --error-rate 0.05
+    python bench/run_suite.py --target http://127.0.0.1:8001   # a server you started, with the
+                                                                # fake upstream env printed at startup
+
+Prints requests/second and p50/p95/p99 latency per operation (`--json` for
+machine-readable output). Rate limits and the cache warmer are switched off
+unless --keep-rate-limits is given, so the numbers measure the code paths
+rather than the throttling.
+"""
+import argparse
+import asyncio
+import json
+import os
+import random
+import sys
+import tempfile
+import threading
+import time
+import uuid
+
+import httpx
+
+BENCH_DIR = os.path.dirname(os.path.abspath(__file__))
+sys.path.insert(0, BENCH_DIR)
+sys.path.insert(0, os.path.dirname(BENCH_DIR))
+
+from fake_upstreams import add_behaviour_args, behaviours_from_args, start_fake_upstreams, upstream_env  # noqa: E402
+from load_test import print_report, summarize  # noqa: E402
+
+OPERATIONS = ("register", "login", "search", "apply", "list")
+DEFAULT_MIX = "login=1,search=6,apply=2,list=3"
+QUERIES = (
+    ("python developer", None), ("data analyst", "London"), ("react", None), ("devops engineer", "Berlin"),
+    ("product manager", None), ("java", "Austin"), ("machine learning", None), ("nurse", None),
+)
+RESUME = b"%PDF-1.4\n" + b"0" * 48 * 1024
+
+
+def parse_mix(spec):
+    weights = {}
+    for part in spec.split(","):
+        name, _, weight = part.partition("=")
+        if name.strip() not in OPERATIONS:
+            raise ValueError(f"Unknown operation '{name}' in --mix. Use: {', '.join(OPERATIONS)}")
+        weights[name.strip()] = float(weight or 1)
+    return weights
+
+
+def start_app(args, upstream_base_url):
+    """Import the app against the fakes and a MongoDB stand-in; returns (server, base_url)."""
+    os.environ.update(upstream_env(upstream_base_url))
+    if not args.keep_rate_limits:
+        os.environ["RATE_LIMIT_ENABLED"] = "0"
+        os.environ["CACHE_WARMER_ENABLED"] = "0"
+    if args.bcrypt_rounds:
+        os.environ["BCRYPT_ROUNDS"] = str(args.bcrypt_rounds)
+
+    if args.mongodb_uri:
+        os.environ["MONGODB_URI"] = args.mongodb_uri
+    else:
+        # In-process stand-in; GridFS is not supported by mongomock, so resumes go to a temp dir
+        import mongomock
+        import pymongo
+        pymongo.MongoClient = mongomock.MongoClient
+        os.environ["MONGODB_URI"] = "mongodb://mongomock"
+        os.environ["RESUME_STORAGE"] = "local"
+        os.environ["RESUME_STORAGE_DIR"] = tempfile.mkdtemp(prefix="bench-resumes-")
+
+    from werkzeug.serving import WSGIRequestHandler, make_server
+    import main
+
+    class QuietHandler(WSGIRequestHandler):
+        def log_request(self, *args, **kwargs):
+            pass
+
+    # Never touch the real database on a shared mongod
+    main.mongo.name = args.database
+    server = make_server("127.0.0.1", 0, main.app, threaded=True, request_handler=QuietHandler)
+    threading.Thread(target=server.serve_forever, name="bench-app", daemon=True).start()
+    return server, f"http://127.0.0.1:{server.server_port}"
+
+
+class Recorder:
+    def __init__(self):
+        self.ops = {name: {"latencies": [], "errors": 0, "statuses": {}} for name in OPERATIONS}
+
+    async def timed(self, name, request):
+        record = self.ops[name]
+        started = time.perf_counter()
+        try:
+            response = await request
+            await response.aread()
+        except httpx.HTTPError:
+            record["errors"] += 1
+            return None
+        record["latencies"].append(time.perf_counter() - started)
+        record["statuses"][response.status_code] = record["statuses"].get(response.status_code, 0) + 1
+        return response
+
+
+async def virtual_user(client, recorder, user_number, run_id, mix, deadline):
+    email = f"bench-{run_id}-{user_number}@example.com"
+    password = "benchmark-password"
+    response = await recorder.timed("register", client.post(
+        "/register", json={"name": f"Bench User {user_number}", "email": email, "password": password}))
+    if response is None or response.status_code != 201:
+        return
+    headers = {"Authorization": f"Bearer {response.json()['access_token']}"}
+    names, weights = zip(*mix.items())
+    applied = 0
+
+    while time.perf_counter() < deadline:
+        operation = random.choices(names, weights)[0]
+        if operation == "register":
+            user_number += 100000
+            await recorder.timed("register", client.post("/register", json={
+                "name": "Bench User", "email": f"bench-{run_id}-{user_number}@example.com", "password": password}))
+        elif operation == "login":
+            await recorder.timed("login", client.post("/login", json={"email": email, "password": password}))
+        elif operation == "search":
+            query, location = random.choice(QUERIES)
+            params = {"query": query, "page": random.choice((1, 1, 1, 2))}
+            if location:
+                params["location"] = location
+            await recorder.timed("search", client.get("/search", params=params))
+        elif operation == "apply":
+            applied += 1
+            await recorder.timed("apply", client.post("/apply", headers=headers, data={
+                "job_id": f"bench-{run_id}-{user_number}-{applied}",
+                "job_title": "Python Engineer",
+                "company": "Acme",
+                "cover_letter": "I would love to work on this.",
+            }, files={"resume": ("resume.pdf", RESUME, "application/pdf")}))
+        else:
+            await recorder.timed("list", client.get("/applications", headers=headers, params={"limit": 20}))
+
+
+async def run_scenario(base_url, users, duration, mix):
+    recorder = Recorder()
+    run_id = uuid.uuid4().hex[:8]
+    limits = httpx.Limits(max_connections=users, max_keepalive_connections=users)
+    async with httpx.AsyncClient(base_url=base_url, limits=limits, timeout=60) as client:
+        started = time.perf_counter()
+        deadline = started + duration
+        await asyncio.gather(*(virtual_user(client, recorder, n, run_id, mix, deadline) for n in range(users)))
+        elapsed = time.perf_counter() - started
+
+    results = []
+    all_latencies, all_errors, all_statuses = [], 0, {}
+    for name in OPERATIONS:
+        record = recorder.ops[name]
+        if not record["latencies"] and not record["errors"]:
+            continue
+        all_latencies.extend(record["latencies"])
+        all_errors += record["errors"]
+        for status, count in record["statuses"].items():
+            all_statuses[status] = all_statuses.get(status, 0) + count
+        results.append(summarize(name, list(record["latencies"]), record["errors"], record["statuses"], elapsed))
+    results.append(summarize("total", all_latencies, all_errors, all_statuses, elapsed))
+    return results
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--users", type=int, default=20, help="concurrent virtual users")
+    parser.add_argument("--duration", type=float, default=20)
+    parser.add_argument("--mix", default=DEFAULT_MIX, help=f"operation weights (default {DEFAULT_MIX})")
+    parser.add_argument("--target", help="benchmark an already running server instead of starting one")
+    parser.add_argument("--upstream-port", type=int, default=None,
+                        help="port for the fake upstreams (default: random, or 9100 with --target)")
+    parser.add_argument("--mongodb-uri", help="use a local mongod instead of the in-process stand-in")
+    parser.add_argument("--database", default="online_job_portal_bench")
+    parser.add_argument("--bcrypt-rounds", type=int, default=None, help="override BCRYPT_ROUNDS for the app")
+    parser.add_argument("--keep-rate-limits", action="store_true")
+    parser.add_argument("--seed", type=int, default=1, help="random seed for the operation mix")
+    parser.add_argument("--json", action="store_true", help="print results as JSON")
+    add_behaviour_args(parser)
+    args = parser.parse_args()
+
+    random.seed(args.seed)
+    mix = parse_mix(args.mix)
+    upstream_port = args.upstream_port if args.upstream_port is not None else (9100 if args.target else 0)
+    upstreams, upstream_base_url = start_fake_upstreams(upstream_port, behaviours_from_args(args))
+    base_url = args.target
+    if base_url is None:
+        _, base_url = start_app(args, upstream_base_url)
+    else:
+        print(f"Start the target with these upstream settings: {upstream_env(upstream_base_url)}")
+
+    if not args.json:
+        print(f"Running {args.users} users for {args.duration}s against {base_url} (mix {args.mix}) ...")
+    results = asyncio.run(run_scenario(base_url, args.users, args.duration, mix))
+    upstream_calls = {name: {"calls": b.calls, "errors": b.errors} for name, b in upstreams.RequestHandlerClass.behaviours.items()}
+
+    if args.json:
+        print(json.dumps({"results": results, "upstreams": upstream_calls}, indent=2))
+    else:
+        print_report(results)
+        print(f"upstream calls: {upstream_calls}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,194 @@
+import base64
+import binascii
+import io
+import os
+from datetime import datetime
+
+from bson import ObjectId
+from pymongo import UpdateOne
+from pymongo.errors import BulkWriteError
+
+BULK_MAX_ITEMS = int(os.getenv("BULK_MAX_ITEMS", "500"))
+# Request body cap for /apply/bulk; the base64 resumes make it the largest JSON body we accept
+BULK_MAX_BYTES = int(os.getenv("BULK_MAX_BYTES", str(32 * 1024 * 1024)))
+
+APPLICATION_STATUSES = ("applied", "reviewing", "interview", "offered", "rejected", "withdrawn")
+
+DUPLICATE_KEY = 11000
+
+
+class BulkRequestError(ValueError):
+    """The batch as a whole is unusable (not a list, empty, too large)."""
+
+
+def check_batch(items, name):
+    if not isinstance(items, list) or not items:
+        raise BulkRequestError(f"{name} must be a non-empty list")
+    if len(items) > BULK_MAX_ITEMS:
+        raise BulkRequestError(f"At most {BULK_MAX_ITEMS} {name} per request")
+
+
+def _failed(index, result, error):
+    return {"index": index, "result": result, "error": error}
+
+
+def _decode_resume(resume):
+    if not isinstance(resume, dict) or not resume.get("filename") or not resume.get("content_base64"):
+        raise ValueError("resume must be an object with filename and content_base64")
+    try:
+        content = base64.b64decode(resume["content_base64"], validate=True)
+    except (binascii.Error, ValueError):
+        raise ValueError("resume.content_base64 is not valid base64")
+    return resume["filename"], content, resume.get("content_type") or "application/octet-stream"
+
+
+def summarize(results):
+    counts = {}
+    for result in results:
+        counts[result["result"]] = counts.get(result["result"], 0) + 1
+    return {"status": "success", "count": len(results), "summary": counts, "results": results}
+
+
+def bulk_apply(collection, resume_store, user, items, now=None):
+    """Insert many applications for one user with one `$in` lookup and one unordered insert_many.
+
+    Returns one result per item, in request order: created (with id), invalid,
+    duplicate (already applied, or repeated in this batch) or error.
+    """
+    check_batch(items, "applications")
+    now = now or datetime.utcnow()
+    results = [None] * len(items)
+    pending = []  # (index, item, resume)
+    seen = set()
+
+    for index, item in enumerate(items):
+        if not isinstance(item, dict):
+            results[index] = _failed(index, "invalid", "Each application must be an object")
+            continue
+        missing = [field for field in ("job_id", "job_title", "company", "cover_letter") if not item.get(field)]
+        if missing:
+            results[index] = _failed(index, "invalid", f"Missing fields: {', '.join(missing)}")
+            continue
+        try:
+            resume = _decode_resume(item.get("resume"))
+        except ValueError as e:
+            results[index] = _failed(index, "invalid", str(e))
+            continue
+        job_id = str(item["job_id"])
+        if job_id in seen:
+            results[index] = _failed(index, "duplicate", "Job appears more than once in this batch")
+            continue
+        seen.add(job_id)
+        pending.append((index, item, resume))
+
+    # One round trip for every "already applied" check
+    existing = {
+        doc["job_id"]
+        for doc in collection.find({"user_id": user["id"], "job_id": {"$in": list(seen)}}, {"job_id": 1})
+    } if seen else set()
+
+    to_insert = []  # (index, document)
+    for index, item, (filename, content, content_type) in pending:
+        job_id = str(item["job_id"])
+        if job_id in existing:
+            results[index] = _failed(index, "duplicate", "You have already applied for this job")
+            continue
+        resume_ref = resume_store.save(
+            io.BytesIO(content), filename, content_type=content_type,
+            metadata={"user_id": user["id"], "job_id": job_id},
+        )
+        to_insert.append((index, {
+            "user_id": user["id"],
+            "applicant": user["name"],
+            "email": user["email"],
+            "resume": filename,
+            "resume_ref": resume_ref,
+            "coverLetter": item["cover_letter"],
+            "job_id": job_id,
+            "job_title": item["job_title"],
+            "company": item["company"],
+            "appliedDate": now,
+            "status": "applied",
+        }))
+
+    write_errors = {}
+    if to_insert:
+        try:
+            collection.insert_many([doc for _, doc in to_insert], ordered=False)
+        except BulkWriteError as e:
+            # Unordered: everything else was still inserted
+            write_errors = {error["index"]: error for error in e.details.get("writeErrors", [])}
+        except Exception:
+            for _, doc in to_insert:
+                resume_store.delete(doc["resume_ref"])
+            raise
+
+    for position, (index, doc) in enumerate(to_insert):
+        error = write_errors.get(position)
+        if error is None:
+            results[index] = {"index": index, "result": "created", "id": str(doc["_id"])}
+            continue
+        resume_store.delete(doc["resume_ref"])
+        if error.get("code") == DUPLICATE_KEY:
+            # Lost a race with a concurrent /apply for the same job
+            results[index] = _failed(index, "duplicate", "You have already applied for this job")
+        else:
+            results[index] = _failed(index, "error", error.get("errmsg", "Write failed"))
+    return results
+
+
+def bulk_update_status(collection, items, now=None):
+    """Apply many status changes with one `$in` existence check and one unordered bulk_write.
+
+    Returns one result per item, in request order: updated, unchanged,
+    not_found, invalid or error.
+    """
+    check_batch(items, "updates")
+    now = now or datetime.utcnow()
+    results = [None] * len(items)
+    pending = {}  # ObjectId -> (index, status)
+
+    for index, item in enumerate(items):
+        if not isinstance(item, dict) or not ObjectId.is_valid(item.get("id") or ""):
+            results[index] = _failed(index, "invalid", "id must be a valid application id")
+            continue
+        if item.get("status") not in APPLICATION_STATUSES:
+            results[index] = _failed(index, "invalid", f"status must be one of: {', '.join(APPLICATION_STATUSES)}")
+            continue
+        application_id = ObjectId(item["id"])
+        if application_id in pending:
+            results[index] = _failed(index, "invalid", "Application appears more than once in this batch")
+            continue
+        pending[application_id] = (index, item["status"])
+
+    current = {
+        doc["_id"]: doc.get("status")
+        for doc in collection.find({"_id": {"$in": list(pending)}}, {"status": 1})
+    } if pending else {}
+
+    operations = []  # (index, application id, UpdateOne)
+    for application_id, (index, status) in pending.items():
+        if application_id not in current:
+            results[index] = _failed(index, "not_found", "Application not found")
+        elif current[application_id] == status:
+            results[index] = {"index": index, "result": "unchanged", "id": str(application_id)}
+        else:
+            operations.append((index, application_id, UpdateOne(
+                {"_id": application_id},
+                {"$set": {"status": status, "status_updated_at": now}},
+            )))
+
+    write_errors = {}
+    if operations:
+        try:
+            collection.bulk_write([operation for _, _, operation in operations], ordered=False)
+        except BulkWriteError as e:
+            write_errors = {error["index"]: error for error in e.details.get("writeErrors", [])}
+
+    for position, (index, application_id, _) in enumerate(operations):
+        error = write_errors.get(position)
+        if error is None:
+            results[index] = {"index": index, "result": "updated", "id": str(application_id)}
+        else:
+            results[index] = _failed(index, "error", error.get("errmsg", "Write failed"))
+    return results
@@ -0,0 +1,223 @@
+import heapq
+import os
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor, wait
+
+from search_cache import normalize_search_key
+
+# Refresh budgets in provider calls per minute; JSearch is the quota-limited one
+DEFAULT_PROVIDER_BUDGETS = {
+    "jsearch": int(os.getenv("CACHE_WARMER_BUDGET_JSEARCH", "30")),
+    "remotive": int(os.getenv("CACHE_WARMER_BUDGET_REMOTIVE", "60")),
+}
+
+
+class QueryTracker:
+    """Counts (query, location) searches with exponential decay so recent demand wins.
+
+    A query searched ten times an hour ago scores lower than one searched ten
+    times in the last minute; scores halve every `half_life` seconds.
+    """
+
+    def __init__(self, half_life=None, max_keys=None):
+        self.half_life = half_life or float(os.getenv("CACHE_WARMER_HALF_LIFE", "900"))
+        self.max_keys = max_keys or int(os.getenv("CACHE_WARMER_MAX_TRACKED", "5000"))
+        self._scores = {}  # (query, location) -> (score, updated_at)
+        self._lock = threading.Lock()
+
+    def _decayed(self, score, updated_at, now):
+        return score * 0.5 ** ((now - updated_at) / self.half_life)
+
+    def record(self, query, location):
+        query, location, _, _ = normalize_search_key(query, location, 1, None)
+        if not query:
+            return
+        now = time.monotonic()
+        with self._lock:
+            score, updated_at = self._scores.get((query, location), (0.0, now))
+            self._scores[(query, location)] = (self._decayed(score, updated_at, now) + 1, now)
+            if len(self._scores) > self.max_keys:
+                self._prune(now)
+
+    def _prune(self, now):
+        # Keep the hottest 90% so pruning does not run on every new query
+        keep = heapq.nlargest(
+            int(self.max_keys * 0.9),
+            self._scores.items(),
+            key=lambda item: self._decayed(item[1][0], item[1][1], now),
+        )
+        self._scores = dict(keep)
+
+    def top(self, n, min_score=0):
+        """Return up to `n` [(query, location, score)] pairs, hottest first."""
+        now = time.monotonic()
+        with self._lock:
+            scored = [
+                (query, location, self._decayed(score, updated_at, now))
+                for (query, location), (score, updated_at) in self._scores.items()
+            ]
+        return heapq.nlargest(n, [item for item in scored if item[2] >= min_score], key=lambda item: item[2])
+
+    def __len__(self):
+        return len(self._scores)
+
+
+class RateBudget:
+    """At most `per_minute` calls in any sliding 60 second window."""
+
+    def __init__(self, per_minute):
+        self.per_minute = per_minute
+        self._calls = []
+        self._lock = threading.Lock()
+
+    def take(self):
+        now = time.monotonic()
+        with self._lock:
+            self._calls = [t for t in self._calls if t > now - 60]
+            if len(self._calls) >= self.per_minute:
+                return False
+            self._calls.append(now)
+            return True
+
+    def release(self):
+        """Give back the most recent call, e.g. when the job it was taken for is dropped."""
+        with self._lock:
+            if self._calls:
+                self._calls.pop()
+
+
+class CacheWarmer:
+    """Background scheduler that keeps the search cache warm for trending queries.
+
+    Every `interval` seconds it takes the top-N tracked (query, location) pairs
+    and re-fetches page 1 from each provider whose cached entry expires within
+    `refresh_before` seconds. A pair with no cached entry at all is searched
+    once in the engine's mode. Refreshes run on a small pool of their own and
+    each provider has a per-minute budget, so warming never crowds out user
+    traffic or burns the upstream quota.
+    """
+
+    def __init__(self, engine, cache, tracker=None, top_n=None, interval=None, refresh_before=None,
+                 concurrency=None, min_score=None, provider_budgets=None):
+        self.engine = engine
+        self.cache = cache
+        self.tracker = tracker or QueryTracker()
+        self.top_n = top_n or int(os.getenv("CACHE_WARMER_TOP_N", "20"))
+        self.interval = interval or float(os.getenv("CACHE_WARMER_INTERVAL", "30"))
+        self.refresh_before = refresh_before or float(os.getenv("CACHE_WARMER_REFRESH_BEFORE", "60"))
+        self.min_score = min_score if min_score is not None else float(os.getenv("CACHE_WARMER_MIN_SCORE", "2"))
+        self.enabled = os.getenv("CACHE_WARMER_ENABLED", "1") == "1"
+        budgets = dict(DEFAULT_PROVIDER_BUDGETS)
+        budgets.update(provider_budgets or {})
+        self.budgets = {name: RateBudget(per_minute) for name, per_minute in budgets.items()}
+        self.executor = ThreadPoolExecutor(
+            max_workers=concurrency or int(os.getenv("CACHE_WARMER_CONCURRENCY", "4")),
+            thread_name_prefix="cache-warmer",
+        )
+        self._thread = None
+        self._thread_lock = threading.Lock()
+        self._stop = threading.Event()
+        self.cycles = 0
+        self.refreshes = 0
+        self.refresh_errors = 0
+        self.skipped_budget = 0
+        self.last_cycle_seconds = None
+
+    def record(self, query, location):
+        """Count one user search; starts the scheduler on first use."""
+        if not self.enabled:
+            return
+        self.tracker.record(query, location)
+        self.start()
+
+    def start(self):
+        if self._thread is not None:
+            return
+        with self._thread_lock:
+            if self._thread is None:
+                self._thread = threading.Thread(target=self._run, name="cache-warmer", daemon=True)
+                self._thread.start()
+
+    def stop(self):
+        self._stop.set()
+
+    def _run(self):
+        while not self._stop.wait(self.interval):
+            try:
+                self.warm()
+            except Exception as e:
+                print(f"Cache warming cycle failed: {e}")
+
+    def _take_budget(self, *providers):
+        """Take one call from each provider's budget, or none at all if any of them is spent."""
+        taken = []
+        for provider in providers:
+            budget = self.budgets.get(provider.name)
+            if budget is None:
+                continue
+            if not budget.take():
+                for spent in taken:
+                    spent.release()
+                self.skipped_budget += 1
+                return False
+            taken.append(budget)
+        return True
+
+    def _search_providers(self, providers):
+        """Providers a cold search calls: sequential tries the first one, merge and first call them all."""
+        return providers[:1] if self.engine.mode == "sequential" else providers
+
+    def _refresh(self, provider, query, location):
+        self.engine.fetch(provider, query, location, 1, refresh=True)
+
+    def _search(self, query, location):
+        self.engine.search(query, location, 1)
+
+    def plan(self):
+        """Return the refresh jobs for one cycle as [(callable, args)]."""
+        jobs = []
+        providers = self.engine.active_providers()
+        for query, location, _ in self.tracker.top(self.top_n, self.min_score):
+            seconds_left = {
+                provider.name: self.cache.ttl_left(query, location, 1, provider.name) for provider in providers
+            }
+            if all(left is None for left in seconds_left.values()):
+                if providers and self._take_budget(*self._search_providers(providers)):
+                    jobs.append((self._search, (query, location)))
+                continue
+            for provider in providers:
+                left = seconds_left[provider.name]
+                if left is not None and left < self.refresh_before and self._take_budget(provider):
+                    jobs.append((self._refresh, (provider, query, location)))
+        return jobs
+
+    def warm(self):
+        """Run one warming cycle and wait for its refreshes to finish."""
+        started = time.monotonic()
+        futures = [self.executor.submit(job, *args) for job, args in self.plan()]
+        wait(futures)
+        for future in futures:
+            if future.exception() is not None:
+                self.refresh_errors += 1
+                print(f"Cache refresh failed: {future.exception()}")
+            else:
+                self.refreshes += 1
+        self.cycles += 1
+        self.last_cycle_seconds = round(time.monotonic() - started, 3)
+
+    def stats(self):
+        return {
+            "enabled": self.enabled,
+            "running": self._thread is not None,
+            "tracked_queries": len(self.tracker),
+            "trending": [
+                {"query": query, "location": location, "score": round(score, 2)}
+                for query, location, score in self.tracker.top(min(self.top_n, 10), self.min_score)
+            ],
+            "cycles": self.cycles,
+            "refreshes": self.refreshes,
+            "refresh_errors": self.refresh_errors,
+            "skipped_budget": self.skipped_budget,
+            "last_cycle_seconds": self.last_cycle_seconds,
+        }
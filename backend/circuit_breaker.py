@@ -0,0 +1,200 @@
+import asyncio
+import math
+import os
+import threading
+import time
+from collections import deque
+
+CLOSED = "closed"
+OPEN = "open"
+HALF_OPEN = "half_open"
+
+# Gemini may legitimately take longer than the search providers
+DEFAULT_BASE_TIMEOUTS = {"gemini": 30.0, "gemini_stream": 30.0}
+
+
+class CircuitOpen(Exception):
+    """Raised instead of calling an upstream whose breaker is open."""
+
+    status = "circuit_open"
+
+    def __init__(self, name, retry_after):
+        super().__init__(f"{name} is unavailable (circuit open), retry in {retry_after}s")
+        self.name = name
+        self.retry_after = retry_after
+
+
+class UpstreamUnavailable(Exception):
+    """An upstream answered with a status that counts as a failure (5xx or 429)."""
+
+    def __init__(self, name, status_code):
+        super().__init__(f"{name} answered HTTP {status_code}")
+        self.name = name
+        self.status_code = status_code
+
+
+def is_failure_status(status_code):
+    return status_code >= 500 or status_code == 429
+
+
+class CircuitBreaker:
+    """Closed / open / half-open breaker with a timeout adapted from observed latency.
+
+    After `failure_threshold` consecutive failures the breaker opens and calls
+    fail fast with CircuitOpen for `reset_timeout` seconds. It then lets
+    `half_open_max` probe calls through: one success closes it, a failure
+    opens it again.
+
+    `timeout()` is `multiplier` x the p99 of recent successful calls, kept
+    between `min_timeout` and `base_timeout`, so a healthy upstream that
+    answers in 300 ms is given ~1 s instead of the full 10 s.
+    """
+
+    def __init__(self, name, base_timeout=10.0, failure_threshold=None, reset_timeout=None, half_open_max=None,
+                 min_timeout=None, multiplier=None, window=200, min_samples=20, observer=None):
+        self.name = name
+        # Called with (name, seconds, outcome) after every attempted call
+        self.observer = observer
+        self.base_timeout = base_timeout
+        self.failure_threshold = failure_threshold or int(os.getenv("CIRCUIT_FAILURE_THRESHOLD", "5"))
+        self.reset_timeout = reset_timeout or float(os.getenv("CIRCUIT_RESET_TIMEOUT", "30"))
+        self.half_open_max = half_open_max or int(os.getenv("CIRCUIT_HALF_OPEN_MAX", "1"))
+        self.min_timeout = min_timeout or float(os.getenv("ADAPTIVE_TIMEOUT_MIN", "1"))
+        self.multiplier = multiplier or float(os.getenv("ADAPTIVE_TIMEOUT_MULTIPLIER", "2"))
+        self.min_samples = min_samples
+        self._latencies = deque(maxlen=window)
+        self._lock = threading.Lock()
+        self.state = CLOSED
+        self._failures = 0
+        self._opened_at = None
+        self._probes = 0
+        self.successes = 0
+        self.failures = 0
+        self.rejected = 0
+        self.opened = 0
+
+    def before_call(self):
+        """Raise CircuitOpen unless a call may go through right now."""
+        with self._lock:
+            if self.state == OPEN:
+                waited = time.monotonic() - self._opened_at
+                if waited < self.reset_timeout:
+                    self.rejected += 1
+                    raise CircuitOpen(self.name, max(1, math.ceil(self.reset_timeout - waited)))
+                self.state = HALF_OPEN
+                self._probes = 0
+            if self.state == HALF_OPEN:
+                if self._probes >= self.half_open_max:
+                    self.rejected += 1
+                    raise CircuitOpen(self.name, 1)
+                self._probes += 1
+
+    def cancel(self):
+        """Give back a half-open probe slot when the call was never made."""
+        with self._lock:
+            if self.state == HALF_OPEN and self._probes:
+                self._probes -= 1
+
+    def record_success(self, latency):
+        with self._lock:
+            self._latencies.append(latency)
+            self.successes += 1
+            self._failures = 0
+            self.state = CLOSED
+
+    def record_failure(self):
+        with self._lock:
+            self.failures += 1
+            self._failures += 1
+            if self.state == HALF_OPEN or self._failures >= self.failure_threshold:
+                if self.state != OPEN:
+                    self.opened += 1
+                self.state = OPEN
+                self._opened_at = time.monotonic()
+
+    def observe(self, seconds, outcome):
+        if self.observer is not None:
+            self.observer(self.name, seconds, outcome)
+
+    def _record(self, result, started, is_failure):
+        elapsed = time.monotonic() - started
+        if is_failure is not None and is_failure(result):
+            self.record_failure()
+        else:
+            self.record_success(elapsed)
+        self.observe(elapsed, getattr(result, "status_code", "ok"))
+
+    def attempt(self, fn, is_failure=None):
+        """Run `fn(timeout)` after before_call() succeeded and record how it went."""
+        started = time.monotonic()
+        try:
+            result = fn(self.timeout())
+        except Exception as e:
+            self.record_failure()
+            self.observe(time.monotonic() - started, getattr(e, "status_code", None) or type(e).__name__)
+            raise
+        self._record(result, started, is_failure)
+        return result
+
+    async def attempt_async(self, coro_fn, is_failure=None):
+        started = time.monotonic()
+        try:
+            result = await coro_fn(self.timeout())
+        except asyncio.CancelledError:
+            self.cancel()
+            raise
+        except Exception as e:
+            self.record_failure()
+            self.observe(time.monotonic() - started, getattr(e, "status_code", None) or type(e).__name__)
+            raise
+        self._record(result, started, is_failure)
+        return result
+
+    def p99(self):
+        with self._lock:
+            if len(self._latencies) < self.min_samples:
+                return None
+            ordered = sorted(self._latencies)
+        return ordered[min(len(ordered) - 1, int(len(ordered) * 0.99))]
+
+    def timeout(self):
+        p99 = self.p99()
+        if p99 is None:
+            return self.base_timeout
+        return min(self.base_timeout, max(self.min_timeout, p99 * self.multiplier))
+
+    def stats(self):
+        p99 = self.p99()
+        return {
+            "state": self.state,
+            "timeout": round(self.timeout(), 3),
+            "p99_latency": round(p99, 3) if p99 is not None else None,
+            "successes": self.successes,
+            "failures": self.failures,
+            "rejected": self.rejected,
+            "opened": self.opened,
+        }
+
+
+class CircuitBreakers:
+    """One breaker per upstream, created on first use."""
+
+    def __init__(self, base_timeouts=None, observer=None):
+        self.base_timeouts = dict(DEFAULT_BASE_TIMEOUTS)
+        self.base_timeouts.update(base_timeouts or {})
+        self.observer = observer
+        self._breakers = {}
+        self._lock = threading.Lock()
+
+    def get(self, name, base_timeout=None):
+        breaker = self._breakers.get(name)
+        if breaker is None:
+            with self._lock:
+                breaker = self._breakers.get(name)
+                if breaker is None:
+                    timeout = base_timeout or self.base_timeouts.get(name, 10.0)
+                    breaker = self._breakers[name] = CircuitBreaker(name, base_timeout=timeout, observer=self.observer)
+        return breaker
+
+    def stats(self):
+        return {name: breaker.stats() for name, breaker in sorted(self._breakers.items())}
@@ -0,0 +1,53 @@
+import gzip
+import os
+
+try:
+    import brotli
+except ImportError:  # optional: gzip only
+    brotli = None
+
+ENABLED = os.getenv("COMPRESS_RESPONSES", "1") == "1"
+COMPRESS_MIN_SIZE = int(os.getenv("COMPRESS_MIN_SIZE", "1024"))
+COMPRESS_LEVEL = int(os.getenv("COMPRESS_LEVEL", "6"))
+# Brotli quality runs 0-11; 5 is about as fast as gzip -6 and still noticeably smaller
+BROTLI_QUALITY = int(os.getenv("BROTLI_QUALITY", "5"))
+COMPRESSIBLE_TYPES = ("application/json", "text/plain", "text/csv", "text/html")
+
+
+def choose_encoding(accept_encodings):
+    """Pick "br" or "gzip" from a werkzeug Accept-Encoding header, honouring q-values."""
+    gzip_quality = accept_encodings["gzip"]
+    if brotli is not None and accept_encodings["br"] and accept_encodings["br"] >= gzip_quality:
+        return "br"
+    return "gzip" if gzip_quality else None
+
+
+def compress(body, encoding):
+    if encoding == "br":
+        return brotli.compress(body, quality=BROTLI_QUALITY)
+    return gzip.compress(body, compresslevel=COMPRESS_LEVEL)
+
+
+def init_app(app):
+    """Compress buffered JSON/text responses with brotli or gzip, as the client accepts."""
+    if not ENABLED:
+        return
+    from flask import request
+
+    @app.after_request
+    def _compress(response):
+        # Streams (SSE, exports, resume downloads) are left alone so they stay incremental
+        if response.direct_passthrough or response.is_streamed or response.status_code < 200 or response.status_code == 204:
+            return response
+        if response.mimetype not in COMPRESSIBLE_TYPES or "Content-Encoding" in response.headers:
+            return response
+        response.vary.add("Accept-Encoding")
+        encoding = choose_encoding(request.accept_encodings)
+        if encoding is None:
+            return response
+        body = response.get_data()
+        if len(body) < COMPRESS_MIN_SIZE:
+            return response
+        response.set_data(compress(body, encoding))
+        response.headers["Content-Encoding"] = encoding
+        return response
@@ -0,0 +1,89 @@
+import os
+import threading
+
+from pymongo import MongoClient
+
+from db_indexes import ensure_indexes, verify_query_plans
+from metrics import MongoCommandTimer
+from resume_storage import create_resume_store
+
+DATABASE_NAME = "online_job_portal"
+
+
+class Database:
+    """Lazily connects to MongoDB on first use instead of at import time.
+
+    Importing the app (e.g. on a serverless cold start) costs no network round
+    trip; the client, collections, indexes and resume store are set up once,
+    thread-safely, by whichever request needs them first.
+    """
+
+    def __init__(self, uri=None, name=DATABASE_NAME):
+        self._uri = uri
+        self.name = name
+        self._lock = threading.Lock()
+        self._ready = False
+        self._client = None
+        self._db = None
+        self._resume_store = None
+
+    def connect(self):
+        if self._ready:
+            return
+        with self._lock:
+            if self._ready:
+                return
+            uri = self._uri or os.getenv("MONGODB_URI")
+            print("DEBUG MONGODB_URI:", "Loaded" if uri else "Not found")
+            if not uri:
+                raise ValueError("MONGODB_URI environment variable not set. Please check your .env file.")
+
+            self._client = MongoClient(
+                uri,
+                serverSelectionTimeoutMS=int(os.getenv("MONGO_SERVER_SELECTION_TIMEOUT_MS", "5000")),
+                event_listeners=[MongoCommandTimer()],
+            )
+            self._db = self._client[self.name]
+            self._resume_store = create_resume_store(self._db)  # Resume files (GridFS by default)
+            print(f"Using database: {self.name}")
+            print(f"Collections: job_applications, job_listings, users")
+
+            if os.getenv("MONGO_ENSURE_INDEXES", "1") == "1":
+                ensure_indexes(self._db)
+            if os.getenv("VERIFY_QUERY_PLANS", "0") == "1":
+                verify_query_plans(self._db)
+            self._ready = True
+
+    @property
+    def connected(self):
+        return self._ready
+
+    @property
+    def client(self):
+        self.connect()
+        return self._client
+
+    @property
+    def db(self):
+        self.connect()
+        return self._db
+
+    @property
+    def job_applications(self):
+        return self.db["job_applications"]  # Collection for job applications
+
+    @property
+    def job_listings(self):
+        return self.db["job_listings"]  # Collection for job listings
+
+    @property
+    def users(self):
+        return self.db["users"]  # Collection for user authentication
+
+    @property
+    def resume_store(self):
+        self.connect()
+        return self._resume_store
+
+    def ping(self):
+        self.client.admin.command('ping')
@@ -0,0 +1,86 @@
+from pymongo import ASCENDING, DESCENDING
+from pymongo.errors import OperationFailure
+
+# collection -> list of (keys, options)
+INDEXES = {
+    "users": [
+        ([("email", ASCENDING)], {"name": "email_unique", "unique": True}),
+    ],
+    "job_applications": [
+        ([("user_id", ASCENDING), ("job_id", ASCENDING)], {"name": "user_job_unique", "unique": True}),
+        ([("user_id", ASCENDING), ("appliedDate", DESCENDING)], {"name": "user_applied_date"}),
+        # Keyset pagination for /admin/applications, optionally filtered by status
+        ([("appliedDate", DESCENDING), ("_id", DESCENDING)], {"name": "applied_date_id"}),
+        ([("status", ASCENDING), ("appliedDate", DESCENDING), ("_id", DESCENDING)], {"name": "status_applied_date_id"}),
+    ],
+    "job_listings": [
+        ([("source", ASCENDING), ("id", ASCENDING)], {"name": "source_id_unique", "unique": True}),
+        ([("updated_at", DESCENDING)], {"name": "updated_at"}),
+    ],
+}
+
+# Queries the request handlers run on every login/register/apply/list.
+# (collection, filter, sort) - values are placeholders, only the shape matters to the planner.
+HOT_QUERIES = [
+    ("users", {"email": "plan-check@example.com"}, None),
+    ("job_applications", {"user_id": "plan-check", "job_id": "plan-check"}, None),
+    ("job_applications", {"user_id": "plan-check"}, [("appliedDate", DESCENDING), ("_id", DESCENDING)]),
+    ("job_applications", {}, [("appliedDate", DESCENDING), ("_id", DESCENDING)]),
+    ("job_applications", {"status": "applied"}, [("appliedDate", DESCENDING), ("_id", DESCENDING)]),
+]
+
+
+class QueryPlanError(Exception):
+    pass
+
+
+def ensure_indexes(db):
+    """Create the indexes the app relies on. Safe to run on every startup."""
+    for collection_name, indexes in INDEXES.items():
+        collection = db[collection_name]
+        for keys, options in indexes:
+            try:
+                collection.create_index(keys, **options)
+            except OperationFailure as e:
+                # Usually existing duplicates blocking a unique index - the app must not run without it
+                raise RuntimeError(
+                    f"Could not create index {options['name']} on {collection_name}: {e}. "
+                    f"Remove duplicate documents and restart."
+                ) from e
+    print(f"MongoDB indexes ensured on: {', '.join(INDEXES)}")
+
+
+def _plan_stages(plan):
+    """Yield every stage name in an explain() plan tree (classic and SBE formats)."""
+    if isinstance(plan, dict):
+        if "stage" in plan:
+            yield plan["stage"]
+        for value in plan.values():
+            yield from _plan_stages(value)
+    elif isinstance(plan, list):
+        for item in plan:
+            yield from _plan_stages(item)
+
+
+def explain_hot_queries(db):
+    """Return [(collection, filter, stages)] for each hot query."""
+    results = []
+    for collection_name, query, sort in HOT_QUERIES:
+        cursor = db[collection_name].find(query)
+        if sort:
+            cursor = cursor.sort(sort)
+        winning_plan = cursor.explain()["queryPlanner"]["winningPlan"]
+        results.append((collection_name, query, list(_plan_stages(winning_plan))))
+    return results
+
+
+def verify_query_plans(db):
+    """Raise QueryPlanError if any hot query would fall back to a collection scan."""
+    regressions = [
+        f"{collection_name}.find({query})"
+        for collection_name, query, stages in explain_hot_queries(db)
+        if "COLLSCAN" in stages
+    ]
+    if regressions:
+        raise QueryPlanError("Hot queries regressed to COLLSCAN: " + "; ".join(regressions))
+    print(f"Query plans verified: {len(HOT_QUERIES)} hot queries use indexes")
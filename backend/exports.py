@@ -0,0 +1,88 @@
+import csv
+import io
+import json
+import os
+from datetime import datetime
+
+from bson import ObjectId
+
+EXPORT_BATCH_SIZE = int(os.getenv("EXPORT_BATCH_SIZE", "500"))
+# Flush to the client once this many bytes are buffered
+EXPORT_FLUSH_BYTES = 64 * 1024
+
+EXPORT_FORMATS = ("ndjson", "csv")
+
+CSV_COLUMNS = [
+    "id", "user_id", "applicant", "email", "job_id", "job_title", "company",
+    "status", "appliedDate", "resume", "coverLetter",
+]
+
+
+def _json_default(value):
+    if isinstance(value, datetime):
+        return value.isoformat()
+    if isinstance(value, ObjectId):
+        return str(value)
+    raise TypeError(f"Cannot serialize {type(value).__name__}")
+
+
+def _csv_value(value):
+    if value is None:
+        return ""
+    if isinstance(value, datetime):
+        return value.isoformat()
+    if isinstance(value, (dict, list)):
+        return json.dumps(value, default=_json_default)
+    return str(value)
+
+
+def _rows(cursor):
+    try:
+        for doc in cursor:
+            doc["id"] = str(doc.pop("_id"))
+            yield doc
+    finally:
+        # Stops the server-side cursor if the client disconnects mid-export
+        cursor.close()
+
+
+def _buffered(lines):
+    """Group small lines into larger chunks, but send the first one right away."""
+    buffer = []
+    size = 0
+    first = True
+    for line in lines:
+        buffer.append(line)
+        size += len(line)
+        if first or size >= EXPORT_FLUSH_BYTES:
+            first = False
+            yield "".join(buffer)
+            buffer = []
+            size = 0
+    if buffer:
+        yield "".join(buffer)
+
+
+def export_ndjson(cursor):
+    """Yield chunks of newline-delimited JSON, one application per line."""
+    cursor.batch_size(EXPORT_BATCH_SIZE)
+    return _buffered(json.dumps(doc, default=_json_default) + "\n" for doc in _rows(cursor))
+
+
+def export_csv(cursor, columns=None):
+    """Yield chunks of CSV, header first."""
+    cursor.batch_size(EXPORT_BATCH_SIZE)
+    columns = columns or CSV_COLUMNS
+
+    def lines():
+        out = io.StringIO()
+        writer = csv.writer(out)
+        writer.writerow(columns)
+        yield out.getvalue()
+        for doc in _rows(cursor):
+            out.seek(0)
+            out.truncate()
+            writer.writerow([_csv_value(doc.get(column)) for column in columns])
+            yield out.getvalue()
+
+    return _buffered(lines())
@@ -0,0 +1,124 @@
+import json
+import os
+
+GEMINI_BASE_URL = os.getenv(
+    "GEMINI_BASE_URL", "https://generativelanguage.googleapis.com/v1beta/models/gemini-1.5-flash"
+)
+
+# Context for the job portal chatbot
+SYSTEM_CONTEXT = """You are SkillMate Assistant, an expert career and job search advisor for a professional job portal.
+
+        Your expertise includes:
+        - Current job market trends in IT, healthcare, finance, marketing, and other sectors
+        - Top companies actively hiring (Google, Microsoft, Amazon, startups, etc.)
+        - In-demand skills for different roles (Python, React, AI/ML, cloud computing, etc.)
+        - Salary ranges and career progression paths
+        - Interview preparation and common questions
+        - Resume optimization and LinkedIn tips
+        - Networking strategies and job search techniques
+
+        IMPORTANT GUIDELINES:
+        - Give specific, actionable advice with real examples
+        - Mention actual companies and technologies when relevant
+        - Include salary ranges when discussing roles
+        - Suggest concrete next steps the user can take
+        - Keep responses focused, practical, and encouraging
+        - If asked about job openings, direct them to use the portal's search feature
+
+        Always provide valuable, career-focused insights that help users advance their professional goals."""
+
+# Returned (with status "error") when Gemini answers 503
+BUSY_FALLBACK_MESSAGE = "The AI service is currently busy. Here are some general career tips: Focus on building in-demand skills like Python, JavaScript, cloud computing, and data analysis. Companies like Google, Microsoft, Amazon, and startups are actively hiring. Consider improving your LinkedIn profile and GitHub portfolio."
+
+HEADERS = {
+    "Content-Type": "application/json"
+}
+
+# Streaming calls have their own breaker: it only sees time-to-headers, which must not
+# shrink the adaptive timeout of whole generateContent calls
+STREAM_BREAKER = "gemini_stream"
+# Fixed (not adaptive) wait for the response headers and between streamed chunks
+STREAM_READ_TIMEOUT = float(os.getenv("GEMINI_STREAM_READ_TIMEOUT", "30"))
+
+
+def generate_url(api_key):
+    return f"{GEMINI_BASE_URL}:generateContent?key={api_key}"
+
+
+def stream_url(api_key):
+    return f"{GEMINI_BASE_URL}:streamGenerateContent?alt=sse&key={api_key}"
+
+
+def build_payload(user_message):
+    # Create the prompt with context
+    full_prompt = f"{SYSTEM_CONTEXT}\n\nUser Question: {user_message}\n\nResponse:"
+
+    return {
+        "contents": [{
+            "parts": [{
+                "text": full_prompt
+            }]
+        }],
+        "generationConfig": {
+            "temperature": 0.7,
+            "topK": 1,
+            "topP": 1,
+            "maxOutputTokens": 500,
+            "stopSequences": []
+        },
+        "safetySettings": [
+            {
+                "category": "HARM_CATEGORY_HARASSMENT",
+                "threshold": "BLOCK_MEDIUM_AND_ABOVE"
+            },
+            {
+                "category": "HARM_CATEGORY_HATE_SPEECH",
+                "threshold": "BLOCK_MEDIUM_AND_ABOVE"
+            },
+            {
+                "category": "HARM_CATEGORY_SEXUALLY_EXPLICIT",
+                "threshold": "BLOCK_MEDIUM_AND_ABOVE"
+            },
+            {
+                "category": "HARM_CATEGORY_DANGEROUS_CONTENT",
+                "threshold": "BLOCK_MEDIUM_AND_ABOVE"
+            }
+        ]
+    }
+
+
+def extract_text(result):
+    """Return the generated text of a (partial) Gemini response, or None."""
+    candidates = result.get("candidates") or []
+    if not candidates:
+        return None
+    parts = (candidates[0].get("content") or {}).get("parts") or []
+    return "".join(part.get("text", "") for part in parts) if parts else None
+
+
+def data_line_text(line):
+    """Return the text carried by one `data:` line of a Gemini SSE stream, or None."""
+    line = line.strip()
+    if not line.startswith("data:"):
+        return None
+    return extract_text(json.loads(line[len("data:"):]))
+
+
+def iter_stream_text(response):
+    """Yield text deltas from a streamGenerateContent?alt=sse response as they arrive."""
+    buffer = b""
+    for chunk in response.iter_content(chunk_size=None):
+        buffer += chunk
+        while b"\n" in buffer:
+            line, buffer = buffer.split(b"\n", 1)
+            text = data_line_text(line.decode("utf-8"))
+            if text:
+                yield text
+    text = data_line_text(buffer.decode("utf-8"))
+    if text:
+        yield text
+
+
+def sse_event(event, data):
+    """Format one Server-Sent Event."""
+    return f"event: {event}\ndata: {json.dumps(data)}\n\n"
@@ -0,0 +1,91 @@
+import os
+import threading
+import time
+from datetime import datetime
+
+COUNTED_COLLECTIONS = ("users", "job_applications", "job_listings")
+
+
+class HealthMonitor:
+    """Keeps a health snapshot that a background thread refreshes every `interval` seconds.
+
+    /health reads the snapshot instead of touching MongoDB or the upstream APIs
+    itself. Counts come from `estimated_document_count` (collection metadata,
+    no scan), and upstream reachability is derived from the circuit breakers,
+    so no probe ever spends provider quota.
+    """
+
+    def __init__(self, db, breakers, interval=None):
+        self._db = db
+        self.breakers = breakers
+        self.interval = interval or float(os.getenv("HEALTH_REFRESH_INTERVAL", "15"))
+        self._snapshot = None
+        self._lock = threading.Lock()
+        self._thread = None
+        self._stop = threading.Event()
+        self.refreshes = 0
+
+    def refresh(self):
+        started = time.monotonic()
+        snapshot = {"refreshed_at": datetime.utcnow().isoformat()}
+        try:
+            self._db.ping()
+            snapshot["database"] = "connected"
+            snapshot["database_ping_ms"] = round((time.monotonic() - started) * 1000, 2)
+            snapshot["counts"] = {
+                name: self._db.db[name].estimated_document_count() for name in COUNTED_COLLECTIONS
+            }
+        except Exception as e:
+            snapshot["database"] = "unavailable"
+            snapshot["error"] = str(e)
+        snapshot["upstreams"] = self._upstreams()
+        snapshot["_taken_at"] = time.monotonic()
+        with self._lock:
+            self._snapshot = snapshot
+            self.refreshes += 1
+        return snapshot
+
+    def _upstreams(self):
+        upstreams = {}
+        for name, stats in self.breakers.stats().items():
+            if stats["state"] == "open":
+                reachable = False
+            elif stats["successes"] or stats["failures"]:
+                reachable = stats["state"] == "closed"
+            else:
+                reachable = None  # not called yet
+            upstreams[name] = {
+                "reachable": reachable,
+                "circuit": stats["state"],
+                "p99_latency": stats["p99_latency"],
+            }
+        return upstreams
+
+    def start(self):
+        if self._thread is not None:
+            return
+        with self._lock:
+            if self._thread is None:
+                self._thread = threading.Thread(target=self._run, name="health-monitor", daemon=True)
+                self._thread.start()
+
+    def stop(self):
+        self._stop.set()
+
+    def _run(self):
+        while not self._stop.wait(self.interval):
+            try:
+                self.refresh()
+            except Exception as e:
+                print(f"Health snapshot refresh failed: {e}")
+
+    def snapshot(self):
+        """Latest snapshot (taken synchronously the first time) with its age in seconds."""
+        self.start()
+        with self._lock:
+            snapshot = self._snapshot
+        if snapshot is None:
+            snapshot = self.refresh()
+        snapshot = dict(snapshot)
+        snapshot["age_seconds"] = round(time.monotonic() - snapshot.pop("_taken_at"), 2)
+        return snapshot
@@ -0,0 +1,164 @@
+import os
+import threading
+import time
+from collections import defaultdict
+from urllib.parse import urlsplit
+
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3.exceptions import MaxRetryError
+from urllib3.util.retry import Retry
+
+# Monotonic deadline of the request being made on this thread (from its timeout)
+_deadline = threading.local()
+
+
+def _parse_pool_sizes(value):
+    """Parse "host=size,host=size" into a dict."""
+    sizes = {}
+    for item in (value or "").split(","):
+        if "=" in item:
+            host, size = item.split("=", 1)
+            sizes[host.strip()] = int(size)
+    return sizes
+
+
+class BoundedRetry(Retry):
+    """Retry that never sleeps longer than `max_sleep` (Retry-After included)
+    and gives up instead of retrying past the caller's timeout.
+
+    When retries stop early on a retryable status, the last response is
+    returned as usual (raise_on_status=False).
+    """
+
+    max_sleep = float(os.getenv("HTTP_RETRY_MAX_SLEEP", "2"))
+
+    def next_sleep(self, response=None):
+        retry_after = None
+        if self.respect_retry_after_header and response is not None:
+            retry_after = self.get_retry_after(response)
+        seconds = retry_after if retry_after is not None else self.get_backoff_time()
+        return min(max(seconds, 0.0), self.max_sleep)
+
+    def sleep(self, response=None):
+        seconds = self.next_sleep(response)
+        if seconds > 0:
+            time.sleep(seconds)
+
+    def increment(self, method=None, url=None, response=None, error=None, _pool=None, _stacktrace=None):
+        retry = super().increment(method, url, response=response, error=error, _pool=_pool, _stacktrace=_stacktrace)
+        deadline = getattr(_deadline, "value", None)
+        if deadline is not None and time.monotonic() + retry.next_sleep(response) >= deadline:
+            raise MaxRetryError(_pool, url, reason=error or "retry would exceed the request timeout")
+        return retry
+
+
+def _timeout_seconds(timeout):
+    if isinstance(timeout, (tuple, list)):
+        return sum(part for part in timeout if part is not None) or None
+    return timeout
+
+
+class OutboundClient:
+    """Shared keep-alive HTTP client for upstream APIs.
+
+    Each upstream host gets its own `requests.Session` with a dedicated
+    connection pool, so TCP/TLS connections are reused across requests
+    instead of being re-established on every call.
+    """
+
+    def __init__(self, pool_maxsize=None, pool_sizes=None, retries=None, backoff_factor=None):
+        self.pool_maxsize = pool_maxsize or int(os.getenv("HTTP_POOL_MAXSIZE", "10"))
+        self.pool_sizes = pool_sizes if pool_sizes is not None else _parse_pool_sizes(os.getenv("HTTP_POOL_SIZES"))
+        self.retries = retries if retries is not None else int(os.getenv("HTTP_RETRY_TOTAL", "2"))
+        self.backoff_factor = backoff_factor if backoff_factor is not None else float(os.getenv("HTTP_RETRY_BACKOFF", "0.3"))
+        self._sessions = {}
+        self._lock = threading.Lock()
+        self._stats_lock = threading.Lock()
+        self._requests = defaultdict(int)
+        self._errors = defaultdict(int)
+        self._statuses = defaultdict(lambda: defaultdict(int))
+
+    def _retry_policy(self):
+        return BoundedRetry(
+            total=self.retries,
+            backoff_factor=self.backoff_factor,
+            status_forcelist=(429, 503),
+            # Upstream POSTs (Gemini generateContent) are read-only, so retrying them is safe
+            allowed_methods=frozenset(["GET", "POST"]),
+            respect_retry_after_header=True,
+            raise_on_status=False,
+        )
+
+    def session_for(self, host):
+        session = self._sessions.get(host)
+        if session is not None:
+            return session
+        with self._lock:
+            session = self._sessions.get(host)
+            if session is None:
+                pool_size = self.pool_sizes.get(host, self.pool_maxsize)
+                adapter = HTTPAdapter(pool_connections=1, pool_maxsize=pool_size, max_retries=self._retry_policy())
+                session = requests.Session()
+                session.mount("https://", adapter)
+                session.mount("http://", adapter)
+                self._sessions[host] = session
+        return session
+
+    def request(self, method, url, **kwargs):
+        host = urlsplit(url).netloc
+        with self._stats_lock:
+            self._requests[host] += 1
+        timeout = _timeout_seconds(kwargs.get("timeout"))
+        previous = getattr(_deadline, "value", None)
+        _deadline.value = time.monotonic() + timeout if timeout else None
+        try:
+            response = self.session_for(host).request(method, url, **kwargs)
+        except requests.exceptions.RequestException:
+            with self._stats_lock:
+                self._errors[host] += 1
+            raise
+        finally:
+            _deadline.value = previous
+        with self._stats_lock:
+            self._statuses[host][response.status_code] += 1
+        return response
+
+    def get(self, url, **kwargs):
+        return self.request("GET", url, **kwargs)
+
+    def post(self, url, **kwargs):
+        return self.request("POST", url, **kwargs)
+
+    def close(self):
+        with self._lock:
+            for session in self._sessions.values():
+                session.close()
+            self._sessions.clear()
+
+    def stats(self):
+        hosts = {}
+        for host, session in list(self._sessions.items()):
+            adapter = session.get_adapter(f"https://{host}")
+            connections = 0
+            pooled_requests = 0
+            pools = adapter.poolmanager.pools
+            for key in list(pools.keys()):
+                pool = pools.get(key)
+                if pool is None:
+                    continue
+                connections += pool.num_connections
+                pooled_requests += pool.num_requests
+            hosts[host] = {
+                "requests": self._requests[host],
+                "errors": self._errors[host],
+                "statuses": dict(self._statuses[host]),
+                "pool_maxsize": self.pool_sizes.get(host, self.pool_maxsize),
+                "connections_opened": connections,
+                "connections_reused": max(0, pooled_requests - connections),
+            }
+        return hosts
+
+
+# Shared instance used by every upstream call in the app
+shared_client = OutboundClient()
@@ -0,0 +1,94 @@
+import os
+import threading
+
+from ttl_cache import TTLCache
+
+# Copied into the access token so /apply can fill in the applicant without a users lookup
+CLAIM_FIELDS = ("name", "email")
+PROFILE_FIELDS = ("name", "email", "created_at", "last_login", "profile_version", "role")
+# Claim holding the user's profile_version when the token was issued
+VERSION_CLAIM = "pv"
+
+
+def profile_version(user):
+    """Bumped (`$inc`) on every profile change; documents from before versioning count as 0."""
+    return user.get("profile_version") or 0
+
+
+def identity_claims(user):
+    """Additional JWT claims for `create_access_token(..., additional_claims=...)`."""
+    claims = {field: user[field] for field in CLAIM_FIELDS}
+    claims[VERSION_CLAIM] = profile_version(user)
+    return claims
+
+
+class IdentityCache:
+    """Who a user id is, without a round trip to `users` on every protected request.
+
+    Profiles live in a bounded TTL cache keyed by user id, loaded with
+    `loader(user_id)` on a miss. Name and email come from the signed token
+    claims only while the token's profile version equals the user's current
+    `profile_version`, so a token minted before a profile change falls back to
+    the stored profile. The version lives in the users document, which makes
+    the check survive restarts and hold across workers; a worker that still has
+    the old profile cached may serve it until the entry expires
+    (IDENTITY_CACHE_TTL). `invalidate(user_id)` drops this process's copy
+    right away.
+    """
+
+    def __init__(self, loader, max_entries=None, ttl=None):
+        self.loader = loader
+        self._profiles = TTLCache(
+            max_entries=max_entries or int(os.getenv("IDENTITY_CACHE_MAX_ENTRIES", "10000")),
+            max_bytes=int(os.getenv("IDENTITY_CACHE_MAX_BYTES", str(8 * 1024 * 1024))),
+            default_ttl=ttl if ttl is not None else int(os.getenv("IDENTITY_CACHE_TTL", "300")),
+        )
+        self._lock = threading.Lock()
+        self.claim_hits = 0
+        self.loads = 0
+
+    def get(self, user_id, claims=None):
+        """{"id", "name", "email", ...} for `user_id`, or None if the user does not exist."""
+        profile = self.profile(user_id)
+        if profile is None:
+            return None
+        if (claims and all(claims.get(field) for field in CLAIM_FIELDS)
+                and claims.get(VERSION_CLAIM) == profile_version(profile)):
+            with self._lock:
+                self.claim_hits += 1
+            identity = {field: claims[field] for field in CLAIM_FIELDS}
+            identity["id"] = user_id
+            return identity
+        return profile
+
+    def profile(self, user_id):
+        """Cached profile (PROFILE_FIELDS plus "id"), loading it on a miss."""
+        profile = self._profiles.get(user_id)
+        if profile is None:
+            with self._lock:
+                self.loads += 1
+            user = self.loader(user_id)
+            if not user:
+                return None
+            profile = self.remember(user)
+        return dict(profile)
+
+    def remember(self, user):
+        """Cache a users document the caller already has (register, login)."""
+        profile = {field: user.get(field) for field in PROFILE_FIELDS}
+        profile["id"] = str(user["_id"])
+        self._profiles.set(profile["id"], profile)
+        return profile
+
+    def invalidate(self, user_id):
+        self._profiles.delete(user_id)
+
+    def clear(self):
+        """Forget every cached profile (e.g. after users were wiped)."""
+        self._profiles.clear()
+
+    def stats(self):
+        stats = self._profiles.stats()
+        with self._lock:
+            stats.update(claim_hits=self.claim_hits, loads=self.loads)
+        return stats
@@ -0,0 +1,252 @@
+import math
+import os
+import queue
+import re
+import threading
+import time
+from collections import OrderedDict, defaultdict
+from datetime import datetime
+
+from pymongo import UpdateOne
+
+from ttl_cache import estimate_size
+
+LOCAL_MODE = "local"
+
+# Field weights are applied by repeating a field's tokens when indexing
+FIELD_WEIGHTS = {"title": 3, "company": 2, "location": 1, "description": 1}
+
+STOPWORDS = {
+    "a", "an", "the", "and", "or", "to", "of", "in", "on", "at", "for", "with", "by",
+    "from", "as", "is", "are", "be", "we", "you", "our", "your", "will", "this", "that",
+}
+
+_TAG_RE = re.compile(r"<[^>]+>")
+_TOKEN_RE = re.compile(r"[a-z0-9+#]+")
+
+# Rough per-term cost of a document's postings and term counts, on top of the job itself
+POSTING_BYTES = 48
+
+
+def tokenize(text):
+    """Lowercase word tokens with HTML stripped (Remotive descriptions are HTML)."""
+    text = _TAG_RE.sub(" ", text or "").lower()
+    return [token for token in _TOKEN_RE.findall(text) if token not in STOPWORDS]
+
+
+def doc_key(job):
+    return f"{job['source']}:{job['id']}"
+
+
+class JobIndex:
+    """In-process inverted index over normalized jobs with BM25 ranking.
+
+    Documents are added incrementally; re-adding a job replaces its postings.
+    Once `max_docs` or `max_bytes` (full descriptions included) is exceeded the
+    oldest jobs are dropped.
+    """
+
+    def __init__(self, max_docs=None, max_bytes=None, k1=1.5, b=0.75):
+        self.max_docs = max_docs or int(os.getenv("JOB_INDEX_MAX_DOCS", "50000"))
+        self.max_bytes = max_bytes or int(os.getenv("JOB_INDEX_MAX_BYTES", str(128 * 1024 * 1024)))
+        self.k1 = k1
+        self.b = b
+        self._docs = OrderedDict()  # key -> job
+        self._doc_terms = {}  # key -> {term: tf}
+        self._doc_len = {}
+        self._doc_size = {}
+        self._bytes = 0
+        self._location_terms = {}  # key -> set of location tokens
+        self._postings = defaultdict(dict)  # term -> {key: tf}
+        self._total_len = 0
+        self._lock = threading.RLock()
+
+    def __len__(self):
+        return len(self._docs)
+
+    def add(self, job):
+        key = doc_key(job)
+        tokens = []
+        for field, weight in FIELD_WEIGHTS.items():
+            tokens.extend(tokenize(job.get(field)) * weight)
+        terms = defaultdict(int)
+        for token in tokens:
+            terms[token] += 1
+        size = estimate_size(job) + POSTING_BYTES * len(terms)
+
+        with self._lock:
+            if key in self._docs:
+                self._remove(key)
+            self._docs[key] = job
+            self._doc_terms[key] = terms
+            self._doc_len[key] = len(tokens)
+            self._doc_size[key] = size
+            self._bytes += size
+            self._location_terms[key] = set(tokenize(job.get("location")))
+            self._total_len += len(tokens)
+            for term, tf in terms.items():
+                self._postings[term][key] = tf
+            while len(self._docs) > self.max_docs or (self._bytes > self.max_bytes and len(self._docs) > 1):
+                self._remove(next(iter(self._docs)))
+
+    def add_many(self, jobs):
+        for job in jobs:
+            self.add(job)
+
+    def _remove(self, key):
+        for term in self._doc_terms.pop(key):
+            postings = self._postings[term]
+            postings.pop(key, None)
+            if not postings:
+                del self._postings[term]
+        self._total_len -= self._doc_len.pop(key)
+        self._bytes -= self._doc_size.pop(key)
+        self._location_terms.pop(key)
+        del self._docs[key]
+
+    def get(self, source, job_id):
+        with self._lock:
+            return self._docs.get(f"{source}:{job_id}")
+
+    def search(self, query, location=None, limit=10, offset=0):
+        """Return (total_hits, jobs) ranked by BM25 score."""
+        query_terms = set(tokenize(query))
+        location_terms = set(tokenize(location))
+        with self._lock:
+            n_docs = len(self._docs)
+            if not n_docs or not query_terms:
+                return 0, []
+            avg_len = self._total_len / n_docs
+            scores = defaultdict(float)
+            for term in query_terms:
+                postings = self._postings.get(term)
+                if not postings:
+                    continue
+                idf = math.log(1 + (n_docs - len(postings) + 0.5) / (len(postings) + 0.5))
+                for key, tf in postings.items():
+                    norm = self.k1 * (1 - self.b + self.b * self._doc_len[key] / avg_len)
+                    scores[key] += idf * tf * (self.k1 + 1) / (tf + norm)
+            if location_terms:
+                scores = {
+                    key: score for key, score in scores.items()
+                    if location_terms <= self._location_terms[key] or self._docs[key].get("remote")
+                }
+            ranked = sorted(scores.items(), key=lambda item: item[1], reverse=True)
+            return len(ranked), [self._docs[key] for key, _ in ranked[offset:offset + limit]]
+
+    def stats(self):
+        with self._lock:
+            return {
+                "documents": len(self._docs),
+                "terms": len(self._postings),
+                "bytes": self._bytes,
+                "max_docs": self.max_docs,
+                "max_bytes": self.max_bytes,
+            }
+
+
+class JobIngestor:
+    """Feeds provider results into the local index and the job_listings collection.
+
+    Indexing is done inline (it is in-memory and cheap); MongoDB upserts are
+    queued and written in batches by a background thread so /search never
+    waits on them.
+    """
+
+    def __init__(self, index, collection_getter, queue_size=1000, batch_size=200, bootstrap_retry=30):
+        self.index = index
+        self._collection_getter = collection_getter
+        self._queue = queue.Queue(maxsize=queue_size)
+        self.batch_size = batch_size
+        self._worker = None
+        self._worker_lock = threading.Lock()
+        self._bootstrapped = False
+        self._bootstrap_lock = threading.Lock()
+        self._bootstrap_failed_at = None
+        self.bootstrap_retry = bootstrap_retry
+        self.ingested = 0
+        self.persisted = 0
+        self.dropped = 0
+
+    def ingest(self, provider, payload):
+        jobs = [provider.normalize(job) for job in provider.jobs(payload)]
+        jobs = [job for job in jobs if job["id"]]
+        if not jobs:
+            return
+        self.index.add_many(jobs)
+        self.ingested += len(jobs)
+        self._ensure_worker()
+        try:
+            self._queue.put_nowait(jobs)
+        except queue.Full:
+            # The index already has them; only the durable copy is skipped
+            self.dropped += len(jobs)
+
+    def _ensure_worker(self):
+        if self._worker is not None:
+            return
+        with self._worker_lock:
+            if self._worker is None:
+                self._worker = threading.Thread(target=self._run, name="job-ingestor", daemon=True)
+                self._worker.start()
+
+    def _run(self):
+        while True:
+            jobs = self._queue.get()
+            while len(jobs) < self.batch_size:
+                try:
+                    jobs.extend(self._queue.get_nowait())
+                except queue.Empty:
+                    break
+            try:
+                self._persist(jobs)
+            except Exception as e:
+                print(f"Could not persist {len(jobs)} job listings: {e}")
+
+    def _persist(self, jobs):
+        now = datetime.utcnow()
+        operations = [
+            UpdateOne(
+                {"source": job["source"], "id": job["id"]},
+                {"$set": dict(job, updated_at=now), "$setOnInsert": {"created_at": now}},
+                upsert=True,
+            )
+            for job in jobs
+        ]
+        self._collection_getter().bulk_write(operations, ordered=False)
+        self.persisted += len(jobs)
+
+    def bootstrap(self, limit=None):
+        """Load the most recently seen listings into the index (once per process).
+
+        Concurrent first searches wait for the load instead of seeing a partial
+        index; a failed load is retried, at most every `bootstrap_retry` seconds.
+        """
+        if self._bootstrapped:
+            return
+        with self._bootstrap_lock:
+            if self._bootstrapped:
+                return
+            if self._bootstrap_failed_at is not None and time.monotonic() - self._bootstrap_failed_at < self.bootstrap_retry:
+                return
+            limit = limit or int(os.getenv("JOB_INDEX_BOOTSTRAP_LIMIT", "10000"))
+            try:
+                cursor = self._collection_getter().find({}, {"_id": 0, "created_at": 0, "updated_at": 0})
+                newest_first = list(cursor.sort("updated_at", -1).limit(limit))
+            except Exception:
+                self._bootstrap_failed_at = time.monotonic()
+                raise
+            # Add oldest first so eviction order matches recency
+            self.index.add_many(reversed(newest_first))
+            self._bootstrapped = True
+            print(f"Job index bootstrapped with {len(self.index)} listings")
+
+    def stats(self):
+        stats = self.index.stats()
+        stats.update({
+            "ingested": self.ingested,
+            "persisted": self.persisted,
+            "dropped": self.dropped,
+            "queued_batches": self._queue.qsize(),
+        })
+        return stats
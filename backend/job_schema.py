@@ -0,0 +1,64 @@
+import html
+import os
+import re
+
+# Fields of the compact job record returned by /search; `description` and `highlights` only on
+# request (or from GET /jobs/<source>/<id> when a card is expanded)
+COMPACT_FIELDS = (
+    "id", "source", "title", "company", "location", "url", "snippet", "employment_type", "remote",
+    "publication_date", "salary_min", "salary_max", "salary_currency", "salary_period", "salary_text", "category",
+    "logo",
+)
+OPTIONAL_FIELDS = ("description", "highlights")
+
+RESPONSE_FORMATS = ("compact", "raw")
+DEFAULT_RESPONSE_FORMAT = os.getenv("SEARCH_RESPONSE_FORMAT", "compact")
+SNIPPET_CHARS = int(os.getenv("SEARCH_SNIPPET_CHARS", "280"))
+
+_TAG_RE = re.compile(r"<[^>]+>")
+
+
+def make_snippet(text, limit=None):
+    """Plain-text preview of a (possibly HTML) description, cut at a word boundary."""
+    limit = limit or SNIPPET_CHARS
+    text = text or ""
+    # Descriptions run to many KB; only the head can end up in the snippet
+    if len(text) > limit * 4:
+        text = text[:limit * 4]
+        if text.rfind("<") > text.rfind(">"):
+            text = text[:text.rfind("<")]
+    if "<" in text:
+        text = _TAG_RE.sub(" ", text)
+    if "&" in text:
+        text = html.unescape(text)
+    text = " ".join(text[:limit * 2].split())
+    if len(text) <= limit:
+        return text
+    cut = text.rfind(" ", 0, limit)
+    return text[:cut if cut > limit // 2 else limit].rstrip(" ,.;:") + "…"
+
+
+def parse_job_fields(value):
+    """Turn ?fields=title,company into a tuple of record fields; None means the default set."""
+    if not value:
+        return None
+    fields = tuple(dict.fromkeys(field.strip() for field in value.split(",") if field.strip()))
+    unknown = set(fields) - set(COMPACT_FIELDS + OPTIONAL_FIELDS)
+    if unknown:
+        raise ValueError(f"Unknown fields: {', '.join(sorted(unknown))}")
+    return fields
+
+
+def compact_job(job, fields=None):
+    """Compact record for a normalized job; fields without a value are left out."""
+    record = {}
+    for field in fields or COMPACT_FIELDS:
+        value = make_snippet(job.get("description")) if field == "snippet" else job.get(field)
+        if value is not None and value != "" and value != {}:
+            record[field] = value
+    return record
+
+
+def shape_search_payload(payload, fields=None):
+    """Copy of a normalized /search payload with every job reduced to its compact record."""
+    return dict(payload, data=[compact_job(job, fields) for job in payload["data"]])
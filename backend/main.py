@@ -1,49 +1,52 @@
-from flask import Flask, request, jsonify
+from flask import Blueprint, Flask, Response, request, jsonify, stream_with_context
 from flask_cors import CORS
-from flask_jwt_extended import JWTManager, jwt_required, create_access_token, get_jwt_identity
-from pymongo import MongoClient
+from flask_jwt_extended import JWTManager, jwt_required, create_access_token, get_jwt, get_jwt_identity, verify_jwt_in_request
+from pymongo.errors import DuplicateKeyError
 from bson import ObjectId
 from datetime import datetime, timedelta
+from functools import wraps
 import os
+import atexit
 import base64
+import binascii
+import io
+import json
 import requests
-import bcrypt
 import re
 from dotenv import load_dotenv
+from werkzeug.utils import secure_filename
+from answer_cache import AnswerCache, normalize_question
+from bulk import BULK_MAX_BYTES, BulkRequestError, bulk_apply, bulk_update_status, summarize as summarize_bulk
+from circuit_breaker import CircuitBreakers, CircuitOpen, is_failure_status
+from cache_warmer import CacheWarmer
+import gemini
+import compression
+import metrics
+from database import Database
+from db_indexes import QueryPlanError, explain_hot_queries, verify_query_plans
+from exports import CSV_COLUMNS, EXPORT_FORMATS, export_csv, export_ndjson
+from health import HealthMonitor
+from http_client import shared_client as http_client
+from identity import IdentityCache, identity_claims
+from job_index import LOCAL_MODE, JobIndex, JobIngestor
+from job_schema import DEFAULT_RESPONSE_FORMAT, RESPONSE_FORMATS, parse_job_fields, shape_search_payload
+from password_hasher import HasherBusy, PasswordHasher
+from profiling import RequestProfiler
+from rate_limit import RateLimited, RateLimiter
+from pagination import KEYSET_SORT, build_filter, paginate, parse_fields
+from resume_storage import ResumeNotFound
+from search_cache import SearchCache, normalize_search_key
+from search_filters import ResultSetCache, SearchFilters
+from search_providers import JSearchProvider, RemotiveProvider, SearchEngine, SEARCH_MODES
+from single_flight import SingleFlight, SingleFlightTimeout
 
 # Load env variables
 load_dotenv()
 
-app = Flask(__name__)
-CORS(app)
-
-# JWT Configuration
-app.config['JWT_SECRET_KEY'] = os.getenv('JWT_SECRET_KEY', 'your-secret-key-change-this-in-production')
-app.config['JWT_ACCESS_TOKEN_EXPIRES'] = timedelta(days=7)
-jwt = JWTManager(app)
-
-# ✅ MongoDB connection
-MONGODB_URI = os.getenv("MONGODB_URI")
-print("DEBUG MONGODB_URI:", "Loaded" if MONGODB_URI else "Not found")
-print("Raw MONGODB_URI from env:", repr(MONGODB_URI))
-
-if not MONGODB_URI:
-    raise ValueError("MONGODB_URI environment variable not set. Please check your .env file.")
-
-try:
-    client = MongoClient(MONGODB_URI)
-    # Force a connection to verify it works
-    client.admin.command('ping')
-    print("MongoDB connection successful ✅")
-    db = client["online_job_portal"]  # Database name
-    job_applications = db["job_applications"]  # Collection for job applications
-    job_listings = db["job_listings"]  # Collection for job listings (for future use)
-    users = db["users"]  # Collection for user authentication
-    print(f"Using database: online_job_portal")
-    print(f"Collections: job_applications, job_listings, users")
-except Exception as e:
-    print(f"Error connecting to MongoDB: {e}")
-    raise
+api = Blueprint("api", __name__, cli_group=None)
+
+# ✅ MongoDB connection (lazy: opened by the first request that needs it, not at import time)
+mongo = Database()
 
 # ✅ RapidAPI Key
 RAPIDAPI_KEY = os.getenv("RAPIDAPI_KEY")
@@ -53,16 +56,126 @@ GEMINI_API_KEY = os.getenv("GEMINI_API_KEY")
 print("DEBUG GEMINI_API_KEY:", "Loaded" if GEMINI_API_KEY else "Not found")
 print("Raw GEMINI_API_KEY from env:", repr(GEMINI_API_KEY))
 
+# ✅ Access tokens live this long
+ACCESS_TOKEN_EXPIRES = timedelta(days=7)
+
+# ✅ Password hashing runs in a bounded bcrypt pool (BCRYPT_ROUNDS, PASSWORD_HASH_WORKERS)
+password_hasher = PasswordHasher()
+
+# ✅ Name/email for protected routes come from token claims or a TTL cache, not a users lookup per request
+identity_cache = IdentityCache(
+    lambda user_id: mongo.users.find_one({"_id": ObjectId(user_id)}, {"password": 0}),
+)
+
+# ✅ Token-bucket rate limits: per client on /search and /chatbot, global per upstream provider
+rate_limiter = RateLimiter()
+
+# ✅ Circuit breakers with adaptive (p99-based) timeouts for JSearch, Remotive and Gemini
+breakers = CircuitBreakers(observer=metrics.observe_upstream)
+
+# ✅ Search result cache (in front of JSearch / Remotive)
+search_cache = SearchCache()
+
+# ✅ Local full-text index of every job the providers returned (persisted to job_listings)
+job_index = JobIndex()
+job_ingestor = JobIngestor(job_index, lambda: mongo.job_listings)
+SEARCH_LOCAL_FIRST = os.getenv("SEARCH_LOCAL_FIRST", "0") == "1"
+JOB_INDEX_MIN_HITS = int(os.getenv("JOB_INDEX_MIN_HITS", "10"))
+JOB_INDEX_PAGE_SIZE = int(os.getenv("JOB_INDEX_PAGE_SIZE", "10"))
+
+# ✅ Search engine: JSearch first, Remotive as fallback (SEARCH_MODE=sequential|first|merge)
+search_engine = SearchEngine(
+    [JSearchProvider(RAPIDAPI_KEY), RemotiveProvider()],
+    cache=search_cache,
+    on_fetch=job_ingestor.ingest,
+    limiter=rate_limiter,
+    breakers=breakers,
+)
+
+# ✅ Column-wise copies of recent result sets, so filter/sort changes reuse them instead of re-fetching
+result_sets = ResultSetCache()
+
+# ✅ Re-fetches trending queries in the background before their cache entries expire
+cache_warmer = CacheWarmer(search_engine, search_cache)
+
+# ✅ Chatbot answer cache keyed by normalized question (CHATBOT_CACHE_PATH enables persistence)
+answer_cache = AnswerCache()
+atexit.register(answer_cache.save)
+
+# ✅ Identical chatbot questions in flight at the same time share one Gemini call
+chat_flight = SingleFlight("chatbot")
+
+# ✅ Opt-in per-request cProfile (PROFILING_ENABLED=1, then X-Profile: 1 or PROFILE_SAMPLE_RATE)
+request_profiler = RequestProfiler()
+
+# ✅ /health is served from a snapshot refreshed in the background (HEALTH_REFRESH_INTERVAL)
+health_monitor = HealthMonitor(mongo, breakers)
+
 # ---------------- ROUTES ----------------
 
-@app.route("/")
+def client_key():
+    """Rate-limit key: the JWT identity when a valid token is sent, else the client IP."""
+    try:
+        verify_jwt_in_request(optional=True)
+        identity = get_jwt_identity()
+    except Exception:
+        identity = None
+    return f"user:{identity}" if identity else f"ip:{request.remote_addr}"
+
+
+def rate_limited(name):
+    """Reject the request with 429 and Retry-After once the client's `name` bucket is empty."""
+    def decorator(view):
+        @wraps(view)
+        def wrapper(*args, **kwargs):
+            decision = rate_limiter.check(name, client_key())
+            if not decision.allowed:
+                response = jsonify({"error": "Too many requests, please slow down", "retry_after": decision.retry_after})
+                response.headers.update(decision.headers())
+                return response, 429
+            return view(*args, **kwargs)
+        return wrapper
+    return decorator
+
+
+# Users whose email is listed here (comma separated) may use admin routes, as may users with role "admin"
+ADMIN_EMAILS = {email.strip().lower() for email in os.getenv("ADMIN_EMAILS", "").split(",") if email.strip()}
+
+
+def admin_required(view):
+    """Require a valid JWT whose user is an admin; 401 without a token, 403 for other users."""
+    @wraps(view)
+    @jwt_required()
+    def wrapper(*args, **kwargs):
+        user = identity_cache.profile(get_jwt_identity())
+        if not user or (user.get("role") != "admin" and (user.get("email") or "").lower() not in ADMIN_EMAILS):
+            return jsonify({"error": "Admin access required"}), 403
+        return view(*args, **kwargs)
+    return wrapper
+
+
+def read_json_body(max_bytes):
+    """Parse the JSON request body, reading at most `max_bytes`; None when it is larger."""
+    if request.content_length is not None and request.content_length > max_bytes:
+        return None
+    body = request.stream.read(max_bytes + 1)
+    if len(body) > max_bytes:
+        return None
+    try:
+        data = json.loads(body) if body else {}
+    except ValueError:
+        data = {}
+    return data if isinstance(data, dict) else {}
+
+
+@api.route("/")
 def home():
     return jsonify({"message": "Job Portal API is running 🚀"})
 
 
 # ============ AUTHENTICATION ROUTES ============
 
-@app.route("/register", methods=["POST"])
+@api.route("/register", methods=["POST"])
 def register():
     try:
         data = request.get_json()
@@ -85,11 +198,11 @@ def register():
             return jsonify({"error": "Password must be at least 6 characters long"}), 400
             
         # Check if user already exists
-        if users.find_one({"email": email}):
+        if mongo.users.find_one({"email": email}):
             return jsonify({"error": "User with this email already exists"}), 409
             
         # Hash password
-        hashed_password = bcrypt.hashpw(password.encode('utf-8'), bcrypt.gensalt())
+        hashed_password = password_hasher.hash(password)
         
         # Create user document
         user = {
@@ -100,11 +213,16 @@ def register():
             "updated_at": datetime.utcnow()
         }
         
-        # Insert user
-        result = users.insert_one(user)
+        # Insert user (the unique email index catches concurrent registrations)
+        try:
+            result = mongo.users.insert_one(user)
+        except DuplicateKeyError:
+            return jsonify({"error": "User with this email already exists"}), 409
         
+        identity_cache.remember(user)  # insert_one filled in user["_id"]
+
         # Create access token
-        access_token = create_access_token(identity=str(result.inserted_id))
+        access_token = create_access_token(identity=str(result.inserted_id), additional_claims=identity_claims(user))
         
         return jsonify({
             "status": "success",
@@ -117,11 +235,13 @@ def register():
             }
         }), 201
         
+    except HasherBusy:
+        return hasher_busy_response()
     except Exception as e:
         return jsonify({"error": str(e)}), 500
 
 
-@app.route("/login", methods=["POST"])
+@api.route("/login", methods=["POST"])
 def login():
     try:
         data = request.get_json()
@@ -133,22 +253,27 @@ def login():
             return jsonify({"error": "Email and password are required"}), 400
             
         # Find user by email
-        user = users.find_one({"email": email})
+        user = mongo.users.find_one({"email": email})
         if not user:
             return jsonify({"error": "Invalid email or password"}), 401
             
         # Check password
-        if not bcrypt.checkpw(password.encode('utf-8'), user['password']):
+        if not password_hasher.verify(password, user['password']):
             return jsonify({"error": "Invalid email or password"}), 401
             
-        # Update last login
-        users.update_one(
+        # Update last login, upgrading hashes made with an older work factor
+        updates = {"last_login": datetime.utcnow(), "updated_at": datetime.utcnow()}
+        if password_hasher.needs_rehash(user['password']):
+            updates["password"] = password_hasher.hash(password)
+        mongo.users.update_one(
             {"_id": user["_id"]},
-            {"$set": {"last_login": datetime.utcnow(), "updated_at": datetime.utcnow()}}
+            {"$set": updates}
         )
+        user.update(updates)
+        identity_cache.remember(user)
         
         # Create access token
-        access_token = create_access_token(identity=str(user["_id"]))
+        access_token = create_access_token(identity=str(user["_id"]), additional_claims=identity_claims(user))
         
         return jsonify({
             "status": "success",
@@ -161,16 +286,24 @@ def login():
             }
         }), 200
         
+    except HasherBusy:
+        return hasher_busy_response()
     except Exception as e:
         return jsonify({"error": str(e)}), 500
 
 
-@app.route("/profile", methods=["GET"])
+def hasher_busy_response():
+    response = jsonify({"error": "Server is busy, please try again in a moment"})
+    response.headers["Retry-After"] = "1"
+    return response, 503
+
+
+@api.route("/profile", methods=["GET"])
 @jwt_required()
 def get_profile():
     try:
         user_id = get_jwt_identity()
-        user = users.find_one({"_id": ObjectId(user_id)}, {"password": 0})
+        user = identity_cache.profile(user_id)
         
         if not user:
             return jsonify({"error": "User not found"}), 404
@@ -178,7 +311,7 @@ def get_profile():
         return jsonify({
             "status": "success",
             "user": {
-                "id": str(user["_id"]),
+                "id": user["id"],
                 "name": user["name"],
                 "email": user["email"],
                 "created_at": user.get("created_at"),
@@ -190,8 +323,58 @@ def get_profile():
         return jsonify({"error": str(e)}), 500
 
 
+@api.route("/profile", methods=["PUT"])
+@jwt_required()
+def update_profile():
+    try:
+        user_id = get_jwt_identity()
+        data = request.get_json() or {}
+
+        updates = {}
+        if "name" in data:
+            updates["name"] = (data.get("name") or "").strip()
+            if not updates["name"]:
+                return jsonify({"error": "Name cannot be empty"}), 400
+        if "email" in data:
+            updates["email"] = (data.get("email") or "").strip().lower()
+            if not re.match(r'^[a-zA-Z0-9._%+-]+@[a-zA-Z0-9.-]+\.[a-zA-Z]{2,}$', updates["email"]):
+                return jsonify({"error": "Please enter a valid email address"}), 400
+        if not updates:
+            return jsonify({"error": "Nothing to update; send name and/or email"}), 400
+
+        updates["updated_at"] = datetime.utcnow()
+        try:
+            result = mongo.users.update_one(
+                {"_id": ObjectId(user_id)}, {"$set": updates, "$inc": {"profile_version": 1}}
+            )
+        except DuplicateKeyError:
+            return jsonify({"error": "User with this email already exists"}), 409
+        if result.matched_count == 0:
+            return jsonify({"error": "User not found"}), 404
+
+        # Older tokens carry the old name/email and profile version; hand out a fresh one
+        identity_cache.invalidate(user_id)
+        user = identity_cache.profile(user_id)
+        access_token = create_access_token(identity=user_id, additional_claims=identity_claims(user))
+
+        return jsonify({
+            "status": "success",
+            "message": "Profile updated successfully",
+            "access_token": access_token,
+            "user": {
+                "id": user["id"],
+                "name": user["name"],
+                "email": user["email"]
+            }
+        }), 200
+
+    except Exception as e:
+        return jsonify({"error": str(e)}), 500
+
+
 # ✅ Fetch jobs from APIs
-@app.route("/search")
+@api.route("/search")
+@rate_limited("search")
 def search_jobs():
     query = request.args.get("query")
     location = request.args.get("location")
@@ -200,38 +383,94 @@ def search_jobs():
     if not query:
         return jsonify({"error": "Query is required"}), 400
 
+    mode = request.args.get("mode")
+    if mode and mode not in SEARCH_MODES + (LOCAL_MODE,):
+        return jsonify({"error": f"mode must be one of: {', '.join(SEARCH_MODES + (LOCAL_MODE,))}"}), 400
+
+    response_format = request.args.get("format", DEFAULT_RESPONSE_FORMAT)
+    if response_format not in RESPONSE_FORMATS:
+        return jsonify({"error": f"format must be one of: {', '.join(RESPONSE_FORMATS)}"}), 400
     try:
-        # Try JSearch API (RapidAPI)
-        if RAPIDAPI_KEY:
-            url = "https://jsearch.p.rapidapi.com/search"
-            params = {"query": query, "page": str(page), "num_pages": "1"}
-            if location:
-                params["query"] += f" in {location}"
-
-            headers = {
-                "X-RapidAPI-Key": RAPIDAPI_KEY,
-                "X-RapidAPI-Host": "jsearch.p.rapidapi.com"
-            }
+        fields = parse_job_fields(request.args.get("fields"))
+        filters = SearchFilters.from_args(request.args)
+    except ValueError as e:
+        return jsonify({"error": str(e)}), 400
+    if filters is not None and response_format == "raw":
+        return jsonify({"error": "Filtering and sorting need format=compact"}), 400
 
-            response = requests.get(url, headers=headers, params=params, timeout=10)
-            if response.status_code == 200:
-                return jsonify(response.json())
+    try:
+        # Answer from the local index when asked to, or when it has enough hits
+        if mode == LOCAL_MODE or SEARCH_LOCAL_FIRST:
+            payload = search_local(query, location, page)
+            if mode == LOCAL_MODE or payload["total"] >= JOB_INDEX_MIN_HITS:
+                return jsonify(search_payload(payload, payload, response_format, fields, filters))
 
-        # Fallback → Remotive API
-        remotive_url = "https://remotive.io/api/remote-jobs"
-        remotive_params = {"search": query}
-        remotive_response = requests.get(remotive_url, params=remotive_params, timeout=10)
-        if remotive_response.status_code == 200:
-            return jsonify(remotive_response.json())
+        cache_warmer.record(query, location)
+        result = search_engine.search(query, location, page, mode=mode)
+        if result.payload is not None:
+            return jsonify(search_payload(
+                result.payload, lambda: result.normalized, response_format, fields, filters,
+                normalize_search_key(query, location, page, result.provider), result.sources,
+            ))
 
-        return jsonify({"error": "No jobs found from APIs"}), 404
+        return jsonify({"error": "No jobs found from APIs", "providers": result.providers}), 404
 
     except Exception as e:
         return jsonify({"error": str(e)}), 500
 
 
+def search_payload(raw, normalized, response_format, fields, filters=None, result_set_key=None, sources=()):
+    """Compact job records by default; format=raw returns the provider payload untouched.
+
+    `normalized` may be a callable, called only when needed. With filters, the
+    result set's columns are looked up under `result_set_key` and reused while
+    `sources` are the same upstream payloads.
+    """
+    if response_format == "raw":
+        return raw
+    if filters is not None:
+        payload = result_sets.columns(result_set_key, normalized, sources).apply(filters)
+    else:
+        payload = normalized() if callable(normalized) else normalized
+    return shape_search_payload(payload, fields)
+
+
+def search_local(query, location, page):
+    """Search the in-process job index; results use the normalized job schema."""
+    try:
+        job_ingestor.bootstrap()
+    except Exception as e:
+        print(f"Could not bootstrap job index from job_listings: {e}")
+    total, jobs = job_index.search(
+        query, location, limit=JOB_INDEX_PAGE_SIZE, offset=(max(page, 1) - 1) * JOB_INDEX_PAGE_SIZE
+    )
+    return {
+        "status": "success",
+        "count": len(jobs),
+        "total": total,
+        "data": jobs,
+        "providers": {LOCAL_MODE: {"status": "ok", "count": len(jobs)}},
+    }
+
+
+# ✅ Full details (including the whole description) of a job returned by /search
+@api.route("/jobs/<source>/<path:job_id>", methods=["GET"])
+def get_job(source, job_id):
+    try:
+        job = job_index.get(source, job_id)
+        if job is None:
+            job = mongo.job_listings.find_one(
+                {"source": source, "id": job_id}, {"_id": 0, "created_at": 0, "updated_at": 0}
+            )
+        if not job:
+            return jsonify({"error": "Job not found"}), 404
+        return jsonify({"status": "success", "data": job}), 200
+    except Exception as e:
+        return jsonify({"error": str(e)}), 500
+
+
 # ✅ Submit applicant details (Protected Route)
-@app.route("/apply", methods=["POST"])
+@api.route("/apply", methods=["POST"])
 @jwt_required()
 def apply_for_job():
     try:
@@ -252,23 +491,18 @@ def apply_for_job():
         if resume_file.filename == "":
             return jsonify({"error": "Resume file is required"}), 400
 
-        # Get user details
-        user = users.find_one({"_id": ObjectId(user_id)})
+        # Get user details (token claims or identity cache; the database only on a miss)
+        user = identity_cache.get(user_id, get_jwt())
         if not user:
             return jsonify({"error": "User not found"}), 404
 
-        # Check if user has already applied for this job
-        existing_application = job_applications.find_one({
-            "user_id": user_id,
-            "job_id": job_id
-        })
-        
-        if existing_application:
-            return jsonify({"error": "You have already applied for this job"}), 409
-
-        # Encode resume
-        resume_content = resume_file.read()
-        resume_base64 = base64.b64encode(resume_content).decode("utf-8")
+        # Stream resume into the resume store; the application keeps only a reference
+        resume_ref = mongo.resume_store.save(
+            resume_file.stream,
+            resume_file.filename,
+            content_type=resume_file.mimetype,
+            metadata={"user_id": user_id, "job_id": job_id},
+        )
 
         # Save into MongoDB with user information
         application = {
@@ -276,7 +510,7 @@ def apply_for_job():
             "applicant": user["name"],
             "email": user["email"],
             "resume": resume_file.filename,
-            "resume_base64": resume_base64,
+            "resume_ref": resume_ref,
             "coverLetter": cover_letter,
             "job_id": job_id,
             "job_title": job_title,
@@ -285,7 +519,15 @@ def apply_for_job():
             "status": "applied"
         }
 
-        result = job_applications.insert_one(application)
+        # The unique (user_id, job_id) index rejects duplicate applications atomically
+        try:
+            result = mongo.job_applications.insert_one(application)
+        except DuplicateKeyError:
+            mongo.resume_store.delete(resume_ref)
+            return jsonify({"error": "You have already applied for this job"}), 409
+        except Exception:
+            mongo.resume_store.delete(resume_ref)
+            raise
 
         return jsonify({
             "status": "success",
@@ -297,66 +539,215 @@ def apply_for_job():
         return jsonify({"error": str(e)}), 500
 
 
+# ✅ Submit many applications in one request (Protected Route)
+@api.route("/apply/bulk", methods=["POST"])
+@jwt_required()
+def bulk_apply_for_jobs():
+    try:
+        user = identity_cache.get(get_jwt_identity(), get_jwt())
+        if not user:
+            return jsonify({"error": "User not found"}), 404
+
+        data = read_json_body(BULK_MAX_BYTES)
+        if data is None:
+            return jsonify({"error": f"Request body is larger than {BULK_MAX_BYTES} bytes"}), 413
+        results = bulk_apply(mongo.job_applications, mongo.resume_store, user, data.get("applications"))
+        return jsonify(summarize_bulk(results)), 200
+
+    except BulkRequestError as e:
+        return jsonify({"error": str(e)}), 400
+    except Exception as e:
+        return jsonify({"error": str(e)}), 500
+
+
 # ✅ Get user's applications (Protected Route)
-@app.route("/applications", methods=["GET"])
+@api.route("/applications", methods=["GET"])
 @jwt_required()
 def get_applications():
     try:
         user_id = get_jwt_identity()
         
-        # Get applications for the current user only
-        applications = list(job_applications.find({"user_id": user_id}, {"_id": 0, "resume_base64": 0}))
+        # Get applications for the current user only, one keyset page at a time
+        query = build_filter(request.args, {"user_id": user_id})
+        docs, next_cursor = paginate(mongo.job_applications, query, request.args)
+        applications = [serialize_application(doc) for doc in docs]
         
         return jsonify({
             "status": "success",
             "count": len(applications),
-            "data": applications
+            "data": applications,
+            "next_cursor": next_cursor
         }), 200
+    except ValueError as e:
+        return jsonify({"error": str(e)}), 400
+    except Exception as e:
+        return jsonify({"error": str(e)}), 500
+
+
+# ✅ Download the resume attached to one of the user's applications (Protected Route)
+@api.route("/applications/<application_id>/resume", methods=["GET"])
+@jwt_required()
+def download_resume(application_id):
+    try:
+        user_id = get_jwt_identity()
+        if not ObjectId.is_valid(application_id):
+            return jsonify({"error": "Application not found"}), 404
+
+        application = mongo.job_applications.find_one(
+            {"_id": ObjectId(application_id), "user_id": user_id},
+            {"resume": 1, "resume_ref": 1, "resume_base64": 1}
+        )
+        if not application:
+            return jsonify({"error": "Application not found"}), 404
+
+        filename = secure_filename(application.get("resume") or "") or "resume"
+        headers = {"Content-Disposition": f'attachment; filename="{filename}"'}
+        ref = application.get("resume_ref")
+        if ref:
+            chunks = mongo.resume_store.open(ref)
+            headers["Content-Length"] = str(ref["size"])
+            return Response(chunks, mimetype=ref.get("content_type") or "application/octet-stream", headers=headers)
+
+        # Applications created before resume storage was introduced
+        if application.get("resume_base64"):
+            content = base64.b64decode(application["resume_base64"])
+            return Response(content, mimetype="application/octet-stream", headers=headers)
+
+        return jsonify({"error": "No resume stored for this application"}), 404
+
+    except ResumeNotFound:
+        return jsonify({"error": "Resume file is missing from storage"}), 404
     except Exception as e:
         return jsonify({"error": str(e)}), 500
 
 
+def serialize_application(doc):
+    """Make an application document JSON-safe (ObjectId -> string id)."""
+    doc["id"] = str(doc.pop("_id"))
+    return doc
+
+
 # ✅ Get all applications (Admin only - for development/testing)
-@app.route("/admin/applications", methods=["GET"])
+@api.route("/admin/applications", methods=["GET"])
 def get_all_applications():
     try:
-        applications = list(job_applications.find({}, {"_id": 0, "resume_base64": 0}))
+        docs, next_cursor = paginate(mongo.job_applications, build_filter(request.args), request.args)
+        applications = [serialize_application(doc) for doc in docs]
         return jsonify({
             "status": "success",
             "count": len(applications),
-            "data": applications
+            "data": applications,
+            "next_cursor": next_cursor
         }), 200
+    except ValueError as e:
+        return jsonify({"error": str(e)}), 400
     except Exception as e:
         return jsonify({"error": str(e)}), 500
 
 
+# ✅ Change the status of many applications at once (Admin only)
+@api.route("/admin/applications/status", methods=["PATCH"])
+@admin_required
+def bulk_update_application_status():
+    try:
+        data = request.get_json(silent=True) or {}
+        results = bulk_update_status(mongo.job_applications, data.get("updates"))
+        return jsonify(summarize_bulk(results)), 200
+    except BulkRequestError as e:
+        return jsonify({"error": str(e)}), 400
+    except Exception as e:
+        return jsonify({"error": str(e)}), 500
+
+
+# ✅ Stream every application as NDJSON or CSV (Admin only)
+@api.route("/admin/applications/export", methods=["GET"])
+@admin_required
+def export_applications():
+    try:
+        export_format = request.args.get("format", "ndjson")
+        if export_format not in EXPORT_FORMATS:
+            return jsonify({"error": f"format must be one of: {', '.join(EXPORT_FORMATS)}"}), 400
+
+        query = build_filter(request.args)
+        projection = parse_fields(request.args.get("fields"))
+        cursor = mongo.job_applications.find(query, projection).sort(KEYSET_SORT)
+
+        if export_format == "csv":
+            columns = CSV_COLUMNS
+            if request.args.get("fields"):
+                columns = ["id"] + [field for field in projection if field != "appliedDate"] + ["appliedDate"]
+            body = export_csv(cursor, columns)
+            mimetype = "text/csv"
+        else:
+            body = export_ndjson(cursor)
+            mimetype = "application/x-ndjson"
+
+        filename = f"applications-{datetime.utcnow().strftime('%Y%m%d-%H%M%S')}.{export_format}"
+        return Response(
+            stream_with_context(body),
+            mimetype=mimetype,
+            headers={"Content-Disposition": f'attachment; filename="{filename}"'}
+        )
+    except ValueError as e:
+        return jsonify({"error": str(e)}), 400
+    except Exception as e:
+        return jsonify({"error": str(e)}), 500
+
+
+# ✅ Recent request profiles (Admin only)
+@api.route("/admin/profiles", methods=["GET"])
+@admin_required
+def list_request_profiles():
+    if not request_profiler.enabled:
+        return jsonify({"error": "Profiling is disabled (set PROFILING_ENABLED=1)"}), 404
+    profiles = request_profiler.list()
+    return jsonify({"status": "success", "count": len(profiles), "data": profiles}), 200
+
+
+@api.route("/admin/profiles/<profile_id>", methods=["GET"])
+@admin_required
+def get_request_profile(profile_id):
+    profile = request_profiler.get(profile_id)
+    if profile is None:
+        return jsonify({"error": "Profile not found"}), 404
+    if request.args.get("format") == "text":
+        return Response(profile["text"], mimetype="text/plain")
+    return jsonify({"status": "success", "data": profile}), 200
+
+
 # ✅ Add sample data for testing
-@app.route("/seed-data", methods=["POST"])
+@api.route("/seed-data", methods=["POST"])
 def seed_sample_data():
     try:
         # Clear existing data
-        users.delete_many({})
-        job_applications.delete_many({})
+        mongo.users.delete_many({})
+        identity_cache.clear()
+        for application in mongo.job_applications.find({"resume_ref": {"$exists": True}}, {"resume_ref": 1}):
+            mongo.resume_store.delete(application["resume_ref"])
+        mongo.job_applications.delete_many({})
+
+        def sample_resume(filename, text):
+            return mongo.resume_store.save(io.BytesIO(text.encode("utf-8")), filename, content_type="text/plain")
         
         # Create sample users
         sample_users = [
             {
                 "name": "John Doe",
                 "email": "john.doe@test.com",
-                "password": bcrypt.hashpw("password123".encode('utf-8'), bcrypt.gensalt()),
+                "password": password_hasher.hash("password123"),
                 "created_at": datetime.utcnow(),
                 "updated_at": datetime.utcnow()
             },
             {
                 "name": "Jane Smith", 
                 "email": "jane.smith@test.com",
-                "password": bcrypt.hashpw("password123".encode('utf-8'), bcrypt.gensalt()),
+                "password": password_hasher.hash("password123"),
                 "created_at": datetime.utcnow(),
                 "updated_at": datetime.utcnow()
             }
         ]
         
-        user_results = users.insert_many(sample_users)
+        user_results = mongo.users.insert_many(sample_users)
         user_ids = [str(id) for id in user_results.inserted_ids]
         
         # Sample applications data with user IDs
@@ -366,7 +757,7 @@ def seed_sample_data():
                 "applicant": "John Doe",
                 "email": "john.doe@test.com",
                 "resume": "john_doe_resume.pdf",
-                "resume_base64": "sample_base64_content_1",
+                "resume_ref": sample_resume("john_doe_resume.pdf", "sample resume content 1"),
                 "coverLetter": "I am very interested in this software engineer position...",
                 "job_id": "job_001",
                 "job_title": "Full Stack Developer",
@@ -379,7 +770,7 @@ def seed_sample_data():
                 "applicant": "Jane Smith",
                 "email": "jane.smith@test.com",
                 "resume": "jane_smith_resume.pdf",
-                "resume_base64": "sample_base64_content_2",
+                "resume_ref": sample_resume("jane_smith_resume.pdf", "sample resume content 2"),
                 "coverLetter": "With my experience in React and Node.js, I believe I'm a perfect fit...",
                 "job_id": "job_002",
                 "job_title": "Frontend Developer",
@@ -392,7 +783,7 @@ def seed_sample_data():
                 "applicant": "John Doe",
                 "email": "john.doe@test.com",
                 "resume": "john_doe_resume_2.pdf",
-                "resume_base64": "sample_base64_content_3",
+                "resume_ref": sample_resume("john_doe_resume_2.pdf", "sample resume content 3"),
                 "coverLetter": "I have experience in data science and would love to contribute...",
                 "job_id": "job_003",
                 "job_title": "Data Scientist",
@@ -403,7 +794,7 @@ def seed_sample_data():
         ]
         
         # Insert sample data
-        app_results = job_applications.insert_many(sample_applications)
+        app_results = mongo.job_applications.insert_many(sample_applications)
         
         return jsonify({
             "status": "success",
@@ -416,13 +807,16 @@ def seed_sample_data():
             ]
         }), 201
         
+    except HasherBusy:
+        return hasher_busy_response()
     except Exception as e:
         return jsonify({"error": str(e)}), 500
 
 
 # ============ CHATBOT ROUTE ============
 
-@app.route("/chatbot", methods=["POST"])
+@api.route("/chatbot", methods=["POST"])
+@rate_limited("chatbot")
 def chatbot():
     try:
         data = request.get_json()
@@ -433,80 +827,37 @@ def chatbot():
             
         if not GEMINI_API_KEY:
             return jsonify({"error": "Gemini API key not configured"}), 500
-            
-        # Prepare context for job portal chatbot
-        system_context = """You are SkillMate Assistant, an expert career and job search advisor for a professional job portal. 
-        
-        Your expertise includes:
-        - Current job market trends in IT, healthcare, finance, marketing, and other sectors
-        - Top companies actively hiring (Google, Microsoft, Amazon, startups, etc.)
-        - In-demand skills for different roles (Python, React, AI/ML, cloud computing, etc.)
-        - Salary ranges and career progression paths
-        - Interview preparation and common questions
-        - Resume optimization and LinkedIn tips
-        - Networking strategies and job search techniques
-        
-        IMPORTANT GUIDELINES:
-        - Give specific, actionable advice with real examples
-        - Mention actual companies and technologies when relevant
-        - Include salary ranges when discussing roles
-        - Suggest concrete next steps the user can take
-        - Keep responses focused, practical, and encouraging
-        - If asked about job openings, direct them to use the portal's search feature
-        
-        Always provide valuable, career-focused insights that help users advance their professional goals."""
-        
-        # Create the prompt with context
-        full_prompt = f"{system_context}\n\nUser Question: {user_message}\n\nResponse:"
-        
+
+        # Answer common questions locally
+        cached_answer = answer_cache.get(user_message)
+        if cached_answer is not None:
+            return jsonify({
+                "status": "success",
+                "message": cached_answer,
+                "cached": True,
+                "timestamp": datetime.utcnow().isoformat()
+            }), 200
+
         # Call Gemini API
-        gemini_url = f"https://generativelanguage.googleapis.com/v1beta/models/gemini-1.5-flash:generateContent?key={GEMINI_API_KEY}"
-        
-        payload = {
-            "contents": [{
-                "parts": [{
-                    "text": full_prompt
-                }]
-            }],
-            "generationConfig": {
-                "temperature": 0.7,
-                "topK": 1,
-                "topP": 1,
-                "maxOutputTokens": 500,
-                "stopSequences": []
-            },
-            "safetySettings": [
-                {
-                    "category": "HARM_CATEGORY_HARASSMENT",
-                    "threshold": "BLOCK_MEDIUM_AND_ABOVE"
-                },
-                {
-                    "category": "HARM_CATEGORY_HATE_SPEECH", 
-                    "threshold": "BLOCK_MEDIUM_AND_ABOVE"
-                },
-                {
-                    "category": "HARM_CATEGORY_SEXUALLY_EXPLICIT",
-                    "threshold": "BLOCK_MEDIUM_AND_ABOVE"
-                },
-                {
-                    "category": "HARM_CATEGORY_DANGEROUS_CONTENT",
-                    "threshold": "BLOCK_MEDIUM_AND_ABOVE"
-                }
-            ]
-        }
-        
-        headers = {
-            "Content-Type": "application/json"
-        }
-        
-        response = requests.post(gemini_url, json=payload, headers=headers, timeout=30)
+        try:
+            response = chat_flight.do(normalize_question(user_message), lambda: call_gemini(user_message), timeout=30)
+        except (RateLimited, CircuitOpen) as e:
+            # Gemini budget spent or Gemini known to be down: answer like Gemini's own 503
+            response = jsonify({
+                "status": "error",
+                "message": gemini.BUSY_FALLBACK_MESSAGE,
+                "timestamp": datetime.utcnow().isoformat()
+            })
+            response.headers["Retry-After"] = str(e.retry_after)
+            return response, 200
         
         if response.status_code == 200:
             result = response.json()
             
             # Extract the generated text
-            if 'candidates' in result and len(result['candidates']) > 0:
-                generated_text = result['candidates'][0]['content']['parts'][0]['text']
+            generated_text = gemini.extract_text(result)
+            if generated_text:
+                answer_cache.set(user_message, generated_text.strip())
                 
                 return jsonify({
                     "status": "success",
@@ -518,7 +869,7 @@ def chatbot():
         elif response.status_code == 503:
             return jsonify({
                 "status": "error", 
-                "message": "The AI service is currently busy. Here are some general career tips: Focus on building in-demand skills like Python, JavaScript, cloud computing, and data analysis. Companies like Google, Microsoft, Amazon, and startups are actively hiring. Consider improving your LinkedIn profile and GitHub portfolio.",
+                "message": gemini.BUSY_FALLBACK_MESSAGE,
                 "timestamp": datetime.utcnow().isoformat()
             }), 200
         else:
@@ -528,7 +879,7 @@ def chatbot():
                 "details": error_data
             }), 500
             
-    except requests.exceptions.Timeout:
+    except (requests.exceptions.Timeout, SingleFlightTimeout):
         return jsonify({"error": "AI service timeout. Please try again."}), 504
     except requests.exceptions.RequestException as e:
         return jsonify({"error": f"Network error: {str(e)}"}), 503
@@ -536,20 +887,213 @@ def chatbot():
         return jsonify({"error": f"Internal server error: {str(e)}"}), 500
 
 
-# ✅ Health check endpoint
-@app.route("/health", methods=["GET"])
+def call_gemini(user_message):
+    """One generateContent call through the Gemini breaker; spends a token of the Gemini budget."""
+    breaker = breakers.get("gemini")
+    breaker.before_call()
+    try:
+        rate_limiter.acquire("gemini")
+    except RateLimited:
+        breaker.cancel()
+        raise
+    return breaker.attempt(
+        lambda timeout: http_client.post(
+            gemini.generate_url(GEMINI_API_KEY),
+            json=gemini.build_payload(user_message),
+            headers=gemini.HEADERS,
+            timeout=timeout
+        ),
+        is_failure=lambda response: is_failure_status(response.status_code)
+    )
+
+
+# ✅ Streaming chatbot: relays Gemini tokens as Server-Sent Events
+@api.route("/chatbot/stream", methods=["GET", "POST"])
+@rate_limited("chatbot")
+def chatbot_stream():
+    if request.method == "POST":
+        user_message = ((request.get_json(silent=True) or {}).get('message') or '').strip()
+    else:
+        user_message = (request.args.get('message') or '').strip()
+
+    if not user_message:
+        return jsonify({"error": "Message is required"}), 400
+
+    if not GEMINI_API_KEY:
+        return jsonify({"error": "Gemini API key not configured"}), 500
+
+    def events():
+        cached_answer = answer_cache.get(user_message)
+        if cached_answer is not None:
+            yield gemini.sse_event("token", {"text": cached_answer})
+            yield gemini.sse_event("done", {"status": "success", "cached": True, "timestamp": datetime.utcnow().isoformat()})
+            return
+
+        breaker = breakers.get(gemini.STREAM_BREAKER)
+        try:
+            breaker.before_call()
+        except CircuitOpen:
+            yield gemini.sse_event("fallback", {"status": "error", "message": gemini.BUSY_FALLBACK_MESSAGE})
+            yield gemini.sse_event("done", {"status": "error", "timestamp": datetime.utcnow().isoformat()})
+            return
+        if not rate_limiter.check("gemini").allowed:
+            breaker.cancel()
+            yield gemini.sse_event("fallback", {"status": "error", "message": gemini.BUSY_FALLBACK_MESSAGE})
+            yield gemini.sse_event("done", {"status": "error", "timestamp": datetime.utcnow().isoformat()})
+            return
+
+        try:
+            # The stream breaker times the response headers and bounds the connect;
+            # headers and each chunk then get the fixed GEMINI_STREAM_READ_TIMEOUT
+            response = breaker.attempt(
+                lambda timeout: http_client.post(
+                    gemini.stream_url(GEMINI_API_KEY),
+                    json=gemini.build_payload(user_message),
+                    headers=gemini.HEADERS,
+                    stream=True,
+                    timeout=(timeout, gemini.STREAM_READ_TIMEOUT)
+                ),
+                is_failure=lambda response: is_failure_status(response.status_code)
+            )
+            with response:
+                if response.status_code == 503:
+                    yield gemini.sse_event("fallback", {"status": "error", "message": gemini.BUSY_FALLBACK_MESSAGE})
+                    yield gemini.sse_event("done", {"status": "error", "timestamp": datetime.utcnow().isoformat()})
+                    return
+                if response.status_code != 200:
+                    yield gemini.sse_event("error", {"error": f"AI service temporarily unavailable (Error {response.status_code}). Please try again in a few moments."})
+                    return
+
+                parts = []
+                for text in gemini.iter_stream_text(response):
+                    parts.append(text)
+                    yield gemini.sse_event("token", {"text": text})
+
+            generated_text = "".join(parts).strip()
+            if not generated_text:
+                yield gemini.sse_event("error", {"error": "No response generated from AI"})
+                return
+            answer_cache.set(user_message, generated_text)
+            yield gemini.sse_event("done", {"status": "success", "timestamp": datetime.utcnow().isoformat()})
+
+        except requests.exceptions.Timeout:
+            yield gemini.sse_event("error", {"error": "AI service timeout. Please try again."})
+        except requests.exceptions.RequestException as e:
+            yield gemini.sse_event("error", {"error": f"Network error: {str(e)}"})
+        except Exception as e:
+            yield gemini.sse_event("error", {"error": f"Internal server error: {str(e)}"})
+
+    return Response(
+        stream_with_context(events()),
+        mimetype="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"}
+    )
+
+
+# ✅ One-off migration: move inline resume_base64 blobs into the resume store
+@api.cli.command("migrate-resumes")
+def migrate_resumes():
+    """Usage: flask --app main migrate-resumes"""
+    migrated = 0
+    failed = 0
+    cursor = mongo.job_applications.find(
+        {"resume_base64": {"$exists": True}},
+        {"resume": 1, "resume_base64": 1, "user_id": 1, "job_id": 1}
+    ).batch_size(50)
+    for application in cursor:
+        try:
+            content = base64.b64decode(application["resume_base64"])
+        except (binascii.Error, ValueError) as e:
+            print(f"Skipping application {application['_id']}: invalid base64 ({e})")
+            failed += 1
+            continue
+
+        resume_ref = mongo.resume_store.save(
+            io.BytesIO(content),
+            application.get("resume") or "resume",
+            metadata={"user_id": application.get("user_id"), "job_id": application.get("job_id")},
+        )
+        result = mongo.job_applications.update_one(
+            {"_id": application["_id"], "resume_base64": {"$exists": True}},
+            {"$set": {"resume_ref": resume_ref}, "$unset": {"resume_base64": ""}}
+        )
+        if result.modified_count:
+            migrated += 1
+        else:
+            # Migrated concurrently by someone else
+            mongo.resume_store.delete(resume_ref)
+    print(f"Migrated {migrated} resumes ({failed} failed)")
+
+
+# ✅ Verify hot queries use indexes (run in CI / after deploys)
+@api.cli.command("check-query-plans")
+def check_query_plans():
+    """Usage: flask --app main check-query-plans"""
+    for collection_name, query, stages in explain_hot_queries(mongo.db):
+        print(f"{collection_name}.find({query}): {' -> '.join(stages)}")
+    try:
+        verify_query_plans(mongo.db)
+    except QueryPlanError as e:
+        print(f"❌ {e}")
+        raise SystemExit(1)
+
+
+# ✅ Liveness: the process is up and serving (never touches the database)
+@api.route("/livez", methods=["GET"])
+def liveness():
+    return jsonify({"status": "alive"}), 200
+
+
+# ✅ Readiness: the database is reachable, so the instance can take traffic
+@api.route("/readyz", methods=["GET"])
+def readiness():
+    try:
+        mongo.ping()
+        return jsonify({"status": "ready", "database": "connected"}), 200
+    except Exception as e:
+        return jsonify({"status": "not ready", "database": "unavailable", "error": str(e)}), 503
+
+
+# ✅ Prometheus metrics: per-route latency, upstream calls, MongoDB command timings
+@api.route("/metrics", methods=["GET"])
+def prometheus_metrics():
+    return Response(metrics.registry.render(), content_type=metrics.CONTENT_TYPE)
+
+
+# ✅ Health check endpoint (no per-request scans or upstream calls)
+@api.route("/health", methods=["GET"])
 def health_check():
     try:
-        # Check MongoDB connection
-        client.admin.command('ping')
-        app_count = job_applications.count_documents({})
-        user_count = users.count_documents({})
-        
+        snapshot = health_monitor.snapshot()
+        if snapshot["database"] != "connected":
+            return jsonify({
+                "status": "unhealthy",
+                "error": snapshot.get("error"),
+                "snapshot_age_seconds": snapshot["age_seconds"]
+            }), 500
+
         return jsonify({
             "status": "healthy",
             "database": "connected",
-            "users_count": user_count,
-            "applications_count": app_count,
+            "database_ping_ms": snapshot["database_ping_ms"],
+            # estimated_document_count: collection metadata, may lag slightly
+            "users_count": snapshot["counts"]["users"],
+            "applications_count": snapshot["counts"]["job_applications"],
+            "listings_count": snapshot["counts"]["job_listings"],
+            "upstreams": snapshot["upstreams"],
+            "snapshot_refreshed_at": snapshot["refreshed_at"],
+            "snapshot_age_seconds": snapshot["age_seconds"],
+            "search_cache": search_cache.stats(),
+            "search_result_sets": result_sets.stats(),
+            "upstream_connections": http_client.stats(),
+            "password_hasher": password_hasher.stats(),
+            "identity_cache": identity_cache.stats(),
+            "chatbot_cache": answer_cache.stats(),
+            "job_index": job_ingestor.stats(),
+            "cache_warmer": cache_warmer.stats(),
+            "rate_limits": rate_limiter.stats(),
+            "single_flight": {"search": search_engine.flight.stats(), "chatbot": chat_flight.stats()},
+            "circuit_breakers": breakers.stats(),
             "timestamp": datetime.utcnow().isoformat()
         }), 200
     except Exception as e:
@@ -559,5 +1103,27 @@ def health_check():
         }), 500
 
 
+def create_app(config=None):
+    """Application factory. Cheap to call: no database or upstream I/O happens here."""
+    app = Flask(__name__)
+    CORS(app)
+
+    # JWT Configuration
+    app.config['JWT_SECRET_KEY'] = os.getenv('JWT_SECRET_KEY', 'your-secret-key-change-this-in-production')
+    app.config['JWT_ACCESS_TOKEN_EXPIRES'] = ACCESS_TOKEN_EXPIRES
+    if config:
+        app.config.update(config)
+    JWTManager(app)
+    metrics.init_app(app)
+    compression.init_app(app)
+    request_profiler.init_app(app)
+
+    app.register_blueprint(api)
+    return app
+
+
+app = create_app()
+
+
 if __name__ == "__main__":
     app.run(host="127.0.0.1", port=8000, debug=True, threaded=True)
@@ -0,0 +1,195 @@
+import bisect
+import threading
+import time
+
+from pymongo import monitoring
+
+# Seconds; covers cache hits (sub-ms) up to the 30 s Gemini timeout
+DEFAULT_BUCKETS = (0.001, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0)
+
+CONTENT_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+
+
+def _escape(value):
+    return str(value).replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+def _format_labels(names, values, extra=None):
+    pairs = list(zip(names, values))
+    if extra:
+        pairs.append(extra)
+    if not pairs:
+        return ""
+    return "{" + ",".join(f'{name}="{_escape(value)}"' for name, value in pairs) + "}"
+
+
+class _Metric:
+    kind = None
+
+    def __init__(self, name, help_text, labels=()):
+        self.name = name
+        self.help = help_text
+        self.label_names = tuple(labels)
+        self._values = {}
+        self._lock = threading.Lock()
+
+    def header(self):
+        return [f"# HELP {self.name} {self.help}", f"# TYPE {self.name} {self.kind}"]
+
+
+class Counter(_Metric):
+    kind = "counter"
+
+    def inc(self, *labels, amount=1):
+        with self._lock:
+            self._values[labels] = self._values.get(labels, 0) + amount
+
+    def render(self):
+        with self._lock:
+            items = sorted(self._values.items())
+        return self.header() + [f"{self.name}{_format_labels(self.label_names, key)} {value}" for key, value in items]
+
+
+class Gauge(Counter):
+    kind = "gauge"
+
+    def dec(self, *labels, amount=1):
+        self.inc(*labels, amount=-amount)
+
+    def set(self, *labels, value):
+        with self._lock:
+            self._values[labels] = value
+
+
+class Histogram(_Metric):
+    kind = "histogram"
+
+    def __init__(self, name, help_text, labels=(), buckets=DEFAULT_BUCKETS):
+        super().__init__(name, help_text, labels)
+        self.buckets = tuple(buckets)
+
+    def observe(self, *labels, value):
+        # Bucket counts are stored non-cumulative and summed up at render time
+        index = bisect.bisect_left(self.buckets, value)
+        with self._lock:
+            series = self._values.get(labels)
+            if series is None:
+                series = self._values[labels] = [[0] * (len(self.buckets) + 1), 0.0, 0]
+            series[0][index] += 1
+            series[1] += value
+            series[2] += 1
+
+    def render(self):
+        with self._lock:
+            items = sorted((key, ([*counts], total, count)) for key, (counts, total, count) in self._values.items())
+        lines = self.header()
+        for key, (counts, total, count) in items:
+            cumulative = 0
+            for bound, bucket_count in zip(self.buckets + ("+Inf",), counts):
+                cumulative += bucket_count
+                lines.append(f"{self.name}_bucket{_format_labels(self.label_names, key, ('le', bound))} {cumulative}")
+            lines.append(f"{self.name}_sum{_format_labels(self.label_names, key)} {round(total, 6)}")
+            lines.append(f"{self.name}_count{_format_labels(self.label_names, key)} {count}")
+        return lines
+
+
+class Registry:
+    def __init__(self):
+        self._metrics = []
+
+    def _add(self, metric):
+        self._metrics.append(metric)
+        return metric
+
+    def counter(self, name, help_text, labels=()):
+        return self._add(Counter(name, help_text, labels))
+
+    def gauge(self, name, help_text, labels=()):
+        return self._add(Gauge(name, help_text, labels))
+
+    def histogram(self, name, help_text, labels=(), buckets=DEFAULT_BUCKETS):
+        return self._add(Histogram(name, help_text, labels, buckets))
+
+    def render(self):
+        lines = []
+        for metric in self._metrics:
+            lines.extend(metric.render())
+        return "\n".join(lines) + "\n"
+
+
+registry = Registry()
+
+http_requests = registry.counter(
+    "http_requests_total", "HTTP requests by route, method and status", ("route", "method", "status"))
+http_latency = registry.histogram(
+    "http_request_duration_seconds", "Time to produce a response (streamed bodies excluded)", ("route", "method"))
+http_in_flight = registry.gauge(
+    "http_requests_in_flight", "Requests currently being handled", ("route",))
+upstream_latency = registry.histogram(
+    "upstream_request_duration_seconds", "Calls to JSearch, Remotive and Gemini", ("upstream", "outcome"))
+mongo_latency = registry.histogram(
+    "mongodb_command_duration_seconds", "MongoDB commands by collection and operation",
+    ("collection", "command", "outcome"))
+
+
+def observe_upstream(name, seconds, outcome):
+    """Circuit breaker callback; outcome is the HTTP status code or the exception type."""
+    upstream_latency.observe(name, str(outcome), value=seconds)
+
+
+def init_app(app):
+    """Per-route request count, latency and in-flight gauge for a Flask app."""
+    from flask import g, request
+
+    def route_of():
+        return request.url_rule.rule if request.url_rule is not None else "unmatched"
+
+    @app.before_request
+    def _start_timer():
+        g.metrics_started = time.perf_counter()
+        g.metrics_route = route_of()
+        http_in_flight.inc(g.metrics_route)
+
+    @app.after_request
+    def _record(response):
+        started = g.pop("metrics_started", None)
+        if started is not None:
+            http_latency.observe(g.metrics_route, request.method, value=time.perf_counter() - started)
+            http_requests.inc(g.metrics_route, request.method, str(response.status_code))
+        return response
+
+    @app.teardown_request
+    def _done(error=None):
+        route = g.pop("metrics_route", None)
+        if route is not None:
+            http_in_flight.dec(route)
+
+
+class MongoCommandTimer(monitoring.CommandListener):
+    """pymongo/Motor command listener feeding mongodb_command_duration_seconds."""
+
+    # Handshake and auth chatter would only add noise
+    IGNORED = {"hello", "ismaster", "isMaster", "ping", "saslStart", "saslContinue", "endSessions", "buildInfo"}
+
+    def __init__(self):
+        self._collections = {}
+
+    def started(self, event):
+        if event.command_name in self.IGNORED:
+            return
+        collection = event.command.get(event.command_name)
+        if event.command_name == "getMore":
+            collection = event.command.get("collection")
+        self._collections[event.request_id] = collection if isinstance(collection, str) else "-"
+
+    def _finish(self, event, outcome):
+        collection = self._collections.pop(event.request_id, None)
+        if collection is None:
+            return
+        mongo_latency.observe(collection, event.command_name, outcome, value=event.duration_micros / 1e6)
+
+    def succeeded(self, event):
+        self._finish(event, "ok")
+
+    def failed(self, event):
+        self._finish(event, "error")
@@ -0,0 +1,115 @@
+import base64
+import json
+import os
+from datetime import datetime, timedelta
+
+from bson import ObjectId
+from pymongo import DESCENDING
+
+DEFAULT_PAGE_SIZE = int(os.getenv("APPLICATIONS_PAGE_SIZE", "50"))
+MAX_PAGE_SIZE = int(os.getenv("APPLICATIONS_MAX_PAGE_SIZE", "200"))
+
+# Fields clients may ask for with ?fields=; resume_base64 is never exposed
+APPLICATION_FIELDS = {
+    "user_id", "applicant", "email", "resume", "resume_ref", "coverLetter",
+    "job_id", "job_title", "company", "appliedDate", "status",
+}
+
+KEYSET_SORT = [("appliedDate", DESCENDING), ("_id", DESCENDING)]
+
+
+def encode_cursor(doc):
+    payload = {"d": doc["appliedDate"].isoformat(), "i": str(doc["_id"])}
+    return base64.urlsafe_b64encode(json.dumps(payload).encode("utf-8")).decode("ascii")
+
+
+def decode_cursor(cursor):
+    try:
+        payload = json.loads(base64.urlsafe_b64decode(cursor.encode("ascii")))
+        return datetime.fromisoformat(payload["d"]), ObjectId(payload["i"])
+    except Exception:
+        raise ValueError("Invalid cursor")
+
+
+def parse_limit(value):
+    if value in (None, ""):
+        return DEFAULT_PAGE_SIZE
+    try:
+        limit = int(value)
+    except ValueError:
+        raise ValueError("limit must be an integer")
+    if limit < 1:
+        raise ValueError("limit must be at least 1")
+    return min(limit, MAX_PAGE_SIZE)
+
+
+def parse_fields(value):
+    """Turn ?fields=a,b into a Mongo projection. The keyset fields are always included."""
+    if not value:
+        return {"resume_base64": 0}
+    fields = list(dict.fromkeys(field.strip() for field in value.split(",") if field.strip()))
+    unknown = set(fields) - APPLICATION_FIELDS
+    if unknown:
+        raise ValueError(f"Unknown fields: {', '.join(sorted(unknown))}")
+    projection = {field: 1 for field in fields}
+    projection["appliedDate"] = 1
+    return projection
+
+
+def _parse_date(value, name):
+    try:
+        return datetime.fromisoformat(value)
+    except ValueError:
+        raise ValueError(f"{name} must be an ISO date, e.g. 2024-01-31")
+
+
+def build_filter(args, base=None):
+    """Server-side filters: status, company, from/to (appliedDate range)."""
+    query = dict(base or {})
+    if args.get("status"):
+        query["status"] = args["status"]
+    if args.get("company"):
+        query["company"] = args["company"]
+    date_range = {}
+    if args.get("from"):
+        date_range["$gte"] = _parse_date(args["from"], "from")
+    if args.get("to"):
+        to = _parse_date(args["to"], "to")
+        if "T" in args["to"] or " " in args["to"].strip():
+            date_range["$lte"] = to
+        else:
+            # A bare date means the whole day: everything before the next midnight
+            date_range["$lt"] = to + timedelta(days=1)
+    if date_range:
+        query["appliedDate"] = date_range
+    return query
+
+
+def page_query(query, args):
+    """Return (query, projection, limit) for one keyset page; fetch `limit + 1` docs sorted by KEYSET_SORT."""
+    limit = parse_limit(args.get("limit"))
+    projection = parse_fields(args.get("fields"))
+    if args.get("cursor"):
+        applied_date, last_id = decode_cursor(args["cursor"])
+        after = {"$or": [
+            {"appliedDate": {"$lt": applied_date}},
+            {"appliedDate": applied_date, "_id": {"$lt": last_id}},
+        ]}
+        query = {"$and": [query, after]} if query else after
+    return query, projection, limit
+
+
+def page_result(docs, limit):
+    """Trim the `limit + 1` fetched docs to one page and return (documents, next_cursor)."""
+    next_cursor = None
+    if len(docs) > limit:
+        docs = docs[:limit]
+        next_cursor = encode_cursor(docs[-1])
+    return docs, next_cursor
+
+
+def paginate(collection, query, args):
+    """Return (documents, next_cursor) for one keyset page ordered by (appliedDate, _id) desc."""
+    query, projection, limit = page_query(query, args)
+    docs = list(collection.find(query, projection).sort(KEYSET_SORT).limit(limit + 1))
+    return page_result(docs, limit)
@@ -0,0 +1,90 @@
+import os
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import bcrypt
+
+
+class HasherBusy(Exception):
+    """Raised when too many hash/verify operations are already queued."""
+
+
+class PasswordHasher:
+    """Runs bcrypt off the request thread in a bounded worker pool.
+
+    bcrypt releases the GIL, so a small thread pool gives real parallelism
+    while capping how many CPU-heavy hashes run at once. Submissions beyond
+    `max_workers + max_queue` are rejected with HasherBusy instead of piling up.
+    """
+
+    def __init__(self, rounds=None, max_workers=None, max_queue=None):
+        self.rounds = rounds or int(os.getenv("BCRYPT_ROUNDS", "12"))
+        self.max_workers = max_workers or int(os.getenv("PASSWORD_HASH_WORKERS", str(os.cpu_count() or 2)))
+        self.max_queue = max_queue if max_queue is not None else int(os.getenv("PASSWORD_HASH_QUEUE", "32"))
+        self._executor = ThreadPoolExecutor(max_workers=self.max_workers, thread_name_prefix="bcrypt")
+        self._slots = threading.BoundedSemaphore(self.max_workers + self.max_queue)
+        self._stats_lock = threading.Lock()
+        self._timings = {}
+        self.rejected = 0
+
+    def _run(self, operation, fn, *args):
+        if not self._slots.acquire(blocking=False):
+            with self._stats_lock:
+                self.rejected += 1
+            raise HasherBusy("Password hashing queue is full")
+        queued_at = time.perf_counter()
+        try:
+            future = self._executor.submit(self._timed, operation, queued_at, fn, *args)
+            return future.result()
+        finally:
+            self._slots.release()
+
+    def _timed(self, operation, queued_at, fn, *args):
+        started = time.perf_counter()
+        try:
+            return fn(*args)
+        finally:
+            finished = time.perf_counter()
+            self._record(operation, (started - queued_at) * 1000, (finished - started) * 1000)
+
+    def _record(self, operation, wait_ms, run_ms):
+        with self._stats_lock:
+            stats = self._timings.setdefault(operation, {"count": 0, "total_ms": 0.0, "max_ms": 0.0, "queue_wait_ms": 0.0})
+            stats["count"] += 1
+            stats["total_ms"] += run_ms
+            stats["max_ms"] = max(stats["max_ms"], run_ms)
+            stats["queue_wait_ms"] += wait_ms
+
+    def hash(self, password):
+        return self._run("hash", lambda: bcrypt.hashpw(password.encode("utf-8"), bcrypt.gensalt(self.rounds)))
+
+    def verify(self, password, hashed):
+        return self._run("verify", bcrypt.checkpw, password.encode("utf-8"), hashed)
+
+    def needs_rehash(self, hashed):
+        """True if `hashed` was made with a lower work factor than the current one."""
+        try:
+            # bcrypt hashes look like $2b$12$<salt+hash>
+            return int(hashed.split(b"$")[2]) < self.rounds
+        except (IndexError, ValueError):
+            return True
+
+    def stats(self):
+        with self._stats_lock:
+            operations = {}
+            for operation, stats in self._timings.items():
+                count = stats["count"]
+                operations[operation] = {
+                    "count": count,
+                    "avg_ms": round(stats["total_ms"] / count, 2),
+                    "max_ms": round(stats["max_ms"], 2),
+                    "avg_queue_wait_ms": round(stats["queue_wait_ms"] / count, 2),
+                }
+            return {
+                "rounds": self.rounds,
+                "workers": self.max_workers,
+                "max_queue": self.max_queue,
+                "rejected": self.rejected,
+                "operations": operations,
+            }
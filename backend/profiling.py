@@ -0,0 +1,152 @@
+import cProfile
+import io
+import os
+import pstats
+import random
+import threading
+import time
+import uuid
+from collections import deque
+from datetime import datetime
+
+PROFILE_HEADER = "X-Profile"
+
+# Self time of functions from these modules is summed into a per-request breakdown
+SPAN_CATEGORIES = (
+    ("bcrypt", ("bcrypt",)),
+    ("mongodb", ("pymongo", "bson", "gridfs", "mongomock")),
+    ("upstream_http", ("requests", "urllib3", "http/client", "socket", "ssl")),
+    ("base64", ("base64", "binascii")),
+    ("json", ("json",)),
+    ("flask", ("flask", "werkzeug", "jinja2")),
+)
+
+
+def _category(filename, function_name):
+    if function_name in ("<method 'acquire' of '_thread.lock' objects>", "<method 'wait' of '_thread.lock' objects>"):
+        # Work handed to a pool (bcrypt, concurrent provider calls) shows up here
+        return "waiting_on_threads"
+    for category, markers in SPAN_CATEGORIES:
+        if any(f"/{marker}" in filename or f"{marker}." in function_name for marker in markers):
+            return category
+    return "app_and_other"
+
+
+def summarize(profile, top=30):
+    """Return (top functions by cumulative time, self time per category) for a finished profile."""
+    stats = pstats.Stats(profile)
+    breakdown = {}
+    functions = []
+    for (filename, line, name), (primitive_calls, calls, self_time, cumulative, _) in stats.stats.items():
+        category = _category(filename, name)
+        breakdown[category] = breakdown.get(category, 0.0) + self_time
+        functions.append({
+            "function": f"{os.path.basename(filename)}:{line}({name})" if line else name,
+            "calls": calls,
+            "self_ms": round(self_time * 1000, 3),
+            "cumulative_ms": round(cumulative * 1000, 3),
+        })
+    functions.sort(key=lambda item: item["cumulative_ms"], reverse=True)
+    return functions[:top], {key: round(value * 1000, 3) for key, value in sorted(breakdown.items())}
+
+
+def render_text(profile, limit=40):
+    buffer = io.StringIO()
+    pstats.Stats(profile, stream=buffer).sort_stats("cumulative").print_stats(limit)
+    return buffer.getvalue()
+
+
+class RequestProfiler:
+    """Opt-in cProfile of single requests, kept in a bounded ring buffer.
+
+    A request is profiled when it sends `X-Profile: 1` (or the PROFILE_TOKEN
+    value when one is configured) or is picked by PROFILE_SAMPLE_RATE. With
+    PROFILING_ENABLED unset no hooks are installed at all. Only one request is
+    profiled at a time; others arriving meanwhile just run normally.
+    """
+
+    def __init__(self, enabled=None, sample_rate=None, capacity=None, token=None):
+        self.enabled = enabled if enabled is not None else os.getenv("PROFILING_ENABLED", "0") == "1"
+        self.sample_rate = sample_rate if sample_rate is not None else float(os.getenv("PROFILE_SAMPLE_RATE", "0"))
+        self.token = token if token is not None else os.getenv("PROFILE_TOKEN")
+        self._profiles = deque(maxlen=capacity or int(os.getenv("PROFILE_BUFFER_SIZE", "50")))
+        self._busy = threading.Lock()
+        self._lock = threading.Lock()
+        self.skipped_busy = 0
+
+    def wanted(self, header_value):
+        if header_value:
+            return header_value == self.token if self.token else header_value == "1"
+        return self.sample_rate > 0 and random.random() < self.sample_rate
+
+    def start(self):
+        """Return a running profiler, or None when another request is being profiled."""
+        if not self._busy.acquire(blocking=False):
+            self.skipped_busy += 1
+            return None
+        profile = cProfile.Profile()
+        profile.enable()
+        return profile
+
+    def finish(self, profile, started, **request_info):
+        profile.disable()
+        self._busy.release()
+        top, breakdown = summarize(profile)
+        record = dict(
+            request_info,
+            id=uuid.uuid4().hex[:12],
+            timestamp=datetime.utcnow().isoformat(),
+            duration_ms=round((time.perf_counter() - started) * 1000, 3),
+            breakdown_ms=breakdown,
+            top_functions=top,
+            text=render_text(profile),
+        )
+        with self._lock:
+            self._profiles.append(record)
+        return record["id"]
+
+    def list(self):
+        with self._lock:
+            profiles = list(self._profiles)
+        summary_keys = ("id", "timestamp", "method", "path", "route", "status", "duration_ms", "breakdown_ms")
+        return [{key: profile.get(key) for key in summary_keys} for profile in reversed(profiles)]
+
+    def get(self, profile_id):
+        with self._lock:
+            for profile in self._profiles:
+                if profile["id"] == profile_id:
+                    return profile
+        return None
+
+    def init_app(self, app):
+        if not self.enabled:
+            return
+        from flask import g, request
+
+        @app.before_request
+        def _start_profile():
+            if self.wanted(request.headers.get(PROFILE_HEADER)):
+                g.profile = self.start()
+                g.profile_started = time.perf_counter()
+
+        @app.after_request
+        def _finish_profile(response):
+            profile = g.pop("profile", None)
+            if profile is not None:
+                response.headers["X-Profile-Id"] = self.finish(
+                    profile,
+                    g.pop("profile_started"),
+                    method=request.method,
+                    path=request.full_path.rstrip("?"),
+                    route=request.url_rule.rule if request.url_rule is not None else None,
+                    status=response.status_code,
+                )
+            return response
+
+        @app.teardown_request
+        def _abandon_profile(error=None):
+            # after_request does not run when the view raised; never leave the profiler busy
+            profile = g.pop("profile", None)
+            if profile is not None:
+                profile.disable()
+                self._busy.release()
@@ -0,0 +1,208 @@
+import math
+import os
+import threading
+import time
+from collections import OrderedDict
+
+# "<requests>/<seconds>"; the burst size equals <requests>
+DEFAULT_LIMITS = {
+    # Inbound, per JWT identity (or client IP when anonymous)
+    "search": os.getenv("RATE_LIMIT_SEARCH", "60/60"),
+    "chatbot": os.getenv("RATE_LIMIT_CHATBOT", "10/60"),
+    # Outbound, one global budget per upstream provider
+    "jsearch": os.getenv("RATE_LIMIT_JSEARCH", "100/60"),
+    "remotive": os.getenv("RATE_LIMIT_REMOTIVE", "120/60"),
+    "gemini": os.getenv("RATE_LIMIT_GEMINI", "15/60"),
+}
+
+
+class RateLimited(Exception):
+    """Raised when an upstream provider's budget is used up."""
+
+    status = "rate_limited"
+
+    def __init__(self, name, retry_after):
+        super().__init__(f"Rate limit for {name} exceeded, retry in {retry_after}s")
+        self.name = name
+        self.retry_after = retry_after
+
+
+def parse_limit(spec):
+    """Turn "60/60" into (capacity, refill rate in tokens per second)."""
+    try:
+        count, seconds = spec.split("/")
+        count, seconds = int(count), float(seconds)
+    except ValueError:
+        raise ValueError(f"Invalid rate limit '{spec}', expected <requests>/<seconds>")
+    if count < 1 or seconds <= 0:
+        raise ValueError(f"Invalid rate limit '{spec}', expected <requests>/<seconds>")
+    return count, count / seconds
+
+
+class Decision:
+    def __init__(self, allowed, limit, remaining, retry_after):
+        self.allowed = allowed
+        self.limit = limit
+        self.remaining = remaining
+        self.retry_after = retry_after
+
+    def headers(self):
+        headers = {"X-RateLimit-Limit": str(self.limit), "X-RateLimit-Remaining": str(self.remaining)}
+        if not self.allowed:
+            headers["Retry-After"] = str(self.retry_after)
+        return headers
+
+
+class MemoryBackend:
+    """Token buckets in process memory; correct for a single node only.
+
+    Buckets are kept in least-recently-used order. Each take drops buckets at
+    the old end that are full again (the same as having no bucket) and, past
+    `max_keys`, the least recently used ones, so its cost stays O(1).
+    """
+
+    name = "memory"
+
+    def __init__(self, max_keys=None):
+        self.max_keys = max_keys or int(os.getenv("RATE_LIMIT_MAX_KEYS", "100000"))
+        self._buckets = OrderedDict()  # key -> (tokens, updated_at, full_at), oldest first
+        self._lock = threading.Lock()
+
+    def take(self, key, capacity, rate, cost=1):
+        """Return (allowed, tokens_left) after trying to take `cost` tokens."""
+        now = time.monotonic()
+        with self._lock:
+            tokens, updated_at, _ = self._buckets.get(key, (capacity, now, now))
+            tokens = min(capacity, tokens + (now - updated_at) * rate)
+            allowed = tokens >= cost
+            if allowed:
+                tokens -= cost
+            self._buckets[key] = (tokens, now, now + (capacity - tokens) / rate)
+            self._buckets.move_to_end(key)
+            self._prune(now)
+            return allowed, tokens
+
+    def _prune(self, now):
+        while self._buckets:
+            _, _, full_at = next(iter(self._buckets.values()))
+            if full_at > now and len(self._buckets) <= self.max_keys:
+                break
+            self._buckets.popitem(last=False)
+
+    def __len__(self):
+        return len(self._buckets)
+
+
+# Refill-and-take in one round trip so concurrent nodes never double-spend a token
+_REDIS_TAKE = """
+local capacity = tonumber(ARGV[1])
+local rate = tonumber(ARGV[2])
+local cost = tonumber(ARGV[3])
+local clock = redis.call('TIME')
+local now = tonumber(clock[1]) + tonumber(clock[2]) / 1000000
+local bucket = redis.call('HMGET', KEYS[1], 'tokens', 'ts')
+local tokens = tonumber(bucket[1]) or capacity
+local ts = tonumber(bucket[2]) or now
+tokens = math.min(capacity, tokens + (now - ts) * rate)
+local allowed = 0
+if tokens >= cost then
+  tokens = tokens - cost
+  allowed = 1
+end
+redis.call('HSET', KEYS[1], 'tokens', tostring(tokens), 'ts', tostring(now))
+redis.call('EXPIRE', KEYS[1], math.ceil(capacity / rate) + 1)
+return {allowed, tostring(tokens)}
+"""
+
+
+class RedisBackend:
+    """Token buckets shared by every node through Redis (RATE_LIMIT_REDIS_URL)."""
+
+    name = "redis"
+
+    def __init__(self, url=None, prefix="ratelimit:"):
+        try:
+            import redis
+        except ImportError:
+            raise RuntimeError("RATE_LIMIT_BACKEND=redis needs the redis package: pip install redis")
+        self.prefix = prefix
+        self._client = redis.Redis.from_url(url or os.getenv("RATE_LIMIT_REDIS_URL", "redis://localhost:6379/0"))
+        self._take = self._client.register_script(_REDIS_TAKE)
+
+    def take(self, key, capacity, rate, cost=1):
+        allowed, tokens = self._take(keys=[self.prefix + key], args=[capacity, rate, cost])
+        return bool(allowed), float(tokens)
+
+    def __len__(self):
+        return sum(1 for _ in self._client.scan_iter(match=self.prefix + "*", count=1000))
+
+
+def create_backend():
+    backend = os.getenv("RATE_LIMIT_BACKEND", "memory")
+    if backend == "memory":
+        return MemoryBackend()
+    if backend == "redis":
+        return RedisBackend()
+    raise ValueError(f"Unknown RATE_LIMIT_BACKEND '{backend}'. Use 'memory' or 'redis'.")
+
+
+class RateLimiter:
+    """Named token-bucket limits over a pluggable backend.
+
+    `check("search", "user:42")` spends a token from that client's /search
+    bucket; `check("jsearch")` spends one from the global JSearch budget.
+    A backend failure lets the request through rather than taking the API down.
+    """
+
+    def __init__(self, limits=None, backend=None, enabled=None):
+        specs = dict(DEFAULT_LIMITS)
+        specs.update(limits or {})
+        self.limits = {name: parse_limit(spec) for name, spec in specs.items()}
+        self.enabled = enabled if enabled is not None else os.getenv("RATE_LIMIT_ENABLED", "1") == "1"
+        self._backend = backend
+        self._backend_lock = threading.Lock()
+        self._counts = {name: {"allowed": 0, "throttled": 0} for name in self.limits}
+        self.backend_errors = 0
+
+    @property
+    def backend(self):
+        # Created on first use so a Redis backend costs nothing at import time
+        if self._backend is None:
+            with self._backend_lock:
+                if self._backend is None:
+                    self._backend = create_backend()
+        return self._backend
+
+    def check(self, name, key="global", cost=1):
+        capacity, rate = self.limits[name]
+        if not self.enabled:
+            return Decision(True, capacity, capacity, 0)
+        try:
+            allowed, tokens = self.backend.take(f"{name}:{key}", capacity, rate, cost)
+        except Exception as e:
+            self.backend_errors += 1
+            print(f"Rate limit backend failed, allowing request: {e}")
+            return Decision(True, capacity, capacity, 0)
+        retry_after = 0 if allowed else max(1, math.ceil((cost - tokens) / rate))
+        self._counts[name]["allowed" if allowed else "throttled"] += 1
+        return Decision(allowed, capacity, int(tokens), retry_after)
+
+    def acquire(self, name):
+        """Spend one token of a global upstream budget or raise RateLimited."""
+        decision = self.check(name)
+        if not decision.allowed:
+            raise RateLimited(name, decision.retry_after)
+        return decision
+
+    def stats(self):
+        stats = {
+            "enabled": self.enabled,
+            "backend": os.getenv("RATE_LIMIT_BACKEND", "memory") if self._backend is None else self._backend.name,
+            "backend_errors": self.backend_errors,
+            "limits": {},
+        }
+        for name, (capacity, rate) in self.limits.items():
+            stats["limits"][name] = dict(self._counts[name], capacity=capacity, per_second=round(rate, 4))
+        if isinstance(self._backend, MemoryBackend):
+            stats["buckets"] = len(self._backend)
+        return stats
@@ -0,0 +1,149 @@
+import hashlib
+import os
+import tempfile
+import uuid
+
+import gridfs
+from bson import ObjectId
+
+CHUNK_SIZE = 255 * 1024  # GridFS default chunk size
+
+
+class ResumeNotFound(Exception):
+    pass
+
+
+class GridFSResumeStore:
+    """Stores resumes in a GridFS bucket next to the application data."""
+
+    name = "gridfs"
+
+    def __init__(self, db, bucket_name="resumes", chunk_size=CHUNK_SIZE):
+        self.bucket = gridfs.GridFSBucket(db, bucket_name=bucket_name, chunk_size_bytes=chunk_size)
+        self.chunk_size = chunk_size
+
+    def save(self, stream, filename, content_type=None, metadata=None):
+        """Stream `stream` into GridFS chunk by chunk and return a reference dict."""
+        digest = hashlib.sha256()
+        size = 0
+        grid_in = self.bucket.open_upload_stream(filename, metadata=dict(metadata or {}, content_type=content_type))
+        try:
+            while True:
+                chunk = stream.read(self.chunk_size)
+                if not chunk:
+                    break
+                digest.update(chunk)
+                size += len(chunk)
+                grid_in.write(chunk)
+        except Exception:
+            grid_in.abort()
+            raise
+        grid_in.close()
+        return {
+            "storage": self.name,
+            "id": str(grid_in._id),
+            "filename": filename,
+            "content_type": content_type,
+            "size": size,
+            "sha256": digest.hexdigest(),
+        }
+
+    def open(self, ref):
+        """Return an iterator over the stored resume's bytes."""
+        try:
+            grid_out = self.bucket.open_download_stream(ObjectId(ref["id"]))
+        except gridfs.errors.NoFile:
+            raise ResumeNotFound(ref["id"])
+
+        def chunks():
+            try:
+                while True:
+                    chunk = grid_out.readchunk()
+                    if not chunk:
+                        break
+                    yield chunk
+            finally:
+                grid_out.close()
+
+        return chunks()
+
+    def delete(self, ref):
+        try:
+            self.bucket.delete(ObjectId(ref["id"]))
+        except gridfs.errors.NoFile:
+            pass
+
+
+class LocalResumeStore:
+    """Stores resumes as files under a local directory (tests and local development)."""
+
+    name = "local"
+
+    def __init__(self, root_dir, chunk_size=CHUNK_SIZE):
+        self.root_dir = root_dir
+        self.chunk_size = chunk_size
+        os.makedirs(root_dir, exist_ok=True)
+
+    def _path(self, file_id):
+        # ids are generated by us, but never let one escape the storage directory
+        if not file_id.isalnum():
+            raise ResumeNotFound(file_id)
+        return os.path.join(self.root_dir, file_id)
+
+    def save(self, stream, filename, content_type=None, metadata=None):
+        digest = hashlib.sha256()
+        size = 0
+        file_id = uuid.uuid4().hex
+        fd, tmp_path = tempfile.mkstemp(dir=self.root_dir, prefix=".upload-")
+        try:
+            with os.fdopen(fd, "wb") as out:
+                while True:
+                    chunk = stream.read(self.chunk_size)
+                    if not chunk:
+                        break
+                    digest.update(chunk)
+                    size += len(chunk)
+                    out.write(chunk)
+            os.replace(tmp_path, self._path(file_id))
+        except Exception:
+            if os.path.exists(tmp_path):
+                os.remove(tmp_path)
+            raise
+        return {
+            "storage": self.name,
+            "id": file_id,
+            "filename": filename,
+            "content_type": content_type,
+            "size": size,
+            "sha256": digest.hexdigest(),
+        }
+
+    def open(self, ref):
+        path = self._path(ref["id"])
+        if not os.path.exists(path):
+            raise ResumeNotFound(ref["id"])
+
+        def chunks():
+            with open(path, "rb") as f:
+                while True:
+                    chunk = f.read(self.chunk_size)
+                    if not chunk:
+                        break
+                    yield chunk
+
+        return chunks()
+
+    def delete(self, ref):
+        path = self._path(ref["id"])
+        if os.path.exists(path):
+            os.remove(path)
+
+
+def create_resume_store(db):
+    """Build the resume store selected by RESUME_STORAGE (gridfs by default)."""
+    backend = os.getenv("RESUME_STORAGE", "gridfs")
+    if backend == "gridfs":
+        return GridFSResumeStore(db, bucket_name=os.getenv("RESUME_GRIDFS_BUCKET", "resumes"))
+    if backend == "local":
+        return LocalResumeStore(os.getenv("RESUME_STORAGE_DIR", os.path.join(os.path.dirname(__file__), "resume_files")))
+    raise ValueError(f"Unknown RESUME_STORAGE backend '{backend}'. Use 'gridfs' or 'local'.")
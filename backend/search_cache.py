@@ -0,0 +1,54 @@
+import os
+import re
+
+from ttl_cache import TTLCache
+
+# Per-provider TTLs in seconds; JSearch quota is the expensive one
+DEFAULT_PROVIDER_TTLS = {
+    "jsearch": int(os.getenv("SEARCH_CACHE_TTL_JSEARCH", "600")),
+    "remotive": int(os.getenv("SEARCH_CACHE_TTL_REMOTIVE", "300")),
+}
+
+
+def _normalize_text(value):
+    return re.sub(r"\s+", " ", (value or "").strip().lower())
+
+
+def normalize_search_key(query, location, page, provider):
+    """Build a cache key so "Python  Developer" and "python developer" share an entry."""
+    return (_normalize_text(query), _normalize_text(location), int(page or 1), provider)
+
+
+class SearchCache:
+    """Caches provider payloads for /search keyed by (query, location, page, provider)."""
+
+    def __init__(self, max_entries=None, max_bytes=None, provider_ttls=None, default_ttl=300):
+        self.provider_ttls = dict(DEFAULT_PROVIDER_TTLS)
+        if provider_ttls:
+            self.provider_ttls.update(provider_ttls)
+        self._cache = TTLCache(
+            max_entries=max_entries or int(os.getenv("SEARCH_CACHE_MAX_ENTRIES", "2000")),
+            max_bytes=max_bytes or int(os.getenv("SEARCH_CACHE_MAX_BYTES", str(64 * 1024 * 1024))),
+            default_ttl=default_ttl,
+        )
+
+    def ttl_for(self, provider):
+        return self.provider_ttls.get(provider, self._cache.default_ttl)
+
+    def get(self, query, location, page, provider):
+        return self._cache.get(normalize_search_key(query, location, page, provider))
+
+    def set(self, query, location, page, provider, payload):
+        key = normalize_search_key(query, location, page, provider)
+        self._cache.set(key, payload, ttl=self.ttl_for(provider))
+
+    def ttl_left(self, query, location, page, provider):
+        return self._cache.ttl_left(normalize_search_key(query, location, page, provider))
+
+    def clear(self):
+        self._cache.clear()
+
+    def stats(self):
+        stats = self._cache.stats()
+        stats["provider_ttls"] = self.provider_ttls
+        return stats
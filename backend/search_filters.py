@@ -0,0 +1,223 @@
+import os
+import re
+import time
+from datetime import datetime, timezone
+from itertools import compress
+
+from ttl_cache import TTLCache
+
+SORT_ORDERS = ("relevance", "date", "salary")
+
+FILTER_PARAMS = ("employment_type", "remote", "salary_min", "salary_max", "posted_within", "category", "sort")
+
+# Salaries are compared per year; JSearch reports some per hour/day/week/month
+ANNUAL_MULTIPLIERS = {"HOUR": 2080, "DAY": 260, "WEEK": 52, "MONTH": 12, "YEAR": 1}
+
+# Frontend category ids -> provider category names (as _key()s) they cover; Remotive names most of these
+CATEGORY_ALIASES = {
+    "softwaredevelopment": ("softwaredevelopment", "devops", "qa"),
+    "datascience": ("datascience", "dataanalysis"),
+    "design": ("design",),
+    "marketing": ("marketing",),
+    "sales": ("sales",),
+    "customerservice": ("customerservice", "customersupport"),
+    "finance": ("finance",),
+    "healthcare": ("healthcare", "medical"),
+    "hr": ("humanresources", "hr", "recruit"),
+    "projectmanagement": ("projectmanagement", "product"),
+}
+
+_KEY_RE = re.compile(r"[^a-z0-9]+")
+_SALARY_RE = re.compile(r"(\d+(?:[.,]\d+)*)\s*(k\b)?", re.IGNORECASE)
+
+
+def _key(value):
+    """"FULLTIME", "full_time" and "Full-time" all become "fulltime"."""
+    return _KEY_RE.sub("", (value or "").lower())
+
+
+def _timestamp(value):
+    if not value:
+        return 0.0
+    try:
+        posted = datetime.fromisoformat(str(value).replace("Z", "+00:00"))
+    except ValueError:
+        return 0.0
+    if posted.tzinfo is None:
+        posted = posted.replace(tzinfo=timezone.utc)
+    return posted.timestamp()
+
+
+def _salary_range(job):
+    """Annual (min, max) salary, parsing Remotive's free-text "$80k - $120k" when needed."""
+    low, high = job.get("salary_min"), job.get("salary_max")
+    if low is None and high is None:
+        amounts = []
+        for number, thousands in _SALARY_RE.findall(job.get("salary_text") or ""):
+            amount = float(number.replace(",", ""))
+            amounts.append(amount * 1000 if thousands else amount)
+        amounts = [amount for amount in amounts if amount >= 1000]
+        if not amounts:
+            return None, None
+        return min(amounts), max(amounts)
+    multiplier = ANNUAL_MULTIPLIERS.get((job.get("salary_period") or "YEAR").upper(), 1)
+    low = low if low is not None else high
+    high = high if high is not None else low
+    return float(low) * multiplier, float(high) * multiplier
+
+
+def _parse_bool(value, name):
+    if value.lower() in ("1", "true", "yes"):
+        return True
+    if value.lower() in ("0", "false", "no"):
+        return False
+    raise ValueError(f"{name} must be true or false")
+
+
+def _parse_number(value, name):
+    try:
+        return float(value)
+    except ValueError:
+        raise ValueError(f"{name} must be a number")
+
+
+class SearchFilters:
+    """Filters and sort order for /search, parsed from the query string."""
+
+    def __init__(self, employment_types=None, remote=None, salary_min=None, salary_max=None,
+                 posted_after=None, categories=None, sort="relevance"):
+        self.employment_types = employment_types
+        self.remote = remote
+        self.salary_min = salary_min
+        self.salary_max = salary_max
+        self.posted_after = posted_after
+        self.categories = categories
+        self.sort = sort
+
+    @classmethod
+    def from_args(cls, args, now=None):
+        """Return SearchFilters, or None when the request asks for no filtering or sorting."""
+        if not any(args.get(name) for name in FILTER_PARAMS):
+            return None
+        filters = cls()
+        if args.get("employment_type"):
+            filters.employment_types = {_key(value) for value in args["employment_type"].split(",") if _key(value)}
+        if args.get("remote"):
+            filters.remote = _parse_bool(args["remote"], "remote")
+        if args.get("salary_min"):
+            filters.salary_min = _parse_number(args["salary_min"], "salary_min")
+        if args.get("salary_max"):
+            filters.salary_max = _parse_number(args["salary_max"], "salary_max")
+        if args.get("posted_within"):
+            days = _parse_number(args["posted_within"], "posted_within")
+            filters.posted_after = (now or time.time()) - days * 86400
+        if args.get("category") and args["category"] != "all":
+            filters.categories = {
+                alias
+                for value in args["category"].split(",") if _key(value)
+                for alias in CATEGORY_ALIASES.get(_key(value), (_key(value),))
+            }
+        sort = args.get("sort") or "relevance"
+        if sort not in SORT_ORDERS:
+            raise ValueError(f"sort must be one of: {', '.join(SORT_ORDERS)}")
+        filters.sort = sort
+        return filters
+
+
+class ResultColumns:
+    """Column-wise view of one normalized result set.
+
+    Built once per upstream payload; each filter is then a pass over a single
+    column and the sort keys are precomputed, so changing filters or the sort
+    order does not re-normalize or re-fetch anything.
+    """
+
+    def __init__(self, payload, sources=()):
+        self.payload = payload
+        self.sources = sources
+        self.jobs = payload["data"]
+        self.employment_type = [_key(job.get("employment_type")) for job in self.jobs]
+        self.remote = [bool(job.get("remote")) for job in self.jobs]
+        salaries = [_salary_range(job) for job in self.jobs]
+        self.salary_min = [low for low, _ in salaries]
+        self.salary_max = [high for _, high in salaries]
+        self.posted = [_timestamp(job.get("publication_date")) for job in self.jobs]
+        self.category = [_key(job.get("category")) for job in self.jobs]
+        self.size = sum(len(job.get("description") or "") + 512 for job in self.jobs)
+
+    def matches(self, sources):
+        return len(sources) == len(self.sources) and all(a is b for a, b in zip(sources, self.sources))
+
+    def select(self, filters):
+        """Jobs passing every filter, in the requested order."""
+        mask = [True] * len(self.jobs)
+
+        def narrow(column, keep):
+            return [selected and keep(value) for selected, value in zip(mask, column)]
+
+        if filters.employment_types:
+            # Substring match, so "contract" also finds JSearch's "CONTRACTOR"
+            mask = narrow(self.employment_type, lambda kind: any(wanted in kind for wanted in filters.employment_types))
+        if filters.remote is not None:
+            mask = narrow(self.remote, lambda remote: remote == filters.remote)
+        if filters.salary_min is not None:
+            mask = narrow(self.salary_max, lambda high: high is not None and high >= filters.salary_min)
+        if filters.salary_max is not None:
+            mask = narrow(self.salary_min, lambda low: low is not None and low <= filters.salary_max)
+        if filters.posted_after is not None:
+            mask = narrow(self.posted, lambda posted: posted >= filters.posted_after)
+        if filters.categories:
+            # JSearch has no categories; its jobs are kept rather than all filtered out
+            mask = narrow(
+                self.category,
+                lambda category: not category or any(wanted in category for wanted in filters.categories),
+            )
+
+        rows = list(compress(range(len(self.jobs)), mask))
+        if filters.sort == "date":
+            rows.sort(key=self.posted.__getitem__, reverse=True)
+        elif filters.sort == "salary":
+            # Highest pay first; jobs without a salary go last
+            rows.sort(key=lambda row: self.salary_max[row] if self.salary_max[row] is not None else -1, reverse=True)
+        return [self.jobs[row] for row in rows]
+
+    def apply(self, filters):
+        """Copy of the payload with only the selected jobs."""
+        jobs = self.select(filters)
+        return dict(self.payload, data=jobs, count=len(jobs), unfiltered_count=len(self.jobs))
+
+
+class ResultSetCache:
+    """Keeps the columns of recent result sets so repeated filter changes reuse them.
+
+    An entry is only reused while it was built from the very same upstream
+    payload objects (the search cache hands out the same object until the
+    entry expires or is refreshed), so it never outlives the data it indexes.
+    """
+
+    def __init__(self, max_entries=None, ttl=None):
+        self._cache = TTLCache(
+            max_entries=max_entries or int(os.getenv("SEARCH_RESULT_SETS_MAX_ENTRIES", "500")),
+            max_bytes=int(os.getenv("SEARCH_RESULT_SETS_MAX_BYTES", str(32 * 1024 * 1024))),
+            default_ttl=ttl or int(os.getenv("SEARCH_RESULT_SETS_TTL", "600")),
+            sizeof=lambda columns: columns.size,
+        )
+        self.builds = 0
+        self.reuses = 0
+
+    def columns(self, key, normalized, sources=()):
+        """`normalized` may be a callable so the payload is only normalized on a miss."""
+        columns = self._cache.get(key) if sources else None
+        if columns is not None and columns.matches(sources):
+            self.reuses += 1
+            return columns
+        columns = ResultColumns(normalized() if callable(normalized) else normalized, sources)
+        self.builds += 1
+        if sources:
+            self._cache.set(key, columns)
+        return columns
+
+    def stats(self):
+        stats = self._cache.stats()
+        stats.update(builds=self.builds, reuses=self.reuses)
+        return stats
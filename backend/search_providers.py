@@ -0,0 +1,378 @@
+import os
+import re
+import time
+from concurrent.futures import ThreadPoolExecutor, FIRST_COMPLETED, wait
+
+from circuit_breaker import CircuitOpen, UpstreamUnavailable, is_failure_status
+from http_client import shared_client
+from rate_limit import RateLimited
+from search_cache import normalize_search_key
+from single_flight import SingleFlight
+
+SEARCH_MODES = ("sequential", "first", "merge")
+
+
+def _clean(value):
+    return value.strip() if isinstance(value, str) else value
+
+
+class JSearchProvider:
+    name = "jsearch"
+    url = "https://jsearch.p.rapidapi.com/search"
+
+    def __init__(self, api_key, deadline=None, http=None, url=None):
+        self.api_key = api_key
+        # JSEARCH_URL points the provider at a stand-in (see bench/fake_upstreams.py)
+        self.url = url or os.getenv("JSEARCH_URL", self.url)
+        self.http = http or shared_client
+        self.deadline = deadline or float(os.getenv("SEARCH_DEADLINE_JSEARCH", "10"))
+
+    def enabled(self):
+        return bool(self.api_key)
+
+    def request_args(self, query, location, page):
+        """Return (url, request kwargs) for a search; shared by the sync and async clients."""
+        params = {"query": query, "page": str(page), "num_pages": "1"}
+        if location:
+            params["query"] += f" in {location}"
+
+        headers = {
+            "X-RapidAPI-Key": self.api_key,
+            "X-RapidAPI-Host": "jsearch.p.rapidapi.com"
+        }
+        return self.url, {"headers": headers, "params": params}
+
+    def fetch(self, query, location, page, timeout=None):
+        """Return the raw JSearch payload, or None if the provider did not answer with 200.
+
+        Raises UpstreamUnavailable on 5xx/429 so the circuit breaker counts it.
+        """
+        url, kwargs = self.request_args(query, location, page)
+        response = self.http.get(url, timeout=timeout or self.deadline, **kwargs)
+        if response.status_code == 200:
+            return response.json()
+        if is_failure_status(response.status_code):
+            raise UpstreamUnavailable(self.name, response.status_code)
+        return None
+
+    def jobs(self, payload):
+        return payload.get("data") or []
+
+    def normalize(self, job):
+        location = ", ".join(part for part in (job.get("job_city"), job.get("job_state"), job.get("job_country")) if part)
+        return {
+            "id": str(job.get("job_id") or ""),
+            "source": self.name,
+            "title": _clean(job.get("job_title")) or "",
+            "company": _clean(job.get("employer_name")) or "",
+            "location": location,
+            "url": job.get("job_apply_link") or "",
+            "description": job.get("job_description") or "",
+            "employment_type": job.get("job_employment_type") or "",
+            "remote": bool(job.get("job_is_remote")),
+            "publication_date": job.get("job_posted_at_datetime_utc"),
+            "salary_min": job.get("job_min_salary"),
+            "salary_max": job.get("job_max_salary"),
+            "salary_currency": job.get("job_salary_currency"),
+            "salary_period": job.get("job_salary_period"),
+            "category": job.get("job_category") or "",
+            "logo": job.get("employer_logo") or "",
+            "highlights": job.get("job_highlights") or {},
+        }
+
+
+class RemotiveProvider:
+    name = "remotive"
+    url = "https://remotive.io/api/remote-jobs"
+
+    def __init__(self, deadline=None, http=None, url=None):
+        self.url = url or os.getenv("REMOTIVE_URL", self.url)
+        self.http = http or shared_client
+        self.deadline = deadline or float(os.getenv("SEARCH_DEADLINE_REMOTIVE", "10"))
+
+    def enabled(self):
+        return True
+
+    def request_args(self, query, location, page):
+        """Return (url, request kwargs) for a search; Remotive only filters by keyword."""
+        return self.url, {"params": {"search": query}}
+
+    def fetch(self, query, location, page, timeout=None):
+        """Return the raw Remotive payload, or None if the provider did not answer with 200.
+
+        Raises UpstreamUnavailable on 5xx/429 so the circuit breaker counts it.
+        """
+        url, kwargs = self.request_args(query, location, page)
+        response = self.http.get(url, timeout=timeout or self.deadline, **kwargs)
+        if response.status_code == 200:
+            return response.json()
+        if is_failure_status(response.status_code):
+            raise UpstreamUnavailable(self.name, response.status_code)
+        return None
+
+    def jobs(self, payload):
+        return payload.get("jobs") or []
+
+    def normalize(self, job):
+        return {
+            "id": str(job.get("id") or ""),
+            "source": self.name,
+            "title": _clean(job.get("title")) or "",
+            "company": _clean(job.get("company_name")) or "",
+            "location": job.get("candidate_required_location") or "",
+            "url": job.get("url") or "",
+            "description": job.get("description") or "",
+            "employment_type": job.get("job_type") or "",
+            "remote": True,
+            "publication_date": job.get("publication_date"),
+            "salary_min": None,
+            "salary_max": None,
+            "salary_currency": None,
+            "salary_period": None,
+            "salary_text": job.get("salary") or "",
+            "category": job.get("category") or "",
+            "logo": job.get("company_logo") or "",
+            "highlights": {},
+        }
+
+
+def dedupe_key(job):
+    """Jobs are considered the same posting when title and company match loosely."""
+    title = re.sub(r"[^a-z0-9]+", " ", job["title"].lower()).strip()
+    company = re.sub(r"[^a-z0-9]+", " ", job["company"].lower()).strip()
+    return (title, company)
+
+
+def merge_jobs(providers, jobs_by_provider, status):
+    """Merge normalized jobs in provider priority order so the preferred source wins duplicates."""
+    merged = []
+    seen = set()
+    for provider in providers:
+        for job in jobs_by_provider.get(provider.name, []):
+            key = dedupe_key(job)
+            if key in seen:
+                continue
+            seen.add(key)
+            merged.append(job)
+
+    return {
+        "status": "success",
+        "count": len(merged),
+        "data": merged,
+        "providers": status,
+    }
+
+
+def normalized_payload(provider, payload, status):
+    """One provider's raw payload in the same shape merge_jobs returns."""
+    jobs = [provider.normalize(job) for job in provider.jobs(payload)]
+    return {
+        "status": "success",
+        "count": len(jobs),
+        "data": jobs,
+        "providers": status,
+    }
+
+
+def has_jobs(provider, payload):
+    return payload is not None and bool(provider.jobs(payload))
+
+
+class SearchResult:
+    """`payload` is what the provider sent (or the merged jobs); `normalized` uses the common job schema.
+
+    `sources` are the upstream payloads the result was built from, in provider
+    order; a cached payload is the same object on every cache hit.
+    """
+
+    def __init__(self, payload=None, provider=None, providers=None, normalized=None, sources=()):
+        self.payload = payload
+        self.provider = provider
+        self.providers = providers or {}
+        self._normalized = normalized
+        self.sources = sources
+
+    @classmethod
+    def single(cls, provider, payload, status):
+        # Normalized only when someone asks for it
+        return cls(payload, provider.name, status, lambda: normalized_payload(provider, payload, status), (payload,))
+
+    @property
+    def normalized(self):
+        if callable(self._normalized):
+            self._normalized = self._normalized()
+        return self._normalized
+
+
+class SearchEngine:
+    """Fans a search out to the configured providers.
+
+    Modes:
+      sequential - try providers one after another in priority order (legacy behaviour)
+      first      - query all providers concurrently and return the first good raw payload
+      merge      - query all providers concurrently, normalize and de-duplicate their jobs
+    """
+
+    def __init__(self, providers, cache=None, mode=None, max_workers=None, on_fetch=None, limiter=None,
+                 breakers=None):
+        self.providers = providers
+        self.cache = cache
+        # Per-provider circuit breakers with adaptive timeouts
+        self.breakers = breakers
+        # Global per-provider budgets; only spent on cache misses
+        self.limiter = limiter
+        # Identical concurrent cache misses share one upstream call
+        self.flight = SingleFlight("search")
+        # Called with (provider, payload) for every fresh upstream payload
+        self.on_fetch = on_fetch
+        self.mode = mode or os.getenv("SEARCH_MODE", "sequential")
+        self.executor = ThreadPoolExecutor(
+            max_workers=max_workers or int(os.getenv("SEARCH_MAX_WORKERS", "16")),
+            thread_name_prefix="search-provider",
+        )
+
+    def active_providers(self):
+        return [provider for provider in self.providers if provider.enabled()]
+
+    def fetch(self, provider, query, location, page, refresh=False):
+        """Fetch one provider's payload, going through the result cache when configured.
+
+        `refresh=True` skips the cache read but still stores the fresh payload.
+        """
+        if self.cache is not None and not refresh:
+            payload = self.cache.get(query, location, page, provider.name)
+            if payload is not None:
+                return payload
+        return self.flight.do(
+            normalize_search_key(query, location, page, provider.name),
+            lambda: self._fetch_upstream(provider, query, location, page),
+            timeout=provider.deadline,
+        )
+
+    def _fetch_upstream(self, provider, query, location, page):
+        breaker = self.breakers.get(provider.name, provider.deadline) if self.breakers is not None else None
+        if breaker is not None:
+            breaker.before_call()
+        if self.limiter is not None and provider.name in self.limiter.limits:
+            try:
+                self.limiter.acquire(provider.name)
+            except RateLimited:
+                if breaker is not None:
+                    breaker.cancel()
+                raise
+        if breaker is None:
+            payload = provider.fetch(query, location, page)
+        else:
+            payload = breaker.attempt(lambda timeout: provider.fetch(query, location, page, timeout=timeout))
+        if payload is not None:
+            if self.cache is not None:
+                self.cache.set(query, location, page, provider.name, payload)
+            self.notify(provider, payload)
+        return payload
+
+    def notify(self, provider, payload):
+        if self.on_fetch is None:
+            return
+        try:
+            self.on_fetch(provider, payload)
+        except Exception as e:
+            print(f"Search result listener failed for {provider.name}: {e}")
+
+    def search(self, query, location, page, mode=None):
+        mode = mode or self.mode
+        if mode not in SEARCH_MODES:
+            raise ValueError(f"Unknown search mode '{mode}'. Use one of: {', '.join(SEARCH_MODES)}")
+        providers = self.active_providers()
+        if mode == "sequential":
+            return self._search_sequential(providers, query, location, page)
+        if mode == "first":
+            return self._search_first(providers, query, location, page)
+        return self._search_merge(providers, query, location, page)
+
+    def _search_sequential(self, providers, query, location, page):
+        status = {}
+        for provider in providers:
+            try:
+                payload = self.fetch(provider, query, location, page)
+            except (RateLimited, CircuitOpen) as e:
+                status[provider.name] = {"status": e.status, "retry_after": e.retry_after}
+                continue
+            except Exception as e:
+                print(f"Search provider {provider.name} failed: {e}")
+                status[provider.name] = {"status": "error", "error": str(e)}
+                continue
+            if payload is not None:
+                status[provider.name] = {"status": "ok"}
+                return SearchResult.single(provider, payload, status)
+            status[provider.name] = {"status": "no_results"}
+        return SearchResult(providers=status)
+
+    def _submit_all(self, providers, query, location, page):
+        started = time.monotonic()
+        futures = {}
+        for provider in providers:
+            future = self.executor.submit(self.fetch, provider, query, location, page)
+            futures[future] = (provider, started + provider.deadline)
+        return futures
+
+    def _collect(self, future, provider, status):
+        try:
+            payload = future.result()
+        except (RateLimited, CircuitOpen) as e:
+            status[provider.name] = {"status": e.status, "retry_after": e.retry_after}
+            return None
+        except Exception as e:
+            print(f"Search provider {provider.name} failed: {e}")
+            status[provider.name] = {"status": "error", "error": str(e)}
+            return None
+        if not has_jobs(provider, payload):
+            status[provider.name] = {"status": "no_results"}
+            return None
+        status[provider.name] = {"status": "ok"}
+        return payload
+
+    def _search_first(self, providers, query, location, page):
+        status = {}
+        futures = self._submit_all(providers, query, location, page)
+        pending = set(futures)
+        while pending:
+            next_deadline = min(futures[f][1] for f in pending)
+            done, pending = wait(pending, timeout=max(0, next_deadline - time.monotonic()), return_when=FIRST_COMPLETED)
+            for future in done:
+                provider = futures[future][0]
+                payload = self._collect(future, provider, status)
+                if payload is not None:
+                    for other in pending:
+                        # Drops the fetch if it is still queued; a running one finishes on its own
+                        other.cancel()
+                        status[futures[other][0].name] = {"status": "abandoned"}
+                    return SearchResult.single(provider, payload, status)
+            now = time.monotonic()
+            for future in [f for f in pending if futures[f][1] <= now]:
+                future.cancel()
+                status[futures[future][0].name] = {"status": "timeout"}
+                pending.discard(future)
+        return SearchResult(providers=status)
+
+    def _search_merge(self, providers, query, location, page):
+        status = {}
+        futures = self._submit_all(providers, query, location, page)
+        jobs_by_provider = {}
+        sources = []
+        for future, (provider, deadline) in futures.items():
+            done, _ = wait([future], timeout=max(0, deadline - time.monotonic()))
+            if not done:
+                # Still queued behind other searches: do not let it run after we gave up on it
+                future.cancel()
+                status[provider.name] = {"status": "timeout"}
+                continue
+            payload = self._collect(future, provider, status)
+            if payload is not None:
+                sources.append(payload)
+                jobs_by_provider[provider.name] = [provider.normalize(job) for job in provider.jobs(payload)]
+                status[provider.name]["count"] = len(jobs_by_provider[provider.name])
+
+        if not jobs_by_provider:
+            return SearchResult(providers=status)
+        merged = merge_jobs(providers, jobs_by_provider, status)
+        return SearchResult(merged, "merge", status, merged, tuple(sources))
@@ -0,0 +1,101 @@
+import asyncio
+import threading
+
+
+class SingleFlightTimeout(Exception):
+    """A waiter gave up before the shared call finished (the call itself keeps running)."""
+
+
+class _Call:
+    def __init__(self):
+        self.done = threading.Event()
+        self.result = None
+        self.error = None
+        self.waiters = 0
+
+
+class SingleFlight:
+    """Collapses concurrent calls with the same key into one execution.
+
+    The first caller (the leader) runs the function; callers arriving while it
+    is in flight wait for it and get the same result, or the same exception
+    re-raised. Nothing is cached: once the call finishes the next caller runs
+    it again, so pair this with a result cache.
+    """
+
+    def __init__(self, name):
+        self.name = name
+        self._calls = {}
+        self._lock = threading.Lock()
+        self.executions = 0
+        self.collapsed = 0
+        self.errors = 0
+        self.timeouts = 0
+
+    def do(self, key, fn, timeout=None):
+        with self._lock:
+            call = self._calls.get(key)
+            leader = call is None
+            if leader:
+                call = self._calls[key] = _Call()
+                self.executions += 1
+            else:
+                call.waiters += 1
+                self.collapsed += 1
+
+        if leader:
+            try:
+                call.result = fn()
+            except Exception as e:
+                call.error = e
+                self.errors += 1
+            finally:
+                with self._lock:
+                    del self._calls[key]
+                call.done.set()
+        elif not call.done.wait(timeout):
+            self.timeouts += 1
+            raise SingleFlightTimeout(f"Timed out waiting for in-flight {self.name} call")
+
+        if call.error is not None:
+            raise call.error
+        return call.result
+
+    def stats(self):
+        with self._lock:
+            in_flight = len(self._calls)
+        calls = self.executions + self.collapsed
+        return {
+            "in_flight": in_flight,
+            "executions": self.executions,
+            "collapsed": self.collapsed,
+            "collapse_ratio": round(self.collapsed / calls, 4) if calls else 0.0,
+            "errors": self.errors,
+            "waiter_timeouts": self.timeouts,
+        }
+
+
+class AsyncSingleFlight(SingleFlight):
+    """asyncio flavour for the ASGI app; the shared call runs in its own task,
+    so a cancelled or timed-out waiter (even the leader) never cancels it for the others."""
+
+    async def do(self, key, coro_fn, timeout=None):
+        with self._lock:
+            task = self._calls.get(key)
+            if task is None:
+                task = self._calls[key] = asyncio.ensure_future(coro_fn())
+                task.add_done_callback(lambda _: self._finish(key))
+                self.executions += 1
+            else:
+                self.collapsed += 1
+        try:
+            return await asyncio.wait_for(asyncio.shield(task), timeout)
+        except asyncio.TimeoutError:
+            self.timeouts += 1
+            raise SingleFlightTimeout(f"Timed out waiting for in-flight {self.name} call")
+
+    def _finish(self, key):
+        with self._lock:
+            task = self._calls.pop(key)
+        if not task.cancelled() and task.exception() is not None:
+            self.errors += 1
@@ -0,0 +1,114 @@
+import json
+import threading
+import time
+from collections import OrderedDict
+
+
+def estimate_size(value):
+    """Rough size in bytes of a JSON-serializable value."""
+    try:
+        return len(json.dumps(value, default=str))
+    except (TypeError, ValueError):
+        return len(repr(value))
+
+
+class TTLCache:
+    """Thread-safe LRU cache with per-entry TTLs and a memory budget.
+
+    Entries are evicted least-recently-used first once either `max_entries`
+    or `max_bytes` is exceeded. Expired entries are dropped lazily on access.
+    """
+
+    def __init__(self, max_entries=1000, max_bytes=50 * 1024 * 1024, default_ttl=300, sizeof=estimate_size):
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self.default_ttl = default_ttl
+        self.sizeof = sizeof
+        self._data = OrderedDict()  # key -> (value, expires_at, size)
+        self._bytes = 0
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.expirations = 0
+
+    def get(self, key, default=None):
+        with self._lock:
+            entry = self._data.get(key)
+            if entry is None:
+                self.misses += 1
+                return default
+            value, expires_at, size = entry
+            if expires_at <= time.monotonic():
+                self._remove(key)
+                self.expirations += 1
+                self.misses += 1
+                return default
+            self._data.move_to_end(key)
+            self.hits += 1
+            return value
+
+    def set(self, key, value, ttl=None):
+        ttl = self.default_ttl if ttl is None else ttl
+        if ttl <= 0:
+            return
+        size = self.sizeof(value)
+        if size > self.max_bytes:
+            # Never let a single oversized payload flush the whole cache
+            return
+        with self._lock:
+            if key in self._data:
+                self._remove(key)
+            self._data[key] = (value, time.monotonic() + ttl, size)
+            self._bytes += size
+            while len(self._data) > self.max_entries or self._bytes > self.max_bytes:
+                oldest = next(iter(self._data))
+                self._remove(oldest)
+                self.evictions += 1
+
+    def ttl_left(self, key):
+        """Seconds until `key` expires, or None if absent; does not count as a lookup."""
+        with self._lock:
+            entry = self._data.get(key)
+            if entry is None:
+                return None
+            seconds_left = entry[1] - time.monotonic()
+            return seconds_left if seconds_left > 0 else None
+
+    def delete(self, key):
+        with self._lock:
+            if key in self._data:
+                self._remove(key)
+
+    def clear(self):
+        with self._lock:
+            self._data.clear()
+            self._bytes = 0
+
+    def _remove(self, key):
+        _, _, size = self._data.pop(key)
+        self._bytes -= size
+
+    def snapshot(self):
+        """Return [(key, value, seconds_left)] for live entries, oldest first."""
+        now = time.monotonic()
+        with self._lock:
+            return [(key, value, expires_at - now) for key, (value, expires_at, _) in self._data.items() if expires_at > now]
+
+    def __len__(self):
+        return len(self._data)
+
+    def stats(self):
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                "entries": len(self._data),
+                "bytes": self._bytes,
+                "max_entries": self.max_entries,
+                "max_bytes": self.max_bytes,
+                "hits": self.hits,
+                "misses": self.misses,
+                "hit_ratio": round(self.hits / lookups, 4) if lookups else 0.0,
+                "evictions": self.evictions,
+                "expirations": self.expirations,
+            }
@@ -1,5 +1,6 @@
 import React, { useState } from 'react';
 import { Link } from 'react-router-dom';
+import { getJob } from '../services/api';
 
 // Helper function to format date
 const formatDate = (dateString) => {
@@ -23,8 +24,10 @@ const formatDate = (dateString) => {
 
 // Helper to extract salary information
 const extractSalaryInfo = (job) => {
-  if (job.job_salary_min && job.job_salary_max) {
-    const currency = job.job_salary_currency || 'USD';
+  const salaryMin = job.job_salary_min || job.salary_min;
+  const salaryMax = job.job_salary_max || job.salary_max;
+  if (salaryMin && salaryMax) {
+    const currency = job.job_salary_currency || job.salary_currency || 'USD';
     const formatter = new Intl.NumberFormat('en-US', {
       style: 'currency',
       currency,
@@ -32,9 +35,9 @@ const extractSalaryInfo = (job) => {
     });
     
     return {
-      min: formatter.format(job.job_salary_min),
-      max: formatter.format(job.job_salary_max),
-      period: job.job_salary_period?.toLowerCase() || 'year'
+      min: formatter.format(salaryMin),
+      max: formatter.format(salaryMax),
+      period: (job.job_salary_period || job.salary_period)?.toLowerCase() || 'year'
     };
   }
   return null;
@@ -42,6 +45,8 @@ const extractSalaryInfo = (job) => {
 
 const JobCard = ({ job }) => {
   const [expanded, setExpanded] = useState(false);
+  const [details, setDetails] = useState(null);
+  const [loadingDetails, setLoadingDetails] = useState(false);
   console.log("Rendering job:", job);
 
   // Extract common fields from different API formats
@@ -69,8 +74,11 @@ const JobCard = ({ job }) => {
   // Job posting date
   const postedDate = formatDate(job.job_posted_at_timestamp ? new Date(job.job_posted_at_timestamp * 1000) : job.publication_date);
   
+  // Compact search results carry only a snippet; the full record is fetched when the card expands
+  const hasDetails = Boolean(job.source && job.id && !job.description && !job.job_description);
+  
   // Job description
-  const description = job.job_description || job.description || job.text || "";
+  const description = job.job_description || job.description || details?.description || job.snippet || job.text || "";
   
   // Job employment type
   const employmentType = job.job_employment_type || job.employment_type || job.job_type || "";
@@ -82,10 +90,25 @@ const JobCard = ({ job }) => {
   const salary = extractSalaryInfo(job);
   
   // Job highlights
-  const highlights = job.job_highlights || {};
+  const highlights = job.job_highlights || job.highlights || details?.highlights || {};
   
   // Company logo
-  const logo = job.employer_logo || job.company_logo || null;
+  const logo = job.employer_logo || job.company_logo || job.logo || null;
+  
+  const toggleExpanded = async () => {
+    const expanding = !expanded;
+    setExpanded(expanding);
+    if (expanding && hasDetails && !details && !loadingDetails) {
+      setLoadingDetails(true);
+      try {
+        setDetails(await getJob(job.source, job.id));
+      } catch (err) {
+        // Keep showing the snippet
+      } finally {
+        setLoadingDetails(false);
+      }
+    }
+  };
 
   return (
     <div className="bg-white p-6 rounded-lg shadow-md hover:shadow-lg transition-shadow">
@@ -141,12 +164,12 @@ const JobCard = ({ job }) => {
               <p className={`${expanded ? '' : 'line-clamp-3'}`}>
                 {description}
               </p>
-              {description.length > 200 && (
+              {(description.length > 200 || hasDetails) && (
                 <button 
-                  onClick={() => setExpanded(!expanded)} 
+                  onClick={toggleExpanded} 
                   className="text-blue-600 hover:text-blue-800 mt-2 text-sm font-medium"
                 >
-                  {expanded ? 'Show less' : 'Read more'}
+                  {loadingDetails ? 'Loading...' : expanded ? 'Show less' : 'Read more'}
                 </button>
               )}
             </div>
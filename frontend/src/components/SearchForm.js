@@ -5,6 +5,7 @@ const SearchForm = ({ initialQuery = '', initialLocation = '' }) => {
   const [query, setQuery] = useState(initialQuery);
   const [location, setLocation] = useState(initialLocation);
   const [category, setCategory] = useState('');
+  const [jobFilters, setJobFilters] = useState([]);
   const navigate = useNavigate();
   
   useEffect(() => {
@@ -21,6 +22,9 @@ const SearchForm = ({ initialQuery = '', initialLocation = '' }) => {
     let searchParams = `?query=${encodeURIComponent(query)}`;
     if (location) searchParams += `&location=${encodeURIComponent(location)}`;
     if (category && category !== 'all') searchParams += `&category=${encodeURIComponent(category)}`;
+    if (jobFilters.includes('Remote')) searchParams += '&remote=true';
+    const employmentTypes = jobFilters.filter(filter => filter !== 'Remote');
+    if (employmentTypes.length) searchParams += `&employment_type=${encodeURIComponent(employmentTypes.join(','))}`;
     
     // Navigate to search results with query parameters
     navigate({
@@ -93,6 +97,8 @@ const SearchForm = ({ initialQuery = '', initialLocation = '' }) => {
               <label key={filter} className="flex items-center cursor-pointer">
                 <input 
                   type="checkbox" 
+                  checked={jobFilters.includes(filter)}
+                  onChange={() => setJobFilters(prev => prev.includes(filter) ? prev.filter(f => f !== filter) : [...prev, filter])}
                   className="form-checkbox h-4 w-4 text-blue-600 transition duration-150 ease-in-out mr-1" 
                 />
                 <span className="text-sm">{filter}</span>
@@ -7,6 +7,8 @@ const ApplicationsPage = () => {
   const [applications, setApplications] = useState([]);
   const [loading, setLoading] = useState(true);
   const [error, setError] = useState(null);
+  const [nextCursor, setNextCursor] = useState(null);
+  const [loadingMore, setLoadingMore] = useState(false);
   const [successMessage, setSuccessMessage] = useState(location.state?.message || '');
   
   useEffect(() => {
@@ -15,9 +17,10 @@ const ApplicationsPage = () => {
       setError(null);
       
       try {
-        const data = await getApplications();
+        const page = await getApplications();
         // Ensure data is an array
-        setApplications(Array.isArray(data) ? data : []);
+        setApplications(Array.isArray(page.applications) ? page.applications : []);
+        setNextCursor(page.nextCursor);
       } catch (err) {
         console.error('Error fetching applications:', err);
         setError('Failed to load your applications. Please try again later.');
@@ -38,6 +41,22 @@ const ApplicationsPage = () => {
     }
   }, [successMessage]);
   
+  // Fetch the next page and append it
+  const loadMore = async () => {
+    setLoadingMore(true);
+    
+    try {
+      const page = await getApplications(nextCursor);
+      setApplications((current) => [...current, ...(page.applications || [])]);
+      setNextCursor(page.nextCursor);
+    } catch (err) {
+      console.error('Error fetching more applications:', err);
+      setError('Failed to load more applications. Please try again later.');
+    } finally {
+      setLoadingMore(false);
+    }
+  };
+  
   // Format date
   const formatDate = (dateString) => {
     const options = { year: 'numeric', month: 'long', day: 'numeric' };
@@ -109,6 +128,18 @@ const ApplicationsPage = () => {
               </div>
             </div>
           ))}
+          
+          {nextCursor && (
+            <div className="text-center">
+              <button
+                onClick={loadMore}
+                disabled={loadingMore}
+                className="btn btn-secondary"
+              >
+                {loadingMore ? 'Loading...' : 'Load more'}
+              </button>
+            </div>
+          )}
         </div>
       )}
     </div>
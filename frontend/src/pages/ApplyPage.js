@@ -34,7 +34,7 @@ const ApplyPage = () => {
   }
 
   const jobTitle = job.job_title || job.title;
-  const companyName = job.employer_name || job.company_name || 'Unknown Company';
+  const companyName = job.employer_name || job.company_name || job.company || 'Unknown Company';
 
   // Handle text field changes
   const handleChange = (e) => {
@@ -8,13 +8,17 @@ const SearchResultsPage = () => {
   const [searchParams] = useSearchParams();
   const query = searchParams.get('query') || '';
   const location = searchParams.get('location') || '';
+  const category = searchParams.get('category') || '';
+  const remote = searchParams.get('remote') || '';
+  const employmentType = searchParams.get('employment_type') || '';
   
   const [jobs, setJobs] = useState([]);
   const [loading, setLoading] = useState(true);
   const [error, setError] = useState(null);
   const [page, setPage] = useState(1);
+  const [sort, setSort] = useState('relevance');
   
-  const fetchJobs = useCallback(async (searchQuery, searchLocation, pageNum = 1) => {
+  const fetchJobs = useCallback(async (searchQuery, searchLocation, pageNum = 1, filters = {}) => {
     if (!searchQuery) return;
     
     setLoading(true);
@@ -22,7 +26,12 @@ const SearchResultsPage = () => {
     
     try {
       console.log(`Fetching jobs with query: "${searchQuery}", location: "${searchLocation}", page: ${pageNum}`);
-      const data = await searchJobs(searchQuery, searchLocation, pageNum);
+      // Filtering and sorting happen on the server
+      const data = await searchJobs(searchQuery, searchLocation, pageNum, filters.category, {
+        remote: filters.remote,
+        employment_type: filters.employmentType,
+        sort: filters.sort !== 'relevance' ? filters.sort : '',
+      });
       console.log("API response:", data);
       
       // Handle different API response formats
@@ -63,13 +72,13 @@ const SearchResultsPage = () => {
   useEffect(() => {
     // Reset page when search parameters change
     setPage(1);
-    fetchJobs(query, location, 1);
-  }, [query, location, fetchJobs]);
+    fetchJobs(query, location, 1, { category, remote, employmentType, sort });
+  }, [query, location, category, remote, employmentType, sort, fetchJobs]);
   
   const loadMoreJobs = () => {
     const nextPage = page + 1;
     setPage(nextPage);
-    fetchJobs(query, location, nextPage);
+    fetchJobs(query, location, nextPage, { category, remote, employmentType, sort });
   };
 
   const searchTitle = (() => {
@@ -92,7 +101,8 @@ const SearchResultsPage = () => {
           <select 
             className="form-select text-sm" 
             aria-label="Sort by"
-            onChange={(e) => console.log("Sort by:", e.target.value)}
+            value={sort}
+            onChange={(e) => setSort(e.target.value)}
           >
             <option value="relevance">Relevance</option>
             <option value="date">Date Posted</option>
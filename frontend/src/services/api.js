@@ -62,6 +62,17 @@ export const searchJobs = async (query, location, page = 1, category = '', filte
   }
 };
 
+// Full record of one search result (whole description, highlights)
+export const getJob = async (source, id) => {
+  try {
+    const response = await apiClient.get(`/jobs/${encodeURIComponent(source)}/${encodeURIComponent(id)}`);
+    return response.data.data;
+  } catch (error) {
+    console.error('Error fetching job details:', error);
+    throw error;
+  }
+};
+
 // Job application API (now requires authentication)
 export const submitApplication = async (formData) => {
   try {
@@ -78,12 +89,15 @@ export const submitApplication = async (formData) => {
 };
 
 // Get applications API (now user-specific)
-export const getApplications = async () => {
+export const getApplications = async (cursor = null) => {
   try {
-    const response = await apiClient.get('/applications');
-    // Backend now returns { status, count, data } structure
-    // Extract the data array from the response
-    return response.data.data || [];
+    const params = cursor ? { cursor } : {};
+    const response = await apiClient.get('/applications', { params });
+    // Backend returns one page: { status, count, data, next_cursor }
+    return {
+      applications: response.data.data || [],
+      nextCursor: response.data.next_cursor || null,
+    };
   } catch (error) {
     console.error('Error fetching applications:', error);
     throw error;